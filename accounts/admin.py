@@ -1,6 +1,21 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from django.utils import timezone
+from .models import User, OutgoingEmail
 
 
 admin.site.register(User, UserAdmin)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ["to_email", "subject", "status", "attempts", "send_after"]
+    list_filter = ["status"]
+    search_fields = ["to_email"]
+    actions = ["retry"]
+
+    @admin.action(description="Ponów wysyłkę zaznaczonych wiadomości")
+    def retry(self, request, queryset):
+        queryset.exclude(status=OutgoingEmail.SENT).update(
+            status=OutgoingEmail.PENDING, attempts=0, send_after=timezone.now()
+        )
@@ -1,4 +1,7 @@
-from rest_framework.authentication import SessionAuthentication
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, SessionAuthentication
+
+from .tokens import AccessToken, TokenError
 
 
 class LoginAuthentication(SessionAuthentication):
@@ -10,3 +13,30 @@ class LoginAuthentication(SessionAuthentication):
         if not user or not user.is_active:
             return None
         return (user, None)
+
+
+class BearerTokenAuthentication(BaseAuthentication):
+    """
+    Authenticates by `Authorization: Bearer <access token>` header without
+    touching the session and the database, see `AccessToken.get_user`.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        header = request.META.get("HTTP_AUTHORIZATION", "").split()
+
+        if not header or header[0] != self.keyword:
+            return None
+        if len(header) != 2:
+            raise exceptions.AuthenticationFailed("Nieprawidłowy nagłówek tokena.")
+
+        try:
+            token = AccessToken.from_string(header[1])
+            user = token.get_user()
+        except TokenError as error:
+            raise exceptions.AuthenticationFailed(error)
+        return (user, token)
+
+    def authenticate_header(self, request):
+        return self.keyword
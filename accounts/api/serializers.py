@@ -3,15 +3,14 @@ from rest_framework.reverse import reverse_lazy
 
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
-from django.core.exceptions import ValidationError
-from django.core.validators import validate_email
 from django.contrib.sites.shortcuts import get_current_site
 from django.contrib.auth import authenticate
 from django.utils.translation import gettext_lazy as _
 
 from ..models import User
 from .validators import password_validator
-from ..tasks import async_send_email
+from .tokens import RefreshToken, TokenError
+from ..tasks import delay_email
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -110,15 +109,24 @@ class LoginSerializer(serializers.Serializer):
         return {"user": user}
 
 
+class RefreshTokenSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        try:
+            user = RefreshToken.from_string(attrs["refresh"]).get_user()
+        except TokenError as error:
+            raise serializers.ValidationError(str(error))
+        return {"user": user}
+
+
 class PasswordResetSerializer(serializers.Serializer):
     username_or_email = serializers.CharField()
 
     def send_mail(
         self, subject_template_name, email_template_name, context, from_email, to_email
     ):
-        async_send_email.delay(
-            subject_template_name, email_template_name, context, from_email, to_email
-        )
+        delay_email(subject_template_name, email_template_name, context, from_email)
 
     def save(
         self,
@@ -161,21 +169,11 @@ class PasswordResetSerializer(serializers.Serializer):
         possible to reset password by `username` as well.
         """
         try:
-            validate_email(email)
-            try:
-                user = User.objects.get(email=email)
-                if user.is_active and user.has_usable_password():
-                    return user
-            except User.DoesNotExist:
-                return
-        except ValidationError:
-            pass
-        try:
-            user = User.objects.get(username=email)
-            if user.is_active and user.has_usable_password():
-                return user
+            user = User.objects.get_by_username_or_email(email)
         except User.DoesNotExist:
             return
+        if user.is_active and user.has_usable_password():
+            return user
 
 
 class PasswordConfirmSerializer(serializers.Serializer):
@@ -4,10 +4,14 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase, APIRequestFactory, RequestsClient
 
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 
 from accounts.models import User
+from accounts.api.authentication import BearerTokenAuthentication
 from accounts.api.serializers import PasswordResetSerializer
 from accounts.api.views import PasswordConfirmView
 
@@ -22,6 +26,8 @@ class LoginViewTestCase(APITestCase):
         )
 
     def setUp(self):
+        # counters of throttling are kept in the cache
+        cache.clear()
         factory = APIRequestFactory()
         self.request = factory.request()
 
@@ -60,6 +66,107 @@ class LoginViewTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class TokenViewsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def obtain_tokens(self):
+        return self.client.post(
+            reverse("token"),
+            data={"username_or_email": "TestUser", "password": "test1234"},
+        ).data
+
+    def test_token_view_should_return_status_404_when_invalid_data_provided(self):
+        response = self.client.post(
+            reverse("token"),
+            data={"username_or_email": "TestUser", "password": "invalid"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_access_token_should_authenticate_user_without_session(self):
+        access = self.obtain_tokens()["access"]
+
+        response = self.client.get(
+            reverse("user-detail", args=[self.user.id]),
+            HTTP_AUTHORIZATION=f"Bearer {access}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "TestUser")
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_bearer_token_authentication_should_not_query_database(self):
+        access = self.obtain_tokens()["access"]
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        with self.assertNumQueries(0):
+            user, token = BearerTokenAuthentication().authenticate(request)
+
+        self.assertEqual(user, self.user)
+        self.assertTrue(user.is_authenticated)
+
+    def test_invalid_access_token_should_return_status_401(self):
+        response = self.client.get(
+            reverse("user-detail", args=[self.user.id]),
+            HTTP_AUTHORIZATION="Bearer invalid",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_access_token_of_deleted_user_should_return_status_401(self):
+        access = self.obtain_tokens()["access"]
+        User.objects.get(id=self.user.id).mark_deleted()
+
+        response = self.client.get(
+            reverse("user-detail", args=[self.user.id]),
+            HTTP_AUTHORIZATION=f"Bearer {access}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_expired_access_token_should_return_status_401(self):
+        access = self.obtain_tokens()["access"]
+
+        with override_settings(API_ACCESS_TOKEN_LIFETIME=-1):
+            response = self.client.get(
+                reverse("user-detail", args=[self.user.id]),
+                HTTP_AUTHORIZATION=f"Bearer {access}",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_token_should_return_new_access_token(self):
+        refresh = self.obtain_tokens()["refresh"]
+
+        response = self.client.post(reverse("token-refresh"), data={"refresh": refresh})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+
+    def test_access_token_should_not_be_accepted_as_refresh_token(self):
+        access = self.obtain_tokens()["access"]
+
+        response = self.client.post(reverse("token-refresh"), data={"refresh": access})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_token_should_expire_after_change_of_password(self):
+        refresh = self.obtain_tokens()["refresh"]
+        self.user.set_password("new-password")
+        self.user.save()
+
+        response = self.client.post(reverse("token-refresh"), data={"refresh": refresh})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
 class LogoutViewsTestCase(APITestCase):
     @classmethod
     def setUpTestData(cls):
@@ -68,6 +175,8 @@ class LogoutViewsTestCase(APITestCase):
         )
 
     def setUp(self):
+        # counters of throttling are kept in the cache
+        cache.clear()
         factory = APIRequestFactory()
         self.request = factory.request()
 
@@ -241,6 +350,9 @@ class PasswordResetSerializerTestCase(APITestCase):
 
 
 class PasswordResetViewTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_when_http_post_method_view_should_return_status_200(self):
         response = self.client.post(
             reverse("password-reset"), data={"username_or_email": "test@email.com"}
@@ -259,6 +371,7 @@ class PasswordConfirmViewTestCase(APITestCase):
         cls.uid = urlsafe_base64_encode(force_bytes(cls.user.pk))
 
     def setUp(self):
+        cache.clear()
         PasswordConfirmView.token_generator = Mock()
 
     def test_when_http_post_method_with_proper_view_should_return_status_200(self):
@@ -0,0 +1,106 @@
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.crypto import constant_time_compare
+
+from ..models import User
+
+
+class TokenError(Exception):
+    pass
+
+
+def revoked_tokens_cache_key(user_id):
+    return f"accounts:tokens-revoked:{user_id}"
+
+
+def revoke_access_tokens(user):
+    """
+    Rejects access tokens of `user` issued until now, e.g. after
+    deactivation. The mark lives as long as the tokens do.
+    """
+    cache.set(
+        revoked_tokens_cache_key(user.pk),
+        time.time(),
+        settings.API_ACCESS_TOKEN_LIFETIME,
+    )
+
+
+class AccessToken:
+    """
+    Short-lived signed token, which identifies the user without a database
+    query, only the cache is checked for `revoke_access_tokens`.
+    Lifetime is `settings.API_ACCESS_TOKEN_LIFETIME` seconds.
+    """
+
+    salt = "accounts.api.tokens.access"
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    @classmethod
+    def for_user(cls, user):
+        return cls({"id": user.pk, "username": user.username, "iat": time.time()})
+
+    @classmethod
+    def lifetime(cls):
+        return settings.API_ACCESS_TOKEN_LIFETIME
+
+    @classmethod
+    def from_string(cls, token):
+        try:
+            return cls(signing.loads(token, salt=cls.salt, max_age=cls.lifetime()))
+        except signing.SignatureExpired:
+            raise TokenError("Token wygasł.")
+        except signing.BadSignature:
+            raise TokenError("Nieprawidłowy token.")
+
+    def __str__(self):
+        return signing.dumps(self.payload, salt=self.salt)
+
+    def get_user(self):
+        """
+        Returns `User` with loaded `id`, `username` and `is_active` only,
+        other fields are fetched on access.
+        """
+        revoked = cache.get(revoked_tokens_cache_key(self.payload["id"]))
+        # tokens without `iat` were issued before it was added
+        if revoked is not None and self.payload.get("iat", 0) <= revoked:
+            raise TokenError("Token został unieważniony.")
+        return User.from_db(
+            DEFAULT_DB_ALIAS,
+            ["id", "username", "is_active"],
+            (self.payload["id"], self.payload["username"], True),
+        )
+
+
+class RefreshToken(AccessToken):
+    """
+    Long-lived token for obtaining new access tokens, it's checked against
+    the database and expires after change of password.
+    Lifetime is `settings.API_REFRESH_TOKEN_LIFETIME` seconds.
+    """
+
+    salt = "accounts.api.tokens.refresh"
+
+    @classmethod
+    def for_user(cls, user):
+        return cls({"id": user.pk, "hash": user.get_session_auth_hash()})
+
+    @classmethod
+    def lifetime(cls):
+        return settings.API_REFRESH_TOKEN_LIFETIME
+
+    def get_user(self):
+        try:
+            user = User.objects.get(pk=self.payload["id"], is_active=True)
+        except User.DoesNotExist:
+            raise TokenError("Nieprawidłowy token.")
+        if not constant_time_compare(
+            user.get_session_auth_hash(), self.payload["hash"]
+        ):
+            raise TokenError("Token wygasł.")
+        return user
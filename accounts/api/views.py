@@ -15,12 +15,16 @@ from .serializers import (
     LoginSerializer,
     PasswordResetSerializer,
     PasswordConfirmSerializer,
+    RefreshTokenSerializer,
 )
+from .tokens import AccessToken, RefreshToken
 from .permissions import IsMyAccountPermission
 
 
 class AllowAnyMixin:
     permission_classes = [permissions.AllowAny]
+    # views open to anyone authenticate, register or reset passwords
+    throttle_scope = "auth"
 
 
 class IsMyAccountMixin:
@@ -56,6 +60,9 @@ class UserDetailView(IsMyAccountMixin, generics.RetrieveUpdateDestroyAPIView):
         if "new_password" in self.request.data:
             update_session_auth_hash(self.request, self.get_object())
 
+    def perform_destroy(self, instance):
+        instance.mark_deleted()
+
 
 class LoginView(AllowAnyMixin, views.APIView):
     authentication_classes = [LoginAuthentication]
@@ -75,6 +82,45 @@ class LoginView(AllowAnyMixin, views.APIView):
             return Response(serializer.errors, status=status.HTTP_404_NOT_FOUND)
 
 
+class TokenView(AllowAnyMixin, views.APIView):
+    """
+    Returns access and refresh tokens for stateless authentication.
+    """
+
+    authentication_classes = []
+
+    def post(self, request, *args, **kwargs):
+        serializer = LoginSerializer(data=request.data)
+        if serializer.is_valid():
+            user = serializer.validated_data["user"]
+            return Response(
+                {
+                    "access": str(AccessToken.for_user(user)),
+                    "refresh": str(RefreshToken.for_user(user)),
+                    "expires_in": AccessToken.lifetime(),
+                }
+            )
+        else:
+            return Response(serializer.errors, status=status.HTTP_404_NOT_FOUND)
+
+
+class TokenRefreshView(AllowAnyMixin, views.APIView):
+    authentication_classes = []
+
+    def post(self, request, *args, **kwargs):
+        serializer = RefreshTokenSerializer(data=request.data)
+        if serializer.is_valid():
+            user = serializer.validated_data["user"]
+            return Response(
+                {
+                    "access": str(AccessToken.for_user(user)),
+                    "expires_in": AccessToken.lifetime(),
+                }
+            )
+        else:
+            return Response(serializer.errors, status=status.HTTP_401_UNAUTHORIZED)
+
+
 class LogoutView(IsMyAccountMixin, views.APIView):
     def post(self, request, *args, **kwargs):
         logout(request)
@@ -1,17 +1,53 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
 from .models import User
 
 
-class EmailAuthBackend:
-    def authenticate(self, request, username=None, password=None):
-        try:
-            user = User.objects.get(email=username)
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
+def unknown_user_cache_key(username_or_email):
+    # emails are case-insensitive, so are the keys
+    login = username_or_email.strip().lower()
+    digest = hashlib.sha256(login.encode()).hexdigest()
+    return f"accounts:unknown-user:{digest}"
+
+
+class UsernameOrEmailBackend(ModelBackend):
+    """
+    Authenticates by username or email with one query.
+
+    Logins, which don't belong to any user, are remembered in the cache
+    for `settings.AUTH_NEGATIVE_CACHE_TIMEOUT` seconds, so bursts of
+    attempts with unknown credentials don't hit the database. Logins
+    matching a username in other case aren't remembered, usernames
+    are case-sensitive unlike the keys.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
             return None
+        username = username.strip()
+
+        timeout = settings.AUTH_NEGATIVE_CACHE_TIMEOUT
+        cache_key = unknown_user_cache_key(username)
+
+        if timeout and cache.get(cache_key):
+            user = None
+        else:
+            user, username_in_other_case = User.objects.find_by_username_or_email(
+                username
+            )
+            if user is None and timeout and not username_in_other_case:
+                cache.set(cache_key, True, timeout)
 
-    def get_user(self, user_id):
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
+        if user is None:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user.
+            User().set_password(password)
             return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
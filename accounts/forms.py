@@ -1,11 +1,9 @@
 from django import forms
 from django.contrib.auth import forms as auth_forms
-from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
-from django.core.validators import validate_email
 
 from .models import User
-from .tasks import async_send_email
+from .tasks import delay_email
 
 
 class UserCreationForm(auth_forms.UserCreationForm):
@@ -137,9 +135,7 @@ class PasswordResetForm(auth_forms.PasswordResetForm):
         *args,
         **kwargs
     ):
-        async_send_email.delay(
-            subject_template_name, email_template_name, context, from_email, to_email
-        )
+        delay_email(subject_template_name, email_template_name, context, from_email)
 
     def get_users(self, email):
         """
@@ -147,16 +143,12 @@ class PasswordResetForm(auth_forms.PasswordResetForm):
         possible to reset password by `username` as well.
         """
         try:
-            validate_email(email)
-            return super().get_users(email)
-        except ValidationError:
-            pass
-        try:
-            user = User.objects.get(username=email)
-            if user.is_active and user.has_usable_password():
-                return (user,)
+            user = User.objects.get_by_username_or_email(email)
         except User.DoesNotExist:
             return ()
+        if user.is_active and user.has_usable_password():
+            return (user,)
+        return ()
 
 
 class SetPasswordForm(auth_forms.SetPasswordForm):
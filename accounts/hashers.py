@@ -0,0 +1,136 @@
+"""
+Password hashing policy.
+
+Cost of every algorithm is taken from settings, so it can be tuned per
+environment with `python manage.py benchmark_hashers`. The first hasher of
+`settings.PASSWORD_HASHERS` is preferred, passwords hashed by other hashers
+or with other cost are rehashed transparently on the next successful login.
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    BasePasswordHasher,
+    PBKDF2PasswordHasher,
+    mask_hash,
+    must_update_salt,
+)
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with `settings.PASSWORD_PBKDF2_ITERATIONS` iterations.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with `settings.PASSWORD_ARGON2_TIME_COST` and
+    `settings.PASSWORD_ARGON2_MEMORY_COST` (KiB), requires `argon2-cffi`.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(BasePasswordHasher):
+    """
+    Scrypt with `settings.PASSWORD_SCRYPT_WORK_FACTOR`, it uses
+    `hashlib.scrypt`, so no additional library is needed.
+    """
+
+    algorithm = "scrypt"
+    block_size = 8
+    parallelism = 1
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        assert password is not None
+        assert salt and "$" not in salt
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash = hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=self.maxmem(n, r, p),
+            dklen=64,
+        )
+        hash = base64.b64encode(hash).decode("ascii").strip()
+        return "%s$%d$%s$%d$%d$%s" % (self.algorithm, n, salt, r, p, hash)
+
+    def decode(self, encoded):
+        algorithm, work_factor, salt, block_size, parallelism, hash = encoded.split("$")
+        assert algorithm == self.algorithm
+        return {
+            "algorithm": algorithm,
+            "work_factor": int(work_factor),
+            "salt": salt,
+            "block_size": int(block_size),
+            "parallelism": int(parallelism),
+            "hash": hash,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        encoded_2 = self.encode(
+            password,
+            decoded["salt"],
+            decoded["work_factor"],
+            decoded["block_size"],
+            decoded["parallelism"],
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _("algorithm"): decoded["algorithm"],
+            _("work factor"): decoded["work_factor"],
+            _("block size"): decoded["block_size"],
+            _("parallelism"): decoded["parallelism"],
+            _("salt"): mask_hash(decoded["salt"]),
+            _("hash"): mask_hash(decoded["hash"]),
+        }
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (
+            decoded["work_factor"] != self.work_factor
+            or decoded["block_size"] != self.block_size
+            or decoded["parallelism"] != self.parallelism
+            or must_update_salt(decoded["salt"], self.salt_entropy)
+        )
+
+    def harden_runtime(self, password, encoded):
+        # Scrypt's runtime doesn't grow linearly with any parameter,
+        # so there is no sensible way to compensate the difference.
+        pass
+
+    @staticmethod
+    def maxmem(n, r, p):
+        # Scrypt needs 128 * n * r * p bytes, with a margin of 32 MiB.
+        return 128 * n * r * p + 32 * 1024 * 1024
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+def measure(algorithm, seconds):
+    """
+    Returns number of passwords hashed by `algorithm` in `seconds`
+    and the time it took.
+    """
+    hasher = next(hasher for hasher in get_hashers() if hasher.algorithm == algorithm)
+    salt = hasher.salt()
+    count = 0
+    start = time.perf_counter()
+    while True:
+        hasher.encode("benchmark-password", salt)
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count, elapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures speed of the password hashers from `settings.PASSWORD_HASHERS` "
+        "with their current cost, to tune it for the hardware."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds", type=float, default=2, help="Duration of each measurement."
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of processes hashing at once, e.g. number of cores.",
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=250,
+            help="Desired duration of hashing one password.",
+        )
+
+    def handle(self, *args, seconds, processes, target_ms, **options):
+        for hasher in get_hashers():
+            try:
+                hasher.encode("benchmark-password", hasher.salt())
+            except (ValueError, TypeError) as error:
+                self.stdout.write(f"{hasher.algorithm}: skipped ({error})")
+                continue
+
+            with ProcessPoolExecutor(processes) as executor:
+                results = list(
+                    executor.map(
+                        measure,
+                        [hasher.algorithm] * processes,
+                        [seconds] * processes,
+                    )
+                )
+            per_core = sum(count / elapsed for count, elapsed in results) / processes
+            duration_ms = 1000 / per_core
+
+            self.stdout.write(
+                f"{hasher.algorithm}: {per_core:.2f} hashes/s per core, "
+                f"{per_core * processes:.2f} hashes/s in total, "
+                f"{duration_ms:.1f} ms per hash"
+            )
+            if hasattr(hasher, "iterations"):
+                suggested = int(hasher.iterations * target_ms / duration_ms)
+                self.stdout.write(
+                    f"  {target_ms:g} ms per hash needs ~{suggested} iterations"
+                )
@@ -0,0 +1,100 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:37
+
+import accounts.models
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutgoingEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255, verbose_name="temat")),
+                ("body", models.TextField(verbose_name="treść")),
+                (
+                    "from_email",
+                    models.CharField(max_length=254, verbose_name="nadawca"),
+                ),
+                (
+                    "to_email",
+                    models.EmailField(max_length=254, verbose_name="odbiorca"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "oczekująca"),
+                            ("sent", "wysłana"),
+                            ("dead", "nie do doręczenia"),
+                        ],
+                        default="pending",
+                        max_length=7,
+                        verbose_name="status",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveSmallIntegerField(default=0, verbose_name="próby"),
+                ),
+                (
+                    "send_after",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="wyślij po"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="ostatni błąd"),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="utworzono"),
+                ),
+                (
+                    "sent",
+                    models.DateTimeField(
+                        blank=True, db_index=True, null=True, verbose_name="wysłano"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "wiadomość email",
+                "verbose_name_plural": "wiadomości email",
+                "ordering": ["send_after"],
+            },
+        ),
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", accounts.models.UserManager()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="email",
+            field=accounts.models.LowercaseEmailField(
+                max_length=254, unique=True, verbose_name="email address"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="outgoingemail",
+            index=models.Index(
+                fields=["status", "send_after"], name="outgoing_email_queue"
+            ),
+        ),
+    ]
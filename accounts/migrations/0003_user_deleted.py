@@ -0,0 +1,20 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_outbox_lowercase_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="deleted",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="usunięto"
+            ),
+        ),
+    ]
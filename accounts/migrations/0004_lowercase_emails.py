@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+def lowercase_emails(apps, schema_editor):
+    """
+    Lowercases emails saved before `LowercaseEmailField`, fails when
+    two accounts differ only in case of emails, they have to be merged
+    or changed by hand first.
+    """
+    User = apps.get_model("accounts", "User")
+    emails = {}
+    for pk, email in User.objects.values_list("pk", "email").iterator():
+        emails.setdefault(email.lower(), []).append(pk)
+    collisions = {email: pks for email, pks in emails.items() if len(pks) > 1}
+    if collisions:
+        raise RuntimeError(
+            "Emails of accounts differ only in case: %s"
+            % ", ".join(f"{email} {pks}" for email, pks in sorted(collisions.items()))
+        )
+    User.objects.exclude(email=Lower("email")).update(email=Lower("email"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_user_deleted"),
+    ]
+
+    operations = [
+        migrations.RunPython(lowercase_emails, migrations.RunPython.noop),
+    ]
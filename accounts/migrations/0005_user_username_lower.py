@@ -0,0 +1,21 @@
+# Generated by Django 3.2.11 on 2026-10-19 11:13
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_lowercase_emails"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.text.Lower("username"),
+                name="user_username_lower",
+            ),
+        ),
+    ]
@@ -1,9 +1,58 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
+class LowercaseEmailField(models.EmailField):
+    """
+    Email stored and looked up in lowercase, so the unique index
+    of the field is case-insensitive.
+    """
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        return value.lower() if isinstance(value, str) else value
+
+    def get_prep_value(self, value):
+        return self.to_python(super().get_prep_value(value))
+
+
+class UserManager(BaseUserManager):
+    def get_by_username_or_email(self, username_or_email):
+        """
+        Returns user with given username or email using one query.
+        Username takes precedence, because it may look like an email.
+        """
+        user, username_in_other_case = self.find_by_username_or_email(username_or_email)
+        if user is None:
+            raise self.model.DoesNotExist
+        return user
+
+    def find_by_username_or_email(self, username_or_email):
+        """
+        Returns user with given username or email, or `None`, and whether
+        the login is a username in other case. The one query is covered
+        by indexes of emails and of lowercase usernames.
+        """
+        login = username_or_email.lower()
+        users = list(
+            self.alias(username_lower=Lower("username")).filter(
+                Q(username_lower=login) | Q(email=login)
+            )
+        )
+        for user in users:
+            if user.username == username_or_email:
+                return user, False
+        for user in users:
+            if user.email == login:
+                return user, False
+        return None, bool(users)
+
+
 class User(AbstractUser):
     username_validator = UnicodeUsernameValidator()
 
@@ -17,14 +66,85 @@ class User(AbstractUser):
         },
     )
 
-    email = models.EmailField(
+    email = LowercaseEmailField(
         verbose_name=_("email address"),
         unique=True,
     )
 
+    deleted = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="usunięto"
+    )
+
+    objects = UserManager()
+
+    def mark_deleted(self):
+        """
+        Deactivates the account at once and frees its username and email,
+        the account with all its data is deleted later
+        by `dictionary.tasks.purge_deleted`.
+        """
+        self.deleted = timezone.now()
+        self.is_active = False
+        # "~" isn't allowed in usernames and "@" is missing in the email,
+        # so the placeholders never collide with real accounts
+        self.username = f"~deleted-{self.pk}"
+        self.email = f"~deleted-{self.pk}"
+        self.set_unusable_password()
+        self.save(
+            update_fields=["deleted", "is_active", "username", "email", "password"]
+        )
+
     def __json__(self):
         return {
             "id": self.id,
             "username": self.username,
             "email": self.email,
         }
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # logins are compared with usernames in any case by
+            # `accounts.backends.UsernameOrEmailBackend`
+            models.Index(Lower("username"), name="user_username_lower"),
+        ]
+
+
+class OutgoingEmail(models.Model):
+    """
+    Message waiting in the outbox for `accounts.tasks.send_outbox_emails`.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"
+    STATUS_CHOICES = [
+        (PENDING, "oczekująca"),
+        (SENT, "wysłana"),
+        (DEAD, "nie do doręczenia"),
+    ]
+
+    subject = models.CharField(max_length=255, verbose_name="temat")
+    body = models.TextField(verbose_name="treść")
+    from_email = models.CharField(max_length=254, verbose_name="nadawca")
+    to_email = models.EmailField(verbose_name="odbiorca")
+    status = models.CharField(
+        max_length=7, choices=STATUS_CHOICES, default=PENDING, verbose_name="status"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="próby")
+    send_after = models.DateTimeField(default=timezone.now, verbose_name="wyślij po")
+    last_error = models.TextField(blank=True, verbose_name="ostatni błąd")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="utworzono")
+    sent = models.DateTimeField(
+        null=True, blank=True, db_index=True, verbose_name="wysłano"
+    )
+
+    def __str__(self):
+        return f"{self.to_email}: {self.subject}"
+
+    class Meta:
+        ordering = ["send_after"]
+        verbose_name = "wiadomość email"
+        verbose_name_plural = "wiadomości email"
+        indexes = [
+            models.Index(name="outgoing_email_queue", fields=["status", "send_after"]),
+        ]
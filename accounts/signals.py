@@ -0,0 +1,24 @@
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .api.tokens import revoke_access_tokens
+from .backends import unknown_user_cache_key
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def forget_unknown_user(sender, instance, **kwargs):
+    cache.delete_many(
+        [
+            unknown_user_cache_key(instance.username),
+            unknown_user_cache_key(instance.email),
+        ]
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_of_inactive_user(sender, instance, **kwargs):
+    # deactivated and deleted accounts lose access to the API at once
+    if not instance.is_active:
+        revoke_access_tokens(instance)
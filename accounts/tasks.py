@@ -1,23 +1,193 @@
-from django.core.mail import EmailMultiAlternatives
+from datetime import timedelta
+
+from celery.signals import worker_process_init
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
 from django.template import loader
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
 
 from .celery import app
+from .models import User, OutgoingEmail
+
+
+EMAIL_TEMPLATES = [
+    "accounts/modi/email/password_reset_subject.txt",
+    "accounts/modi/email/password_reset_email.html",
+]
+
+
+@worker_process_init.connect
+def load_email_templates(**kwargs):
+    """
+    Compiles email templates once per worker process, later they are
+    served by the cached template loader, which is used unless DEBUG is on.
+    """
+    for template_name in EMAIL_TEMPLATES:
+        loader.get_template(template_name)
+
+
+def delay_email(subject_template_name, email_template_name, context, from_email):
+    """
+    Queues `async_send_email` passing only primitive values
+    of password reset `context` through the broker.
+    """
+    async_send_email.delay(
+        subject_template_name,
+        email_template_name,
+        from_email,
+        user_id=context["user"].pk,
+        token=context["token"],
+        domain=context["domain"],
+        site_name=context["site_name"],
+        protocol=context["protocol"],
+    )
 
 
 @app.task
 def async_send_email(
     subject_template_name,
     email_template_name,
-    context,
     from_email,
-    to_email,
-    *args,
-    **kwargs
+    user_id,
+    token,
+    domain,
+    site_name,
+    protocol,
 ):
+    """
+    Renders the message and puts it to the outbox,
+    it is sent by `send_outbox_emails`.
+    """
+    try:
+        user = User.objects.only("id", "username", "email").get(pk=user_id)
+    except User.DoesNotExist:
+        return None
 
-    subject = loader.render_to_string(subject_template_name, context)
+    context = {
+        "email": user.email,
+        "domain": domain,
+        "site_name": site_name,
+        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+        "user": user,
+        "token": token,
+        "protocol": protocol,
+    }
+    subject = render_to_string(subject_template_name, context)
     subject = " ".join(subject.splitlines())
-    body = loader.render_to_string(email_template_name, context)
+    body = render_to_string(email_template_name, context)
+
+    return OutgoingEmail.objects.create(
+        subject=subject, body=body, from_email=from_email, to_email=user.email
+    ).id
+
+
+@app.task
+def send_outbox_emails():
+    """
+    Sends a batch of pending messages over one SMTP connection.
+
+    At most `settings.EMAIL_OUTBOX_RATE_LIMIT` messages are sent per minute.
+    A failed message waits `settings.EMAIL_OUTBOX_RETRY_DELAY` seconds, doubled
+    after every attempt, and after `settings.EMAIL_OUTBOX_MAX_ATTEMPTS`
+    attempts it is marked as dead.
+
+    Messages are claimed for `settings.EMAIL_OUTBOX_CLAIM_TIMEOUT` seconds
+    by a short transaction, so rows aren't locked while SMTP is slow,
+    and a failed connection is recorded as a failed attempt of all of them.
+    """
+    now = timezone.now()
+    sent_recently = OutgoingEmail.objects.filter(
+        sent__gte=now - timedelta(minutes=1)
+    ).count()
+    limit = min(
+        settings.EMAIL_OUTBOX_BATCH_SIZE,
+        settings.EMAIL_OUTBOX_RATE_LIMIT - sent_recently,
+    )
+    if limit <= 0:
+        return 0
+
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutgoingEmail.PENDING, send_after__lte=now
+            )[:limit]
+        )
+        if not emails:
+            return 0
+        # other workers skip claimed messages, until a crashed worker's expire
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            send_after=now + timedelta(seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT)
+        )
+
+    try:
+        connection = get_connection()
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            email.attempts += 1
+            record_failure(email, error)
+    else:
+        try:
+            for email in emails:
+                send_outbox_email(email, connection)
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                # messages were already sent or recorded as failed
+                pass
+
+    OutgoingEmail.objects.bulk_update(
+        emails, ["status", "attempts", "send_after", "last_error", "sent"]
+    )
+    return sum(email.status == OutgoingEmail.SENT for email in emails)
+
+
+def send_outbox_email(email, connection):
+    email.attempts += 1
+    try:
+        EmailMultiAlternatives(
+            email.subject,
+            email.body,
+            email.from_email,
+            [email.to_email],
+            connection=connection,
+        ).send()
+    except Exception as error:
+        record_failure(email, error)
+    else:
+        email.status = OutgoingEmail.SENT
+        email.sent = timezone.now()
+
+
+def record_failure(email, error):
+    email.last_error = repr(error)
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.DEAD
+    else:
+        delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+        email.send_after = timezone.now() + timedelta(seconds=delay)
+
+
+@app.task
+def purge_outbox_emails():
+    """
+    Deletes messages sent or dead for `settings.EMAIL_OUTBOX_MAX_AGE` seconds
+    and returns their number, so links of password resets aren't kept.
+    Both conditions are covered by indexes.
+    """
+    # imported here, `dictionary.tasks` imports models of accounts
+    from dictionary.tasks import delete_in_batches
 
-    email_message = EmailMultiAlternatives(subject, body, from_email, [to_email])
-    return email_message.send()
+    before = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX_MAX_AGE)
+    emails = OutgoingEmail.objects.filter(
+        Q(sent__lt=before)
+        # dead messages keep time of their last attempt
+        | Q(status=OutgoingEmail.DEAD, send_after__lt=before)
+    )
+    return delete_in_batches(emails, raw=True)
@@ -1,16 +1,39 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from smtplib import SMTPException
 from unittest.mock import patch
 
-from django.test import TestCase
+from django.apps import apps
+from django.conf import settings
+from django.core import mail
+from django.core.management import call_command
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import Value
+from django.db.models.functions import Upper
+from django.template import engines
+from django.test import TestCase, override_settings
 from django.urls import reverse
-
-from accounts.tasks import async_send_email
-from accounts.models import User
+from django.utils import timezone
+
+from accounts.tasks import (
+    EMAIL_TEMPLATES,
+    async_send_email,
+    delay_email,
+    load_email_templates,
+    purge_outbox_emails,
+    send_outbox_emails,
+)
+from accounts.backends import UsernameOrEmailBackend
+from accounts.hashers import ScryptPasswordHasher
+from accounts.models import User, OutgoingEmail
 from accounts.forms import PasswordResetForm
 
 
 class EmailAuthenticationTestCase(TestCase):
     """
-    Test of `accounts.backends.EmailAuthBackend`.
+    Test of `accounts.backends.UsernameOrEmailBackend`.
     """
 
     @classmethod
@@ -47,6 +70,232 @@ class EmailAuthenticationTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class UserDeleteViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        self.client.login(username="TestUser", password="test1234")
+
+    def test_deleted_account_should_be_deactivated_and_free_its_email(self):
+        response = self.client.post(
+            reverse("accounts:account_delete", args=[self.user.username])
+        )
+        self.user.refresh_from_db()
+
+        self.assertRedirects(response, reverse("accounts:login"))
+        self.assertFalse(self.user.is_active)
+        self.assertIsNotNone(self.user.deleted)
+        self.assertFalse(User.objects.filter(email="test@email.com").exists())
+        self.assertFalse(self.client.login(username="TestUser", password="test1234"))
+
+
+class UsernameOrEmailBackendTestCase(TestCase):
+    """
+    Test of `accounts.backends.UsernameOrEmailBackend` and
+    `accounts.models.UserManager.get_by_username_or_email`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+    def setUp(self):
+        self.backend = UsernameOrEmailBackend()
+        cache.clear()
+
+    def test_authenticate_should_return_user_when_username_provided(self):
+        user = self.backend.authenticate(None, username="TestUser", password="test1234")
+
+        self.assertEqual(user, self.user)
+
+    def test_authenticate_should_return_user_when_email_in_any_case_provided(self):
+        user = self.backend.authenticate(
+            None, username="TEST@email.com", password="test1234"
+        )
+
+        self.assertEqual(user, self.user)
+
+    def test_authenticate_should_return_none_when_password_is_wrong(self):
+        user = self.backend.authenticate(None, username="TestUser", password="wrong")
+
+        self.assertIsNone(user)
+
+    def test_authenticate_should_look_up_user_with_one_query(self):
+        with self.assertNumQueries(1):
+            self.backend.authenticate(
+                None, username="test@email.com", password="test1234"
+            )
+
+    def test_unknown_login_should_be_looked_up_with_one_query(self):
+        with self.assertNumQueries(1):
+            self.backend.authenticate(None, username="testuser", password="test1234")
+
+    def test_unknown_login_should_not_hit_database_again(self):
+        self.backend.authenticate(None, username="Unknown", password="test1234")
+
+        with self.assertNumQueries(0):
+            user = self.backend.authenticate(
+                None, username="Unknown", password="test1234"
+            )
+
+        self.assertIsNone(user)
+
+    def test_creating_user_should_forget_unknown_login(self):
+        self.backend.authenticate(None, username="Unknown", password="test1234")
+        user = User.objects.create_user(
+            email="unknown@email.com", username="Unknown", password="test1234"
+        )
+
+        self.assertEqual(
+            self.backend.authenticate(None, username="Unknown", password="test1234"),
+            user,
+        )
+
+    def test_creating_user_should_forget_unknown_email_in_any_case(self):
+        self.backend.authenticate(
+            None, username=" Unknown@Email.com", password="test1234"
+        )
+        user = User.objects.create_user(
+            email="unknown@email.com", username="Unknown", password="test1234"
+        )
+
+        self.assertEqual(
+            self.backend.authenticate(
+                None, username="UNKNOWN@email.com ", password="test1234"
+            ),
+            user,
+        )
+
+    def test_username_in_other_case_should_not_be_remembered(self):
+        self.backend.authenticate(None, username="testuser", password="test1234")
+
+        self.assertEqual(
+            self.backend.authenticate(None, username="TestUser", password="test1234"),
+            self.user,
+        )
+
+    @override_settings(AUTH_NEGATIVE_CACHE_TIMEOUT=0)
+    def test_unknown_login_should_hit_database_when_cache_is_disabled(self):
+        self.backend.authenticate(None, username="Unknown", password="test1234")
+
+        with self.assertNumQueries(1):
+            self.backend.authenticate(None, username="Unknown", password="test1234")
+
+    def test_migration_should_lowercase_emails(self):
+        migration = import_module("accounts.migrations.0004_lowercase_emails")
+        User.objects.update(email=Upper("email"))
+
+        migration.lowercase_emails(apps, None)
+
+        self.assertEqual(User.objects.get().email, "test@email.com")
+
+    def test_migration_should_fail_when_emails_differ_only_in_case(self):
+        migration = import_module("accounts.migrations.0004_lowercase_emails")
+        other = User.objects.create_user(
+            email="other@email.com", username="Other", password="test1234"
+        )
+        User.objects.filter(id=other.id).update(email=Upper(Value("test@email.com")))
+
+        with self.assertRaises(RuntimeError):
+            migration.lowercase_emails(apps, None)
+
+    def test_get_by_username_or_email_should_prefer_username(self):
+        other = User.objects.create_user(
+            email="other@email.com", username="test@email.com", password="test1234"
+        )
+
+        self.assertEqual(User.objects.get_by_username_or_email("test@email.com"), other)
+
+    def test_email_should_be_unique_regardless_of_case(self):
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(
+                email="TEST@EMAIL.COM", username="AnotherUser", password="test1234"
+            )
+
+
+@override_settings(
+    PASSWORD_PBKDF2_ITERATIONS=1000,
+    PASSWORD_SCRYPT_WORK_FACTOR=2**8,
+    PASSWORD_ARGON2_TIME_COST=1,
+    PASSWORD_ARGON2_MEMORY_COST=256,
+    PASSWORD_ARGON2_PARALLELISM=1,
+)
+class PasswordHashersTestCase(TestCase):
+    """
+    Test of `accounts.hashers` and rehashing password on login.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        self.backend = UsernameOrEmailBackend()
+
+    def login(self):
+        return self.backend.authenticate(None, username="TestUser", password="test1234")
+
+    def password_after_login(self):
+        self.assertEqual(self.login(), self.user)
+        self.user.refresh_from_db()
+        return self.user.password
+
+    def test_password_should_be_hashed_with_tuned_iterations(self):
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=2000)
+    def test_password_should_be_rehashed_on_login_when_iterations_changed(self):
+        self.assertTrue(self.password_after_login().startswith("pbkdf2_sha256$2000$"))
+
+    def test_password_should_not_be_rehashed_on_login_when_policy_is_unchanged(self):
+        password = self.user.password
+
+        self.assertEqual(self.password_after_login(), password)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "accounts.hashers.ScryptPasswordHasher",
+            "accounts.hashers.TunedPBKDF2PasswordHasher",
+        ]
+    )
+    def test_password_should_be_rehashed_on_login_with_preferred_scrypt(self):
+        self.assertTrue(self.password_after_login().startswith("scrypt$256$"))
+        self.assertEqual(self.login(), self.user)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "accounts.hashers.TunedArgon2PasswordHasher",
+            "accounts.hashers.TunedPBKDF2PasswordHasher",
+        ]
+    )
+    def test_password_should_be_rehashed_on_login_with_preferred_argon2(self):
+        self.assertTrue(self.password_after_login().startswith("argon2$argon2id$"))
+        self.assertEqual(self.login(), self.user)
+
+    def test_scrypt_should_reject_wrong_password(self):
+        hasher = ScryptPasswordHasher()
+        encoded = hasher.encode("test1234", hasher.salt())
+
+        self.assertTrue(hasher.verify("test1234", encoded))
+        self.assertFalse(hasher.verify("1234test", encoded))
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "accounts.hashers.TunedPBKDF2PasswordHasher",
+            "accounts.hashers.ScryptPasswordHasher",
+        ]
+    )
+    def test_benchmark_hashers_command_should_report_every_hasher(self):
+        output = StringIO()
+
+        call_command("benchmark_hashers", seconds=0.01, stdout=output)
+
+        self.assertIn("pbkdf2_sha256:", output.getvalue())
+        self.assertIn("scrypt:", output.getvalue())
+
+
 class RenderFormErrorsTestCase(TestCase):
     """
     Test of `accounts.views.RaisingFormErrorsMixin`.
@@ -91,21 +340,19 @@ class PasswordResetFormTestCase(TestCase):
     def setUp(self):
         self.form = PasswordResetForm()
 
-    @patch("django.contrib.auth.forms.PasswordResetForm.get_users")
-    def test_method_get_users_of_form_should_invoke_parent_method_when_valid_email_provided(
-        self, get_users_mock
+    def test_method_get_users_of_form_should_return_iterable_with_one_user_when_valid_email_provided(
+        self,
     ):
-        self.form.get_users("test@email.com")
+        users = self.form.get_users("Test@Email.com")
 
-        get_users_mock.assert_called()
+        self.assertEqual(list(users), [self.user])
 
-    @patch("django.contrib.auth.forms.PasswordResetForm.get_users")
-    def test_method_get_users_of_form_should_invoke_parent_method_when_invalid_email_provided(
-        self, get_users_mock
+    def test_method_get_users_of_form_should_return_empty_iterable_when_invalid_email_provided(
+        self,
     ):
-        self.form.get_users("non-existent@email.com")
+        users = self.form.get_users("non-existent@email.com")
 
-        get_users_mock.assert_called()
+        self.assertEqual(len(users), 0)
 
     def test_method_get_users_of_form_should_return_iterable_with_one_user_when_valid_username_provided(
         self,
@@ -129,32 +376,194 @@ class TasksTestCase(TestCase):
     Test of `accounts.tasks.async_send_email`.
     """
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="user@example.com", username="TestUser", password="test1234"
+        )
+
     def setUp(self):
         self.subject_template_name = "accounts/modi/email/password_reset_subject.txt"
         self.email_template_name = "accounts/modi/email/password_reset_email.html"
         self.from_email = "MODi - My Own Dictionary"
-        self.user_email = "user@example.com"
         self.context = {
-            "email": self.user_email,
             "domain": "www.modi.pl",
             "site_name": "modi",
-            "uid": 1,
-            "user": "TestUser",
+            "user": self.user,
             "token": "1234-abcdeABCDE",
             "protocol": "https",
         }
 
-    @patch("accounts.tasks.EmailMultiAlternatives.send")
-    def test_async_send_email_should_invoke_send_method_of_email_multi_alternatives(
-        self, send_mock
-    ):
+    def send_email(self):
+        return async_send_email(
+            self.subject_template_name,
+            self.email_template_name,
+            self.from_email,
+            user_id=self.user.id,
+            token="1234-abcdeABCDE",
+            domain="www.modi.pl",
+            site_name="modi",
+            protocol="https",
+        )
 
-        async_send_email(
+    def test_async_send_email_should_put_rendered_message_to_outbox(self):
+        self.send_email()
+
+        email = OutgoingEmail.objects.get()
+
+        self.assertEqual(email.subject, "Reset hasła w aplikacji MODi.")
+        self.assertIn("https://www.modi.pl", email.body)
+        self.assertIn("1234-abcdeABCDE", email.body)
+        self.assertEqual(email.to_email, self.user.email)
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+
+    def test_async_send_email_should_fetch_user_with_one_query(self):
+        load_email_templates()
+
+        # fetching user and inserting message
+        with self.assertNumQueries(2):
+            self.send_email()
+
+    def test_async_send_email_should_skip_deleted_user(self):
+        self.user.delete()
+
+        self.assertIsNone(self.send_email())
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    @patch("accounts.tasks.async_send_email.delay")
+    def test_delay_email_should_pass_only_primitive_values_to_task(self, delay_mock):
+        delay_email(
             self.subject_template_name,
             self.email_template_name,
             self.context,
             self.from_email,
-            to_email=self.user_email,
         )
 
-        send_mock.assert_called()
+        args, kwargs = delay_mock.call_args
+
+        self.assertEqual(kwargs["user_id"], self.user.id)
+        for value in [*args, *kwargs.values()]:
+            self.assertIsInstance(value, (str, int))
+
+    def test_load_email_templates_should_fill_cache_of_template_loader(self):
+        cached_loader = engines["django"].engine.template_loaders[0]
+        cached_loader.reset()
+
+        load_email_templates()
+
+        for template_name in EMAIL_TEMPLATES:
+            self.assertIn(template_name, cached_loader.get_template_cache)
+
+
+@override_settings(
+    EMAIL_OUTBOX_BATCH_SIZE=10,
+    EMAIL_OUTBOX_RATE_LIMIT=3,
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+    EMAIL_OUTBOX_RETRY_DELAY=30,
+)
+class OutboxTestCase(TestCase):
+    """
+    Test of `accounts.tasks.send_outbox_emails`.
+    """
+
+    def create_emails(self, number):
+        OutgoingEmail.objects.bulk_create(
+            OutgoingEmail(
+                subject="Subject",
+                body="Body",
+                from_email="MODi - My Own Dictionary",
+                to_email=f"user{i}@example.com",
+            )
+            for i in range(number)
+        )
+
+    def test_send_outbox_emails_should_send_pending_emails(self):
+        self.create_emails(2)
+
+        sent = send_outbox_emails()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(
+            OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT).exists()
+        )
+
+    def test_send_outbox_emails_should_not_exceed_rate_limit(self):
+        self.create_emails(5)
+
+        send_outbox_emails()
+        send_outbox_emails()
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            OutgoingEmail.objects.filter(status=OutgoingEmail.PENDING).count(), 2
+        )
+
+    def test_send_outbox_emails_should_skip_emails_waiting_for_retry(self):
+        self.create_emails(1)
+        OutgoingEmail.objects.update(send_after=timezone.now() + timedelta(minutes=1))
+
+        send_outbox_emails()
+
+        self.assertEqual(len(mail.outbox), 0)
+
+    @patch("accounts.tasks.EmailMultiAlternatives.send", side_effect=SMTPException)
+    def test_failed_email_should_be_retried_later(self, send_mock):
+        self.create_emails(1)
+
+        send_outbox_emails()
+
+        email = OutgoingEmail.objects.get()
+
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.send_after, timezone.now() + timedelta(seconds=20))
+        self.assertIn("SMTPException", email.last_error)
+
+    @patch("accounts.tasks.get_connection", side_effect=SMTPException)
+    def test_failed_connection_should_be_recorded_on_claimed_emails(
+        self, connection_mock
+    ):
+        self.create_emails(2)
+
+        send_outbox_emails()
+
+        for email in OutgoingEmail.objects.all():
+            self.assertEqual(email.status, OutgoingEmail.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.send_after, timezone.now() + timedelta(seconds=20))
+            self.assertIn("SMTPException", email.last_error)
+
+    @patch("accounts.tasks.EmailMultiAlternatives.send", side_effect=SMTPException)
+    def test_email_should_be_dead_after_max_attempts(self, send_mock):
+        self.create_emails(1)
+
+        send_outbox_emails()
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        send_outbox_emails()
+
+        email = OutgoingEmail.objects.get()
+
+        self.assertEqual(email.status, OutgoingEmail.DEAD)
+        self.assertEqual(email.attempts, 2)
+
+    def test_purge_outbox_emails_should_delete_only_old_sent_and_dead_emails(self):
+        self.create_emails(4)
+        old = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX_MAX_AGE + 1)
+        sent, dead, pending, recent = OutgoingEmail.objects.order_by("to_email")
+        OutgoingEmail.objects.filter(id=sent.id).update(
+            status=OutgoingEmail.SENT, sent=old
+        )
+        OutgoingEmail.objects.filter(id=dead.id).update(
+            status=OutgoingEmail.DEAD, send_after=old
+        )
+        OutgoingEmail.objects.filter(id=pending.id).update(send_after=old)
+        OutgoingEmail.objects.filter(id=recent.id).update(
+            status=OutgoingEmail.SENT, sent=timezone.now()
+        )
+
+        self.assertEqual(purge_outbox_emails(), 2)
+        self.assertEqual(
+            set(OutgoingEmail.objects.values_list("id", flat=True)),
+            {pending.id, recent.id},
+        )
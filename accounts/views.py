@@ -1,5 +1,6 @@
 from django.views.generic import CreateView, DeleteView, UpdateView, TemplateView
-from django.contrib.auth import views as auth_views
+from django.contrib.auth import logout, views as auth_views
+from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.contrib import messages
 from django.contrib.auth import mixins
@@ -91,7 +92,9 @@ class UserDeleteView(LoginRequiredMixin, GetUserMixin, DeleteView):
     success_url = reverse_lazy("accounts:login")
 
     def delete(self, request, *args, **kwargs):
-        response = super().delete(request, *args, **kwargs)
+        request.user.mark_deleted()
+        logout(request)
+        response = redirect(self.success_url)
         messages.success(request, "Pomyślnie usunięto konto.")
         messages.info(request, "Pamiętaj, że możesz zarejestrować się ponownie.")
         return response
@@ -1,35 +1,134 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
 from .models import Subject, Dictionary
+from .slugs import slugify_title
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator, which on PostgreSQL takes number of rows of unfiltered huge
+    tables from statistics of the planner, instead of `COUNT(*)`.
+    """
+
+    # below this number of rows tables are counted exactly
+    estimate_threshold = 100000
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor == "postgresql" and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return int(row[0])
+        return super().count
+
+
+class AllObjectsMixin:
+    """
+    Lists objects marked as deleted as well, so unfiltered lists have no
+    `WHERE` and `EstimatedCountPaginator` can estimate them, the estimate
+    counts the same rows, which are listed.
+    """
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+
+class SlugSearchMixin:
+    """
+    Searches by prefix of slug, so diacritics and capitals don't matter,
+    e.g. 'Łoś' finds 'łosie'. On PostgreSQL the prefix can use the
+    `varchar_pattern_ops` index, which Django adds to indexed `SlugField`,
+    other databases scan the table.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.filter(slug__startswith=slugify_title(search_term)), False
+
+
+class DictionaryChangeList(ChangeList):
+    def get_queryset(self, request):
+        # words aren't displayed, they can be huge
+        return super().get_queryset(request).defer("words", "answer_keys")
 
 
 @admin.register(Dictionary)
-class DictionaryAdmin(admin.ModelAdmin):
-    list_display = ["title", "subject", "owner"]
+class DictionaryAdmin(AllObjectsMixin, SlugSearchMixin, admin.ModelAdmin):
+    list_display = ["title", "subject", "owner", "deleted"]
+    list_filter = [("deleted", admin.EmptyFieldListFilter)]
+    list_select_related = ["subject__owner"]
     ordering = ["subject", "title"]
-    list_filter = ["subject__owner"]
-    search_fields = ["subject", "title"]
+    search_fields = ["slug"]
     prepopulated_fields = {"slug": ["title"]}
+    raw_id_fields = ["subject", "word_set"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     @admin.display(description="właściciel")
     def owner(self, obj):
         return obj.subject.owner
 
+    def get_changelist(self, request, **kwargs):
+        return DictionaryChangeList
+
 
 class DictionaryInline(admin.StackedInline):
     model = Dictionary
-    exclude = ["title", "slug", "description", "words"]
+    exclude = ["title", "slug", "description", "words", "word_set"]
     extra = 0
     show_change_link = True
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).only("id", "title", "subject")
+
 
 @admin.register(Subject)
-class SubjectAdmin(admin.ModelAdmin):
-    list_display = ["title", "owner", "number_of_dicts"]
-    list_filter = ["owner"]
+class SubjectAdmin(AllObjectsMixin, SlugSearchMixin, admin.ModelAdmin):
+    list_display = ["title", "owner", "number_of_dicts", "deleted"]
+    list_filter = [("deleted", admin.EmptyFieldListFilter)]
+    list_select_related = ["owner"]
+    search_fields = ["slug"]
     prepopulated_fields = {"slug": ["title"]}
+    raw_id_fields = ["owner"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # a correlated subquery counts dictionaries of displayed subjects only,
+        # `GROUP BY` would join the whole table of dictionaries
+        number_of_dicts = (
+            Dictionary.all_objects.filter(subject=OuterRef("pk"))
+            .order_by()
+            .values("subject")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(number_of_dicts=Coalesce(Subquery(number_of_dicts), 0))
+        )
 
-    @admin.display(description="liczba słowników")
+    @admin.display(description="liczba słowników", ordering="number_of_dicts")
     def number_of_dicts(self, obj):
-        return obj.dicts.count()
+        return obj.number_of_dicts
 
     inlines = [DictionaryInline]
@@ -0,0 +1,119 @@
+"""
+Answer checking.
+
+Words and answers are compared in normalized forms: Unicode NFKC, case
+folded and with collapsed whitespace, optionally also without diacritics
+(transliterated by `unidecode`). Forms of words are precomputed, when
+a dictionary is saved (`answer_keys`), so checking an answer is a dict
+lookup and, for typos, a bounded edit distance.
+"""
+import unicodedata
+
+from django.conf import settings
+from unidecode import unidecode
+
+
+CORRECT = "correct"
+DIACRITICS = "diacritics"
+TYPO = "typo"
+WRONG = "wrong"
+
+ACCEPTED = {CORRECT, DIACRITICS, TYPO}
+
+
+def normalize(text):
+    """
+    Returns `text` in NFKC, case folded, with single spaces between words.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def fold(normalized):
+    """
+    Returns `normalized` text without diacritics, e.g. 'źdźbło' becomes 'zdzblo'.
+    """
+    return unidecode(normalized)
+
+
+def answer_keys(words):
+    """
+    Returns normalized and folded forms of `words`, keyed by definitions.
+    """
+    keys = {}
+    for definition, word in words.items():
+        normalized = normalize(word)
+        keys[definition] = [normalized, fold(normalized)]
+    return keys
+
+
+def max_typos(word):
+    """
+    Returns number of typos tolerated in `word`, short words need to be exact.
+    """
+    if len(word) < settings.ANSWER_TYPO_MIN_LENGTH:
+        return 0
+    return settings.ANSWER_MAX_TYPOS
+
+
+def bounded_levenshtein(a, b, limit):
+    """
+    Returns edit distance of `a` and `b` or `limit + 1`, if it's greater
+    than `limit`. Only a band of width `2 * limit + 1` is computed and
+    it stops as soon as the distance can't be within `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        start = max(1, i - limit)
+        end = min(len(b), i + limit)
+        current = [limit + 1] * (len(b) + 1)
+        if start == 1:
+            current[0] = i
+        for j in range(start, end + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != b[j - 1]),
+            )
+        if min(current[start - 1 : end + 1]) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[len(b)], limit + 1)
+
+
+def check_answer(answer, key, ignore_diacritics=False):
+    """
+    Returns result of `answer` for a word with `key` from `answer_keys`.
+    """
+    normalized, folded = key
+    answer = normalize(answer)
+    if answer == normalized:
+        return CORRECT
+
+    folded_answer = fold(answer)
+    if ignore_diacritics and folded_answer == folded:
+        return DIACRITICS
+
+    if ignore_diacritics:
+        answer, normalized = folded_answer, folded
+    limit = max_typos(normalized)
+    if limit and bounded_levenshtein(answer, normalized, limit) <= limit:
+        return TYPO
+    return WRONG
+
+
+def check_answers(answers, keys, ignore_diacritics=False):
+    """
+    Returns results of `answers` keyed by definitions, answers
+    to definitions which aren't in `keys` are wrong.
+    """
+    return {
+        definition: check_answer(answer, keys[definition], ignore_diacritics)
+        if definition in keys
+        else WRONG
+        for definition, answer in answers.items()
+    }
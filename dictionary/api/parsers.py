@@ -0,0 +1,17 @@
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses MessagePack request content.
+    """
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError, msgpack.ExtraData) as error:
+            raise ParseError(f"Nieprawidłowe dane MessagePack - {error}")
@@ -0,0 +1,19 @@
+import msgpack
+from rest_framework.renderers import BaseRenderer
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders data with MessagePack, which is more compact and faster
+    to parse than JSON, e.g. for words of big dictionaries.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, use_bin_type=True)
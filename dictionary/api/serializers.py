@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.core import signing
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 from rest_framework_nested.serializers import (
     NestedHyperlinkedModelSerializer,
     NestedHyperlinkedIdentityField,
@@ -16,12 +19,68 @@ class CustomUpdate:
             if hasattr(instance, attr):
                 setattr(instance, attr, value)
                 update_fields.append(attr)
+        # `slug` is derived from `title` by `dictionary.signals.populate_slug`
+        if "title" in update_fields:
+            update_fields.append("slug")
 
         instance.save(update_fields=update_fields)
         return instance
 
 
-class SubjectSerializer(CustomUpdate, serializers.HyperlinkedModelSerializer):
+def url_template(view_name, url_kwargs, request):
+    """
+    Reverses `view_name` once with placeholders of `url_kwargs`
+    and returns it as a template for `str.format`.
+    """
+    placeholders = {kwarg: f"__{kwarg}__" for kwarg in url_kwargs}
+    url = reverse(view_name, kwargs=placeholders, request=request)
+    url = url.replace("{", "{{").replace("}", "}}")
+    for kwarg, placeholder in placeholders.items():
+        url = url.replace(placeholder, "{%s}" % kwarg)
+    return url
+
+
+class ValuesListSerializerMixin:
+    """
+    Read-only fast path for lists of objects.
+
+    Builds the same output as the serializer from `values()` of a queryset,
+    without instances and DRF fields, and formats URLs from templates instead
+    of calling `reverse()` for every object. `url_fields` maps names of
+    hyperlinked fields to their view names and URL kwargs with the model
+    fields they are taken from.
+    """
+
+    url_fields = {}
+
+    @classmethod
+    def values_fields(cls):
+        fields = [field for field in cls.Meta.fields if field not in cls.url_fields]
+        for view_name, url_kwargs in cls.url_fields.values():
+            fields.extend(url_kwargs.values())
+        return list(dict.fromkeys(fields))
+
+    @classmethod
+    def represent_values(cls, queryset, request):
+        templates = {
+            field: (url_template(view_name, url_kwargs, request), url_kwargs)
+            for field, (view_name, url_kwargs) in cls.url_fields.items()
+        }
+        fields = cls.Meta.fields
+
+        data = []
+        for values in queryset.values(*cls.values_fields()):
+            for field, (template, url_kwargs) in templates.items():
+                values[field] = template.format_map(
+                    {kwarg: values[source] for kwarg, source in url_kwargs.items()}
+                )
+            data.append({field: values[field] for field in fields})
+        return data
+
+
+class SubjectSerializer(
+    CustomUpdate, ValuesListSerializerMixin, serializers.HyperlinkedModelSerializer
+):
     dictionaries = serializers.HyperlinkedIdentityField(
         view_name="dictionary-list", lookup_url_kwarg="subject_pk"
     )
@@ -31,8 +90,15 @@ class SubjectSerializer(CustomUpdate, serializers.HyperlinkedModelSerializer):
         fields = ["url", "id", "slug", "title", "dictionaries"]
         read_only_fields = ["url", "id", "slug"]
 
+    url_fields = {
+        "url": ("subject-detail", {"pk": "id"}),
+        "dictionaries": ("dictionary-list", {"subject_pk": "id"}),
+    }
+
 
-class DictionarySerializer(CustomUpdate, NestedHyperlinkedModelSerializer):
+class DictionarySerializer(
+    CustomUpdate, ValuesListSerializerMixin, NestedHyperlinkedModelSerializer
+):
     parent_lookup_kwargs = {
         "subject_pk": "subject__id",
     }
@@ -45,6 +111,11 @@ class DictionarySerializer(CustomUpdate, NestedHyperlinkedModelSerializer):
         fields = ["url", "id", "slug", "title", "description", "words"]
         read_only_fields = ["url", "id", "slug"]
 
+    url_fields = {
+        "url": ("dictionary-detail", {"subject_pk": "subject_id", "pk": "id"}),
+        "words": ("dictionary-words", {"subject_pk": "subject_id", "pk": "id"}),
+    }
+
 
 class WordSerializer(serializers.Serializer):
     word = serializers.CharField(max_length=30)
@@ -53,3 +124,50 @@ class WordSerializer(serializers.Serializer):
 
 class WordToDeleteSerializer(serializers.Serializer):
     definition = serializers.CharField(max_length=60)
+
+
+class AnswerSerializer(serializers.Serializer):
+    answer = serializers.CharField(max_length=30, allow_blank=True)
+    ignore_diacritics = serializers.BooleanField(default=False)
+
+
+class AnswersSerializer(serializers.Serializer):
+    answers = serializers.DictField(
+        child=serializers.CharField(max_length=30, allow_blank=True)
+    )
+    ignore_diacritics = serializers.BooleanField(default=False)
+
+
+class ReviewSerializer(serializers.Serializer):
+    key = serializers.UUIDField()
+    definition = serializers.CharField(max_length=60)
+    answer = serializers.CharField(max_length=30, allow_blank=True)
+
+
+class SyncSerializer(serializers.Serializer):
+    reviews = ReviewSerializer(many=True)
+    ignore_diacritics = serializers.BooleanField(default=False)
+
+    def validate_reviews(self, value):
+        if len(value) > settings.API_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                "Można przesłać najwyżej %d odpowiedzi naraz."
+                % settings.API_BULK_MAX_ITEMS
+            )
+        return value
+
+
+class CloneSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    title = serializers.CharField(max_length=30, required=False)
+
+    def validate_token(self, value):
+        """
+        Returns dictionary shared by the token.
+        """
+        try:
+            return Dictionary.from_share_token(value)
+        except signing.BadSignature:
+            raise serializers.ValidationError("Token jest nieprawidłowy lub wygasł.")
+        except Dictionary.DoesNotExist:
+            raise serializers.ValidationError("Udostępniony słownik nie istnieje.")
@@ -1,15 +1,32 @@
+from io import BytesIO
 from unittest.mock import Mock, patch
+from uuid import UUID
 
+import msgpack
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
 from django.urls import reverse
 
 from rest_framework import status
+from rest_framework.exceptions import ParseError
 from rest_framework.test import APITestCase
 
-from dictionary.models import Subject, Dictionary
+from dictionary.learning import LearningSession
+from dictionary.models import Subject, Dictionary, Review
+from dictionary.sync import upload_reviews
 from accounts.models import User
-from dictionary.api.serializers import CustomUpdate
+from accounts.api.tokens import AccessToken
+from dictionary.api.serializers import (
+    CustomUpdate,
+    SubjectSerializer,
+    DictionarySerializer,
+    url_template,
+)
 from dictionary.api.views import SearchMixin
 
+from .parsers import MessagePackParser
 from .permissions import IsOwnerPermission
 
 
@@ -84,6 +101,63 @@ class CustomUpdateTestCase(APITestCase):
         self.assertEqual(result.words, self.validated_data["words"])
 
 
+class ValuesListViewMixinTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+        Subject.objects.create(title="Polish", owner=cls.user)
+
+        Dictionary.objects.create(
+            title="Basic words", subject=cls.subject, words={"wojna": "war"}
+        )
+        Dictionary.objects.create(
+            title="Popular words", subject=cls.subject, description="Opis"
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+
+    def test_url_template_should_format_to_reversed_url(self):
+        template = url_template("dictionary-detail", ["subject_pk", "pk"], request=None)
+
+        self.assertEqual(
+            template.format(subject_pk=1, pk=2),
+            reverse("dictionary-detail", args=[1, 2]),
+        )
+
+    def test_subjects_list_should_be_the_same_as_from_serializer(self):
+        response = self.client.get(reverse("subject-list"))
+
+        serializer = SubjectSerializer(
+            self.user.subjects.all(),
+            many=True,
+            context={"request": response.wsgi_request},
+        )
+        self.assertEqual(response.json(), serializer.data)
+
+    def test_dictionaries_list_should_be_the_same_as_from_serializer(self):
+        response = self.client.get(reverse("dictionary-list", args=[self.subject.id]))
+
+        serializer = DictionarySerializer(
+            self.subject.dicts.all(),
+            many=True,
+            context={"request": response.wsgi_request},
+        )
+        self.assertEqual(response.json(), serializer.data)
+
+    def test_dictionaries_list_should_need_one_query(self):
+        with self.assertNumQueries(1):
+            data = DictionarySerializer.represent_values(
+                self.subject.dicts.all(), request=None
+            )
+
+        self.assertEqual(len(data), 2)
+
+
 class SearchMixinTestCase(APITestCase):
     def setUp(self):
         self.search_obj = SearchMixin()
@@ -176,12 +250,23 @@ class SubjectViewSetTestCase(APITestCase):
 
         self.assertGreater(dictionaries_after, dictionaries_before)
 
-    def test_http_post_method_should_return_status_400_when_requested_with_data_of_existed_subject(
+    def test_http_post_method_should_return_suffixed_slug_when_requested_with_data_of_existed_subject(
         self,
     ):
         response = self.client.post(reverse("subject-list"), data={"title": "English"})
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["slug"], "english-2")
+
+    def test_http_patch_method_should_update_slug_with_title(self):
+        response = self.client.patch(
+            reverse("subject-detail", args=[self.subject.id]), data={"title": "Polish"}
+        )
+
+        self.subject.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.subject.slug, "polish")
 
 
 class DictionaryViewSetTestCase(APITestCase):
@@ -240,7 +325,7 @@ class DictionaryViewSetTestCase(APITestCase):
 
         self.assertGreater(dictionaries_after, dictionaries_before)
 
-    def test_http_post_method_should_return_status_400_when_requested_with_data_of_existed_dictionary(
+    def test_http_post_method_should_return_suffixed_slug_when_requested_with_data_of_existed_dictionary(
         self,
     ):
         response = self.client.post(
@@ -248,7 +333,8 @@ class DictionaryViewSetTestCase(APITestCase):
             data={"title": "Basic words"},
         )
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["slug"], "basic-words-2")
 
 
 class WordsRequestsTestCase(APITestCase):
@@ -389,3 +475,540 @@ class WordsRequestsTestCase(APITestCase):
         )
 
         refresh_list_mock.assert_called()
+
+
+class DuplicatesRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words",
+            subject=cls.subject,
+            words={"wojna": "war", "Wojna!": "war", "kot": "cat"},
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+        self.url = reverse(
+            "dictionary-duplicates", args=[self.subject.id, self.dictionary.id]
+        )
+
+    def test_http_get_method_should_return_groups_of_similar_definitions(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data, {"groups": [["Wojna!", "wojna"]]})
+
+    def test_http_get_method_should_return_definitions_similar_to_given_one(self):
+        response = self.client.get(self.url, {"definition": "KOT"})
+
+        self.assertEqual(response.data, {"similar": ["kot"]})
+
+
+class BearerTokenWordsRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject, words={"wojna": "war"}
+        )
+
+    def setUp(self):
+        access = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        self.url = reverse(
+            "dictionary-edit-words", args=[self.subject.id, self.dictionary.id]
+        )
+
+    def test_staged_words_should_be_kept_between_requests_without_session(self):
+        response = self.client.put(self.url, data={"word": "cat", "definition": "kot"})
+
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data, {"wojna": "war", "kot": "cat"})
+        self.assertFalse(Session.objects.exists())
+
+    def test_saving_staged_words_should_update_dictionary(self):
+        self.client.delete(self.url, data={"definition": "wojna"})
+        self.client.post(self.url)
+
+        self.dictionary.refresh_from_db()
+
+        self.assertEqual(self.dictionary.words, {})
+        self.assertEqual(self.client.get(self.url).data, {})
+
+
+class MessagePackTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject, words={"wojna": "war"}
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+        self.url = reverse(
+            "dictionary-edit-words", args=[self.subject.id, self.dictionary.id]
+        )
+
+    def test_words_should_be_rendered_with_msgpack_when_accepted(self):
+        response = self.client.get(
+            reverse("dictionary-words", args=[self.subject.id, self.dictionary.id]),
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), {"wojna": "war"})
+
+    def test_json_should_stay_default(self):
+        response = self.client.get(
+            reverse("dictionary-words", args=[self.subject.id, self.dictionary.id])
+        )
+
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_word_sent_with_msgpack_should_be_added(self):
+        response = self.client.put(
+            self.url,
+            data=msgpack.packb({"word": "cat", "definition": "kot"}),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {"wojna": "war", "kot": "cat"})
+
+    def test_invalid_msgpack_should_return_status_400(self):
+        response = self.client.put(
+            self.url, data=b"\xc1", content_type="application/msgpack"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_msgpack_of_wrong_types_should_raise_parse_error(self):
+        with patch("msgpack.unpackb", side_effect=TypeError("unhashable")):
+            with self.assertRaises(ParseError):
+                MessagePackParser().parse(BytesIO(b"\x81\x91\x01\x01"))
+
+
+class BulkRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.another_user = User.objects.create_user(
+            email="another@email.com", username="AnotherUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+        cls.another_subject = Subject.objects.create(
+            title="English", owner=cls.another_user
+        )
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+
+    def test_subjects_should_be_created_with_unique_slugs(self):
+        response = self.client.post(
+            reverse("subject-bulk"),
+            data=[{"title": "English"}, {"title": "Polish"}, {"title": "English"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [subject["slug"] for subject in response.data],
+            ["english-2", "english-3", "polish"],
+        )
+        self.assertEqual(self.user.subjects.count(), 4)
+
+    def test_subjects_should_be_created_with_constant_number_of_queries(self):
+        data = [{"title": f"Subject {i}"} for i in range(20)]
+
+        # session, user, slugs, savepoint, insert, savepoint, list
+        with self.assertNumQueries(7):
+            self.client.post(reverse("subject-bulk"), data=data, format="json")
+
+    def test_invalid_item_should_return_errors_per_item_and_create_nothing(self):
+        response = self.client.post(
+            reverse("subject-bulk"),
+            data=[{"title": "Polish"}, {"title": ""}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("title", response.data[1])
+        self.assertEqual(self.user.subjects.count(), 1)
+
+    def test_data_which_is_not_a_list_should_return_status_400(self):
+        response = self.client.post(
+            reverse("subject-bulk"), data={"title": "Polish"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_dictionaries_should_be_created_in_subject(self):
+        response = self.client.post(
+            reverse("dictionary-bulk", args=[self.subject.id]),
+            data=[{"title": "Basic words", "description": "Opis"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data[0]["slug"], "basic-words-2")
+        self.assertEqual(self.subject.dicts.count(), 2)
+
+    def test_dictionaries_should_not_be_created_in_subject_of_another_user(self):
+        response = self.client.post(
+            reverse("dictionary-bulk", args=[self.another_subject.id]),
+            data=[{"title": "Basic words"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(self.another_subject.dicts.exists())
+
+    def test_dictionaries_should_be_updated_with_slugs(self):
+        another_dictionary = Dictionary.objects.create(
+            title="Popular words", subject=self.subject
+        )
+
+        response = self.client.patch(
+            reverse("dictionary-bulk", args=[self.subject.id]),
+            data=[
+                {"id": self.dictionary.id, "title": "Popular words"},
+                {"id": another_dictionary.id, "description": "Opis"},
+            ],
+            format="json",
+        )
+
+        self.dictionary.refresh_from_db()
+        another_dictionary.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.dictionary.slug, "popular-words-2")
+        self.assertEqual(another_dictionary.slug, "popular-words")
+        self.assertEqual(another_dictionary.description, "Opis")
+
+    def test_update_of_subject_of_another_user_should_return_error_of_item(self):
+        response = self.client.patch(
+            reverse("subject-bulk"),
+            data=[
+                {"id": self.subject.id, "title": "Polish"},
+                {"id": self.another_subject.id, "title": "Polish"},
+            ],
+            format="json",
+        )
+
+        self.subject.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("id", response.data[1])
+        self.assertEqual(self.subject.title, "English")
+
+    def test_update_with_malformed_id_should_return_error_of_item(self):
+        response = self.client.patch(
+            reverse("subject-bulk"),
+            data=[{"id": [self.subject.id]}, {"id": {"id": 1}}, {"id": True}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, [{"id": ["Nie znaleziono."]}] * 3)
+
+
+class CloneRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.another_user = User.objects.create_user(
+            email="another@email.com", username="AnotherUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+        cls.another_subject = Subject.objects.create(
+            title="English", owner=cls.another_user
+        )
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject, words={"wojna": "war"}
+        )
+
+    def share(self):
+        self.client.login(username="TestUser", password="test1234")
+        response = self.client.post(
+            reverse("dictionary-share", args=[self.subject.id, self.dictionary.id])
+        )
+        self.client.logout()
+        return response.data["token"]
+
+    def test_shared_dictionary_should_be_cloned_by_another_user(self):
+        token = self.share()
+        self.client.login(username="AnotherUser", password="test1234")
+
+        response = self.client.post(
+            reverse("dictionary-clone", args=[self.another_subject.id]),
+            data={"token": token},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get(response.data["words"]).data, {"wojna": "war"})
+
+    def test_dictionary_of_another_user_should_not_be_shared(self):
+        self.client.login(username="AnotherUser", password="test1234")
+
+        response = self.client.post(
+            reverse("dictionary-share", args=[self.subject.id, self.dictionary.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_token_should_return_status_400(self):
+        self.client.login(username="AnotherUser", password="test1234")
+
+        response = self.client.post(
+            reverse("dictionary-clone", args=[self.another_subject.id]),
+            data={"token": "invalid"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LearningRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject, words={"wojna": "war"}
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+        self.url = reverse(
+            "dictionary-learning", args=[self.subject.id, self.dictionary.id]
+        )
+        self.client.delete(self.url)
+
+    def test_http_get_method_should_return_current_card(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data["definition"], "wojna")
+        self.assertEqual(response.data["remaining"], 1)
+
+    def test_http_post_method_should_check_answer(self):
+        response = self.client.post(self.url, data={"answer": " war "})
+
+        self.assertTrue(response.data["correct"])
+        self.assertEqual(response.data["word"], "war")
+        self.assertIsNone(response.data["definition"])
+
+    def test_http_post_method_should_return_status_400_when_learning_is_completed(
+        self,
+    ):
+        self.client.post(self.url, data={"answer": "war"})
+
+        response = self.client.post(self.url, data={"answer": "war"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_answer_with_typo_should_be_accepted(self):
+        dictionary = Dictionary.objects.create(
+            title="Popular words", subject=self.subject, words={"słowo": "word"}
+        )
+        url = reverse("dictionary-learning", args=[self.subject.id, dictionary.id])
+
+        response = self.client.post(url, data={"answer": "wrod"})
+
+        self.assertEqual(response.data["result"], "wrong")
+
+        response = self.client.post(url, data={"answer": "worrd"})
+
+        self.assertEqual(response.data["result"], "typo")
+        self.assertTrue(response.data["correct"])
+
+    def test_answers_should_be_checked_in_batch(self):
+        response = self.client.post(
+            reverse(
+                "dictionary-check-answers", args=[self.subject.id, self.dictionary.id]
+            ),
+            data={"answers": {"wojna": "WAR", "pokój": "peace"}},
+            format="json",
+        )
+
+        self.assertEqual(response.data, {"wojna": "correct", "pokój": "wrong"})
+
+
+class SyncRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words",
+            subject=cls.subject,
+            words={"wojna": "war", "pokój": "peace"},
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+        self.url = reverse(
+            "dictionary-sync", args=[self.subject.id, self.dictionary.id]
+        )
+        self.edit_url = reverse(
+            "dictionary-edit-words", args=[self.subject.id, self.dictionary.id]
+        )
+        self.client.delete(
+            reverse("dictionary-learning", args=[self.subject.id, self.dictionary.id])
+        )
+
+    def reviews(self, *answers):
+        """
+        Helper function, returns reviews of `answers`, pairs of a definition
+        and an answer, with fixed keys.
+        """
+        return [
+            {
+                "key": f"00000000-0000-0000-0000-00000000000{i}",
+                "definition": definition,
+                "answer": answer,
+            }
+            for i, (definition, answer) in enumerate(answers)
+        ]
+
+    def test_http_get_method_without_version_should_return_all_words(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.data,
+            {"version": 0, "full": True, "words": {"wojna": "war", "pokój": "peace"}},
+        )
+
+    def test_http_get_method_should_return_words_changed_after_version(self):
+        self.client.put(self.edit_url, data={"word": "love", "definition": "miłość"})
+        self.client.post(self.edit_url)
+        self.client.delete(self.edit_url, data={"definition": "wojna"})
+        self.client.post(self.edit_url)
+
+        response = self.client.get(self.url, data={"since": 1})
+
+        self.assertEqual(
+            response.data, {"version": 2, "full": False, "changes": {"wojna": None}}
+        )
+
+    def test_http_post_method_should_apply_reviews_once(self):
+        reviews = self.reviews(("wojna", "war"), ("pokój", "piece"))
+
+        self.client.post(self.url, data={"reviews": reviews}, format="json")
+        response = self.client.post(self.url, data={"reviews": reviews}, format="json")
+
+        self.assertEqual(
+            response.data["results"],
+            {reviews[0]["key"]: "correct", reviews[1]["key"]: "wrong"},
+        )
+        self.assertEqual(response.data["definition"], "pokój")
+        self.assertEqual(response.data["remaining"], 1)
+        self.assertEqual(response.data["correct"], 1)
+        self.assertEqual(response.data["wrong"], 1)
+
+    def test_batch_replayed_by_concurrent_request_should_be_applied_once(self):
+        reviews = [
+            {**review, "key": UUID(review["key"])}
+            for review in self.reviews(("wojna", "war"), ("pokój", "piece"))
+        ]
+        # both requests have read the session before either applied the batch
+        first, second = [LearningSession(self.user, self.dictionary) for _ in range(2)]
+
+        upload_reviews(self.user, first, reviews[:1])
+        results = upload_reviews(self.user, second, reviews)
+
+        self.assertEqual(
+            results,
+            {str(reviews[0]["key"]): "correct", str(reviews[1]["key"]): "wrong"},
+        )
+        self.assertEqual(Review.objects.count(), 2)
+        state = LearningSession(self.user, self.dictionary).get_state()
+        self.assertEqual(
+            (state["remaining"], state["correct"], state["wrong"]), (1, 1, 1)
+        )
+
+    def test_http_post_method_should_reject_too_many_reviews(self):
+        reviews = self.reviews(("wojna", "war"), ("pokój", "peace"))
+
+        with self.settings(API_BULK_MAX_ITEMS=1):
+            response = self.client.post(
+                self.url, data={"reviews": reviews}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ThrottlingRequestsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username="TestUser", password="test1234")
+        self.url = reverse(
+            "dictionary-edit-words", args=[self.subject.id, self.dictionary.id]
+        )
+
+    def test_word_edits_over_budget_should_return_status_429_with_retry_after(self):
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"reads": "10/min", "word_edits": "1/min"},
+        }
+
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            self.client.put(self.url, data={"word": "war", "definition": "wojna"})
+            response = self.client.put(
+                self.url, data={"word": "peace", "definition": "pokój"}
+            )
+            read_response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertTrue(1 <= int(response["Retry-After"]) <= 60)
+        self.assertEqual(read_response.status_code, status.HTTP_200_OK)
@@ -1,19 +1,29 @@
 from rest_framework import viewsets, permissions, serializers, status, exceptions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.settings import api_settings
 
-from django.db import IntegrityError
-from django.utils.text import slugify
-from unidecode import unidecode
+from django.conf import settings
+from django.db import IntegrityError, transaction
 
 from .serializers import (
     SubjectSerializer,
     DictionarySerializer,
     WordSerializer,
     WordToDeleteSerializer,
+    CloneSerializer,
+    AnswerSerializer,
+    AnswersSerializer,
+    SyncSerializer,
 )
 from .permissions import IsOwnerPermission
+from .renderers import MessagePackRenderer
+from .parsers import MessagePackParser
+from ..answers import ACCEPTED, check_answers
+from ..learning import LearningSession
 from ..models import Subject
+from ..slugs import slugify_title, allocate_slugs
+from ..sync import get_delta, upload_reviews
 from ..words import Words, DuplicateError, DefinitionDoesNotExist
 
 
@@ -21,6 +31,148 @@ class IsAuthenticatedOwnerMixin:
     permission_classes = [permissions.IsAuthenticated, IsOwnerPermission]
 
 
+class MessagePackMixin:
+    """
+    Adds MessagePack to content negotiation, e.g. `Accept: application/msgpack`
+    or `?format=msgpack`, JSON stays the default.
+    """
+
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, MessagePackRenderer]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, MessagePackParser]
+
+
+class MarkDeletedMixin:
+    """
+    Destroyed objects are only marked as deleted,
+    they are deleted later by `dictionary.tasks.purge_deleted`.
+    """
+
+    def perform_destroy(self, instance):
+        instance.mark_deleted()
+
+
+class ValuesListViewMixin:
+    """
+    Lists objects with `represent_values` of the serializer,
+    see `dictionary.api.serializers.ValuesListSerializerMixin`.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        return Response(serializer_class.represent_values(queryset, request))
+
+
+class BulkMixin:
+    """
+    Adds `bulk/` endpoint, where POST creates and PATCH updates a list of
+    objects. Items are validated all together and errors are returned
+    per item, in the order of the list. Slugs are allocated for all objects
+    with one query and objects are saved with one `bulk_create` or
+    `bulk_update` in a transaction, so nothing is saved if anything fails.
+
+    Objects are saved without `pre_save` signals, slugs are set here.
+    """
+
+    throttle_scopes = {"create_many": "bulk", "update_many": "bulk"}
+
+    def get_bulk_parent(self):
+        """
+        Returns fields of the parent, which are set on created objects.
+        """
+        raise NotImplementedError
+
+    def get_bulk_data(self):
+        data = self.request.data
+        if not isinstance(data, list):
+            raise serializers.ValidationError({"detail": "Oczekiwano listy obiektów."})
+        if len(data) > settings.API_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                {
+                    "detail": "Można przesłać najwyżej %d obiektów naraz."
+                    % settings.API_BULK_MAX_ITEMS
+                }
+            )
+        return data
+
+    @action(detail=False, methods=["POST"], url_path="bulk", url_name="bulk")
+    def create_many(self, request, *args, **kwargs):
+        parent = self.get_bulk_parent()
+        serializer = self.get_serializer(data=self.get_bulk_data(), many=True)
+        serializer.is_valid(raise_exception=True)
+
+        model = self.get_serializer_class().Meta.model
+        objects = [model(**item, **parent) for item in serializer.validated_data]
+        if objects:
+            self.save_many(objects, parent)
+
+        # primary keys of `bulk_create` aren't returned by every database
+        queryset = self.get_queryset().filter(slug__in=[obj.slug for obj in objects])
+        return Response(
+            data=self.get_serializer_class().represent_values(queryset, request),
+            status=status.HTTP_201_CREATED,
+        )
+
+    @create_many.mapping.patch
+    def update_many(self, request, *args, **kwargs):
+        parent = self.get_bulk_parent()
+        data = self.get_bulk_data()
+        # malformed ids, e.g. lists, are reported like unknown ones
+        ids = [item.get("id") if isinstance(item, dict) else None for item in data]
+        ids = [
+            id if isinstance(id, int) and not isinstance(id, bool) else None
+            for id in ids
+        ]
+        instances = self.get_queryset().in_bulk(filter(None, ids))
+
+        objects, errors, fields = [], [], set()
+        for item, id in zip(data, ids):
+            instance = instances.get(id)
+            if instance is None:
+                errors.append({"id": ["Nie znaleziono."]})
+                continue
+            if instance in objects:
+                errors.append({"id": ["Obiekt występuje na liście więcej niż raz."]})
+                continue
+            serializer = self.get_serializer(instance, data=item, partial=True)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+                fields.add(attr)
+            objects.append(instance)
+            errors.append({})
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        if objects and fields:
+            self.save_many(objects, parent, update_fields=[*sorted(fields), "slug"])
+
+        queryset = self.get_queryset().filter(id__in=[obj.id for obj in objects])
+        return Response(
+            data=self.get_serializer_class().represent_values(queryset, request)
+        )
+
+    def save_many(self, objects, parent, update_fields=None):
+        """
+        Allocates slugs within `parent` and creates `objects`
+        or, if `update_fields` are given, updates them.
+        """
+        manager = type(objects[0]).objects
+        scope = {f"{field}_id": value.id for field, value in parent.items()}
+        try:
+            with transaction.atomic():
+                for obj, slug in zip(objects, allocate_slugs(objects, **scope)):
+                    obj.slug = slug
+                if update_fields:
+                    manager.bulk_update(objects, update_fields)
+                else:
+                    manager.bulk_create(objects)
+        except IntegrityError:
+            raise serializers.ValidationError(self.integrity_error_messages)
+
+
 class SearchMixin:
     def return_found_or_all(self, queryset):
         """
@@ -32,15 +184,27 @@ class SearchMixin:
         query = self.request.query_params.get("search")
         if query:
             if queryset:
-                found = queryset.filter(slug__icontains=slugify(unidecode(query)))
+                found = queryset.filter(slug__icontains=slugify_title(query))
                 if not found:
                     return queryset
                 return found
         return queryset
 
 
-class SubjectViewSet(IsAuthenticatedOwnerMixin, SearchMixin, viewsets.ModelViewSet):
+class SubjectViewSet(
+    IsAuthenticatedOwnerMixin,
+    MessagePackMixin,
+    SearchMixin,
+    ValuesListViewMixin,
+    BulkMixin,
+    MarkDeletedMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = SubjectSerializer
+    integrity_error_messages = [
+        "Dodawanie tematu się nie powiodło.",
+        "Temat o takiej lub podobnej nazwie najprawdopodobniej już istnieje.",
+    ]
 
     def get_queryset(self):
         queryset = self.request.user.subjects.all()
@@ -50,16 +214,35 @@ class SubjectViewSet(IsAuthenticatedOwnerMixin, SearchMixin, viewsets.ModelViewS
         try:
             serializer.save(owner=self.request.user)
         except IntegrityError:
-            raise serializers.ValidationError(
-                [
-                    "Dodawanie tematu się nie powiodło.",
-                    "Temat o takiej lub podobnej nazwie najprawdopodobniej już istnieje.",
-                ]
-            )
+            raise serializers.ValidationError(self.integrity_error_messages)
 
+    def get_bulk_parent(self):
+        return {"owner": self.request.user}
 
-class DictionaryViewSet(IsAuthenticatedOwnerMixin, SearchMixin, viewsets.ModelViewSet):
+
+class DictionaryViewSet(
+    IsAuthenticatedOwnerMixin,
+    MessagePackMixin,
+    SearchMixin,
+    ValuesListViewMixin,
+    BulkMixin,
+    MarkDeletedMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = DictionarySerializer
+    throttle_scopes = {
+        **BulkMixin.throttle_scopes,
+        "clone": "bulk",
+        "upload_reviews": "bulk",
+        "add_word": "word_edits",
+        "delete_word": "word_edits",
+        "save_words": "word_edits",
+        "refresh_words": "word_edits",
+    }
+    integrity_error_messages = [
+        "Dodawanie słownika się nie powiodło.",
+        "Słownik o takiej lub podobnej nazwie najprawdopodobniej już istnieje.",
+    ]
 
     def dispatch(self, request, *args, **kwargs):
         subject_id = self.kwargs.get("subject_pk")
@@ -79,12 +262,45 @@ class DictionaryViewSet(IsAuthenticatedOwnerMixin, SearchMixin, viewsets.ModelVi
         try:
             serializer.save(subject=self.subject)
         except IntegrityError:
-            raise serializers.ValidationError(
-                [
-                    "Dodawanie słownika się nie powiodło.",
-                    "Słownik o takiej lub podobnej nazwie najprawdopodobniej już istnieje.",
-                ]
+            raise serializers.ValidationError(self.integrity_error_messages)
+
+    def get_subject(self):
+        """
+        Returns subject from URL, if it belongs to the user.
+        """
+        if self.subject is None:
+            raise exceptions.NotFound({"detail": "Nie znaleziono."})
+        self.check_object_permissions(self.request, self.subject)
+        return self.subject
+
+    def get_bulk_parent(self):
+        return {"subject": self.get_subject()}
+
+    @action(detail=True, methods=["POST"])
+    def share(self, request, *args, **kwargs):
+        """
+        Returns token, which lets other users clone the dictionary.
+        """
+        dictionary = self.get_object()
+        return Response(data={"token": dictionary.get_share_token()})
+
+    @action(detail=False, methods=["POST"])
+    def clone(self, request, *args, **kwargs):
+        """
+        Clones dictionary shared by token to the subject, words aren't copied.
+        """
+        subject = self.get_subject()
+        serializer = CloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            dictionary = serializer.validated_data["token"].clone(
+                subject, serializer.validated_data.get("title")
             )
+        except IntegrityError:
+            raise serializers.ValidationError(self.integrity_error_messages)
+        return Response(
+            data=self.get_serializer(dictionary).data, status=status.HTTP_201_CREATED
+        )
 
     @action(detail=True)
     def words(self, request, *args, **kwargs):
@@ -92,12 +308,12 @@ class DictionaryViewSet(IsAuthenticatedOwnerMixin, SearchMixin, viewsets.ModelVi
         Return words from `Dictionary` object.
         """
         dictionary = self.get_object()
-        return Response(data=dictionary.words)
+        return Response(data=dictionary.get_words())
 
     @action(detail=True, url_path="words/edit")
     def edit_words(self, request, *args, **kwargs):
         """
-        Returns words from session.
+        Returns words with unsaved changes of the user.
         """
         words = Words(request, self.get_object())
         return Response(data=dict(words.get_words()))
@@ -139,11 +355,111 @@ class DictionaryViewSet(IsAuthenticatedOwnerMixin, SearchMixin, viewsets.ModelVi
             raise serializers.ValidationError(error)
         return Response(data=dict(words.get_words()))
 
+    @action(detail=True, url_path="words/edit/duplicates")
+    def duplicates(self, request, *args, **kwargs):
+        """
+        Returns edited definitions similar to `definition` query
+        parameter, e.g. to warn before adding it, or, without it,
+        all groups of similar definitions.
+        """
+        words = Words(request, self.get_object())
+        definition = request.query_params.get("definition")
+        if definition:
+            data = {"similar": words.index.find_similar(definition.strip())}
+        else:
+            data = {"groups": words.find_duplicates()}
+        # the index is kept in the cache, when it's built
+        words.save()
+        return Response(data=data)
+
     @action(detail=True, url_path="words/edit/refresh", methods=["POST"])
     def refresh_words(self, request, *args, **kwargs):
         """
-        Copies words from `Dictionary` object to session.
+        Discards unsaved changes of the user.
         """
         words = Words(request, self.get_object())
         words.refresh_list()
         return Response(data=dict(words.get_words()))
+
+    @action(detail=True)
+    def learning(self, request, *args, **kwargs):
+        """
+        Returns state of learning session of the user, see `dictionary.learning`.
+        """
+        session = LearningSession(request.user, self.get_object())
+        return Response(data=session.get_state())
+
+    @learning.mapping.post
+    def answer_card(self, request, *args, **kwargs):
+        """
+        Checks answer for the current card and returns the next one.
+        """
+        serializer = AnswerSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        session = LearningSession(request.user, self.get_object())
+        if session.definition is None:
+            raise serializers.ValidationError("Nauka tego słownika została ukończona.")
+        result, word = session.answer(**serializer.validated_data)
+        return Response(
+            data={
+                "result": result,
+                "correct": result in ACCEPTED,
+                "word": word,
+                **session.get_state(),
+            }
+        )
+
+    @learning.mapping.delete
+    def restart_learning(self, request, *args, **kwargs):
+        """
+        Starts learning again with a newly shuffled deck.
+        """
+        session = LearningSession(request.user, self.get_object())
+        session.restart()
+        return Response(data=session.get_state())
+
+    @action(detail=True)
+    def sync(self, request, *args, **kwargs):
+        """
+        Returns words changed after version of `since` query parameter,
+        or all words without it, see `dictionary.sync`.
+        """
+        try:
+            since = int(request.query_params.get("since", 0))
+        except ValueError:
+            raise serializers.ValidationError({"since": "Wersja musi być liczbą."})
+        return Response(data=get_delta(self.get_object(), since))
+
+    @sync.mapping.post
+    def upload_reviews(self, request, *args, **kwargs):
+        """
+        Applies answers given offline to the learning session, a batch
+        can be sent again safely, see `dictionary.sync`.
+        """
+        serializer = SyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        session = LearningSession(request.user, self.get_object())
+        results = upload_reviews(
+            request.user,
+            session,
+            serializer.validated_data["reviews"],
+            serializer.validated_data["ignore_diacritics"],
+        )
+        return Response(data={"results": results, **session.get_state()})
+
+    @action(detail=True, methods=["POST"], url_path="answers/check")
+    def check_answers(self, request, *args, **kwargs):
+        """
+        Checks answers keyed by definitions, e.g. of learning offline,
+        see `dictionary.answers`.
+        """
+        serializer = AnswersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        dictionary = self.get_object()
+        return Response(
+            data=check_answers(
+                serializer.validated_data["answers"],
+                dictionary.get_answer_keys(),
+                serializer.validated_data["ignore_diacritics"],
+            )
+        )
@@ -0,0 +1,16 @@
+"""
+Helpers of the benchmark management commands of `dictionary`.
+"""
+import time
+
+
+def measure(function, repeat):
+    """
+    Returns the best time of `repeat` calls of `function` in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
@@ -0,0 +1,135 @@
+"""
+Near-duplicate detection of definitions.
+
+Definitions are compared by keys without case, diacritics, punctuation and
+extra whitespace, and by similarity of their character trigrams. Similar
+definitions are found with MinHash signatures split into bands (LSH), so a
+lookup only compares definitions which share a band, instead of all of them.
+"""
+import re
+import zlib
+
+from django.conf import settings
+from unidecode import unidecode
+
+
+SIGNATURE_SIZE = 8
+ROWS_PER_BAND = 2
+BANDS = SIGNATURE_SIZE // ROWS_PER_BAND
+
+# coefficients of hash functions of MinHash, `(a * x + b) % PRIME`
+PRIME = (1 << 61) - 1
+COEFFICIENTS = [
+    (0x5BD1E995 * (i + 1) | 1, 0x1B873593 * (i + 7)) for i in range(SIGNATURE_SIZE)
+]
+
+
+def definition_key(definition):
+    """
+    Returns `definition` without case, diacritics, punctuation and extra
+    whitespace, e.g. ' Źdźbło, trawy! ' becomes 'zdzblo trawy'.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", unidecode(definition).lower()).split())
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(first, second):
+    """
+    Returns Jaccard similarity of trigrams of two keys.
+    """
+    first, second = trigrams(first), trigrams(second)
+    return len(first & second) / len(first | second)
+
+
+def bands(key):
+    """
+    Returns LSH bands of MinHash signature of `key`.
+    """
+    hashes = [zlib.crc32(gram.encode()) for gram in trigrams(key)]
+    signature = [min((a * x + b) % PRIME for x in hashes) for a, b in COEFFICIENTS]
+    return [
+        zlib.crc32(repr(signature[i : i + ROWS_PER_BAND]).encode())
+        for i in range(0, SIGNATURE_SIZE, ROWS_PER_BAND)
+    ]
+
+
+class DuplicateIndex:
+    """
+    Index of definitions for `find_similar` and `find_duplicates`.
+
+    `entries` map definitions to their keys and bands, they are computed
+    once per definition and can be stored, e.g. in the cache, lookup
+    tables are rebuilt from them without hashing.
+    """
+
+    def __init__(self, entries=None):
+        self.entries = {}
+        self.keys = {}
+        self.buckets = {}
+        for definition, entry in (entries or {}).items():
+            self._insert(definition, entry)
+
+    @classmethod
+    def build(cls, definitions):
+        index = cls()
+        for definition in definitions:
+            index.add(definition)
+        return index
+
+    def add(self, definition):
+        key = definition_key(definition)
+        self._insert(definition, [key, *bands(key)])
+
+    def remove(self, definition):
+        entry = self.entries.pop(definition, None)
+        if entry is None:
+            return
+        key, *definition_bands = entry
+        self.keys[key].discard(definition)
+        for band in enumerate(definition_bands):
+            self.buckets[band].discard(definition)
+
+    def find_similar(self, definition):
+        """
+        Returns indexed definitions similar to `definition`, sorted.
+        """
+        key = definition_key(definition)
+        similar = set(self.keys.get(key, ()))
+        for band in enumerate(bands(key)):
+            for candidate in self.buckets.get(band, ()):
+                if candidate not in similar and self._similar(key, candidate):
+                    similar.add(candidate)
+        similar.discard(definition)
+        return sorted(similar)
+
+    def find_duplicates(self):
+        """
+        Returns groups of similar definitions, e.g. after an import.
+        """
+        groups, grouped = [], set()
+        for definition in sorted(self.entries):
+            if definition in grouped:
+                continue
+            similar = self.find_similar(definition)
+            if similar:
+                group = [definition, *similar]
+                grouped.update(group)
+                groups.append(group)
+        return groups
+
+    def _similar(self, key, candidate):
+        return (
+            similarity(key, self.entries[candidate][0])
+            >= settings.NEAR_DUPLICATE_SIMILARITY
+        )
+
+    def _insert(self, definition, entry):
+        key, *definition_bands = entry
+        self.entries[definition] = entry
+        self.keys.setdefault(key, set()).add(definition)
+        for band in enumerate(definition_bands):
+            self.buckets.setdefault(band, set()).add(definition)
@@ -0,0 +1,210 @@
+"""
+Changes of words in the word editor, pushed to all devices of the user.
+
+Every change of the draft gets the next version of the user and the
+dictionary, so a device applies diffs instead of fetching all words again:
+
+    {"v": 7, "op": "add", "d": "wojna", "w": "war"}
+    {"v": 8, "op": "remove", "d": "wojna"}
+    {"v": 9, "op": "clear"}
+    {"v": 10, "op": "reset"}   # changes were discarded, fetch words again
+    {"v": 11, "op": "save"}    # changes were saved to the dictionary
+
+Events are kept in the cache for `settings.WORD_EVENTS_TIMEOUT` seconds,
+a device, which missed some of them, gets "reset". They are streamed as
+server-sent events by `EventStream`, which is served by `modi.asgi`.
+"""
+import asyncio
+import json
+from importlib import import_module
+from typing import List, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.http import HttpRequest
+from django.http.cookie import parse_cookie
+
+from accounts.api.tokens import AccessToken, TokenError
+from .models import Dictionary
+
+
+class WordEvents:
+    def __init__(self, user_id, dictionary_id):
+        self.cache = caches[settings.WORD_EVENTS_CACHE]
+        self.key = f"dictionary:events:{user_id}:{dictionary_id}"
+
+    def get_version(self) -> int:
+        return self.cache.get(self.key, 0)
+
+    def publish(self, op: str, definition=None, word=None) -> int:
+        """
+        Stores the event and returns its version.
+        """
+        # versions are never reused, a device could miss a "reset" otherwise
+        self.cache.add(self.key, 0, timeout=None)
+        version = self.cache.incr(self.key)
+        event = {"v": version, "op": op}
+        if definition is not None:
+            event["d"] = definition
+        if word is not None:
+            event["w"] = word
+        self.cache.set(f"{self.key}:{version}", event, settings.WORD_EVENTS_TIMEOUT)
+        return version
+
+    def get_events(self, since: int) -> Optional[List[dict]]:
+        """
+        Returns events newer than `since` version, or None, if some
+        of them are lost, then all words have to be fetched again.
+        """
+        version = self.get_version()
+        if since == version:
+            return []
+        if since > version or version - since > settings.WORD_EVENTS_MAX_BACKLOG:
+            return None
+        keys = [f"{self.key}:{v}" for v in range(since + 1, version + 1)]
+        events = self.cache.get_many(keys)
+        if len(events) != len(keys):
+            return None
+        return [events[key] for key in keys]
+
+
+def run_in_thread(function):
+    # polls of all streams would wait for the one thread of sync views
+    # otherwise, `authorize` closes its own database connections
+    return sync_to_async(function, thread_sensitive=False)
+
+
+class EventStream:
+    """
+    ASGI application streaming `WordEvents` of the user as server-sent
+    events, `EventSource` resumes from its `Last-Event-ID` header,
+    other clients may pass `?since=<version>`.
+
+    The cache is polled every `settings.WORD_EVENTS_POLL_INTERVAL` seconds,
+    it's a single `GET` if nothing has changed. The stream is closed after
+    `settings.WORD_EVENTS_STREAM_TIMEOUT` seconds and reopened by the client,
+    so a worker is never held by a forgotten tab.
+    """
+
+    def __init__(self, dictionary_id):
+        self.dictionary_id = dictionary_id
+
+    async def __call__(self, scope, receive, send):
+        headers = {
+            name.decode("latin1"): value.decode("latin1")
+            for name, value in scope["headers"]
+        }
+        user_id = await run_in_thread(self.authorize)(headers)
+        if user_id is None:
+            await self.send_status(send, 404)
+            return
+
+        events = WordEvents(user_id, self.dictionary_id)
+        since = self.get_since(headers, scope["query_string"].decode("latin1"))
+        if since is None:
+            since = await run_in_thread(events.get_version)()
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    # nginx would buffer the stream otherwise
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        await self.send_text(send, f"retry: {settings.WORD_EVENTS_RETRY}\n\n")
+
+        loop = asyncio.get_running_loop()
+        closing = loop.time() + settings.WORD_EVENTS_STREAM_TIMEOUT
+        keepalive = loop.time() + settings.WORD_EVENTS_KEEPALIVE
+        while loop.time() < closing:
+            new_events = await run_in_thread(events.get_events)(since)
+            if new_events is None:
+                since = await run_in_thread(events.get_version)()
+                new_events = [{"v": since, "op": "reset"}]
+            if new_events:
+                since = new_events[-1]["v"]
+                await self.send_text(send, "".join(map(self.format, new_events)))
+                keepalive = loop.time() + settings.WORD_EVENTS_KEEPALIVE
+            elif loop.time() >= keepalive:
+                # proxies close idle connections
+                await self.send_text(send, ":\n\n")
+                keepalive = loop.time() + settings.WORD_EVENTS_KEEPALIVE
+
+            try:
+                message = await asyncio.wait_for(
+                    receive(), settings.WORD_EVENTS_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                continue
+            if message["type"] == "http.disconnect":
+                return
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    def format(event):
+        data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {event['v']}\nevent: {event['op']}\ndata: {data}\n\n"
+
+    @staticmethod
+    def get_since(headers, query_string):
+        since = headers.get("last-event-id")
+        if since is None:
+            since = dict(
+                param.partition("=")[::2] for param in query_string.split("&")
+            ).get("since")
+        try:
+            return max(int(since), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def authorize(self, headers):
+        """
+        Returns id of the user authenticated by a bearer token or by
+        the session, if the user owns the dictionary.
+        """
+        close_old_connections()
+        try:
+            user = self.get_user(headers)
+            if user is None or not user.is_authenticated:
+                return None
+            if not Dictionary.objects.filter(
+                id=self.dictionary_id, subject__owner=user
+            ).exists():
+                return None
+            return user.pk
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def get_user(headers):
+        authorization = headers.get("authorization", "").split()
+        if authorization and authorization[0] == "Bearer":
+            try:
+                return AccessToken.from_string(authorization[-1]).get_user()
+            except TokenError:
+                return None
+
+        cookies = parse_cookie(headers.get("cookie", ""))
+        engine = import_module(settings.SESSION_ENGINE)
+        request = HttpRequest()
+        request.session = engine.SessionStore(cookies.get(settings.SESSION_COOKIE_NAME))
+        return get_user(request)
+
+    @staticmethod
+    async def send_status(send, status):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def send_text(send, text):
+        await send(
+            {"type": "http.response.body", "body": text.encode(), "more_body": True}
+        )
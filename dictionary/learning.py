@@ -0,0 +1,120 @@
+import random
+from array import array
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .answers import ACCEPTED, check_answer
+
+
+class LearningSession:
+    """
+    Learning progress of the user in a dictionary, kept in the cache,
+    so it survives a page reload and can be resumed on another device.
+
+    The deck is a permutation of indexes of sorted definitions, stored
+    as an array of integers. The current card is the last one, so drawing
+    and removing a card is O(1). A wrongly answered card is swapped with
+    a random remaining card, so it returns later, but never immediately.
+    Progress is reset when the words of the dictionary change.
+    """
+
+    def __init__(self, user, dictionary):
+        self.cache = caches[settings.LEARNING_SESSION_CACHE]
+        self.key = f"dictionary:learning:{user.pk}:{dictionary.pk}"
+        self.dictionary = dictionary
+        self.words = dictionary.get_words()
+        self.keys = dictionary.get_answer_keys()
+        self.definitions = sorted(self.words)
+        self.load()
+
+    def load(self):
+        """
+        Reads progress from the cache, e.g. again after waiting for a lock.
+        """
+        state = self.cache.get(self.key)
+        if state is None or state["words_hash"] != self.dictionary.get_words_hash():
+            self.restart()
+        else:
+            self.deck = array("I")
+            self.deck.frombytes(state["deck"])
+            self.correct = state["correct"]
+            self.wrong = state["wrong"]
+
+    def restart(self):
+        indexes = list(range(len(self.definitions)))
+        random.shuffle(indexes)
+        self.deck = array("I", indexes)
+        self.correct = 0
+        self.wrong = 0
+        self.save()
+
+    @property
+    def definition(self):
+        """
+        Returns definition of the current card or None, if learning is completed.
+        """
+        if not self.deck:
+            return None
+        return self.definitions[self.deck[-1]]
+
+    def answer(self, answer, ignore_diacritics=False):
+        """
+        Checks `answer` for the current card and moves to the next one,
+        the card is removed, if the answer was accepted.
+        Returns result of `dictionary.answers.check_answer` and the correct word.
+        """
+        definition = self.definition
+        result = check_answer(answer, self.keys[definition], ignore_diacritics)
+        if result in ACCEPTED:
+            self.deck.pop()
+            self.correct += 1
+        else:
+            last = len(self.deck) - 1
+            if last > 0:
+                other = random.randrange(last)
+                self.deck[other], self.deck[last] = self.deck[last], self.deck[other]
+            self.wrong += 1
+        self.save()
+        return result, self.words[definition]
+
+    def review(self, results):
+        """
+        Applies results of answers given offline, pairs of a definition
+        and a result, cards of accepted answers are removed from the deck.
+        """
+        indexes = {
+            definition: index for index, definition in enumerate(self.definitions)
+        }
+        remaining = set(self.deck)
+        for definition, result in results:
+            index = indexes.get(definition)
+            if index not in remaining:
+                continue
+            if result in ACCEPTED:
+                remaining.remove(index)
+                self.correct += 1
+            else:
+                self.wrong += 1
+        self.deck = array("I", (index for index in self.deck if index in remaining))
+        self.save()
+
+    def save(self):
+        self.cache.set(
+            self.key,
+            {
+                "words_hash": self.dictionary.get_words_hash(),
+                "deck": self.deck.tobytes(),
+                "correct": self.correct,
+                "wrong": self.wrong,
+            },
+            settings.LEARNING_SESSION_TIMEOUT,
+        )
+
+    def get_state(self):
+        return {
+            "definition": self.definition,
+            "remaining": len(self.deck),
+            "correct": self.correct,
+            "wrong": self.wrong,
+        }
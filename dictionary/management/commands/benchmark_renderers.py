@@ -0,0 +1,60 @@
+import gzip
+import io
+
+import brotli
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from dictionary.api.parsers import MessagePackParser
+from dictionary.api.renderers import MessagePackRenderer
+from dictionary.benchmarks import measure
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares bytes on the wire and render/parse time of the API renderers "
+        "for dictionaries of a given number of words."
+    )
+
+    formats = [
+        ("json", JSONRenderer(), JSONParser()),
+        ("msgpack", MessagePackRenderer(), MessagePackParser()),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--words",
+            type=int,
+            nargs="+",
+            default=[1000, 10000],
+            help="Sizes of the dictionaries.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Number of measurements."
+        )
+
+    def handle(self, *args, words, repeat, **options):
+        for size in words:
+            data = {
+                f"przykładowa definicja słowa {i}": f"example word {i}"
+                for i in range(size)
+            }
+            self.stdout.write(f"{size} words:")
+            for name, renderer, parser in self.formats:
+                content = renderer.render(data)
+                render_ms = measure(lambda: renderer.render(data), repeat)
+                parse_ms = measure(
+                    lambda: parser.parse(io.BytesIO(content), parser.media_type),
+                    repeat,
+                )
+                gzipped = gzip.compress(content)
+                brotlied = brotli.compress(
+                    content, quality=settings.COMPRESSION_BROTLI_QUALITY
+                )
+                self.stdout.write(
+                    f"  {name}: {len(content)} B, gzip {len(gzipped)} B, "
+                    f"brotli {len(brotlied)} B, render {render_ms:.2f} ms, "
+                    f"parse {parse_ms:.2f} ms"
+                )
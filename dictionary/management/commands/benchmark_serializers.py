@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from accounts.models import User
+from dictionary.api.serializers import DictionarySerializer
+from dictionary.benchmarks import measure
+from dictionary.models import Subject, Dictionary
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares list serialization of dictionaries by `DictionarySerializer` "
+        "and by its `values()` fast path. Objects are created in a transaction, "
+        "which is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--objects", type=int, default=1000, help="Number of dictionaries."
+        )
+        parser.add_argument(
+            "--words", type=int, default=100, help="Number of words per dictionary."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=10, help="Number of measurements."
+        )
+
+    def handle(self, *args, objects, words, repeat, **options):
+        request = RequestFactory().get("/", HTTP_HOST="localhost")
+
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username="benchmark-user", email="benchmark@email.com"
+            )
+            subject = Subject.objects.create(title="Benchmark", owner=user)
+            Dictionary.objects.bulk_create(
+                Dictionary(
+                    subject=subject,
+                    title=f"Dictionary {i}",
+                    slug=f"dictionary-{i}",
+                    words={f"definicja {j}": f"word {j}" for j in range(words)},
+                )
+                for i in range(objects)
+            )
+            queryset = subject.dicts.all()
+
+            serializer_ms = measure(
+                lambda: DictionarySerializer(
+                    queryset.all(), many=True, context={"request": request}
+                ).data,
+                repeat,
+            )
+            values_ms = measure(
+                lambda: DictionarySerializer.represent_values(queryset, request),
+                repeat,
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{objects} dictionaries: serializer {serializer_ms:.2f} ms, "
+            f"values() {values_ms:.2f} ms, {serializer_ms / values_ms:.1f}x faster"
+        )
@@ -0,0 +1,63 @@
+import random
+import string
+
+from django.contrib.sessions.backends.db import SessionStore as DefaultSessionStore
+from django.contrib.sessions.serializers import JSONSerializer
+from django.core.management.base import BaseCommand
+
+from dictionary.benchmarks import measure
+from modi.sessions import SessionStore
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares stored bytes and encode/decode time of sessions with a map "
+        "of a given number of words, saved by Django's default session engine "
+        "and by `modi.sessions`."
+    )
+
+    engines = [
+        ("default json", DefaultSessionStore, JSONSerializer),
+        ("modi msgpack", SessionStore, None),
+    ]
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--words",
+            type=int,
+            nargs="+",
+            default=[10, 100, 1000, 10000],
+            help="Sizes of the dictionaries.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Number of measurements."
+        )
+
+    def handle(self, *args, words, repeat, **options):
+        for size in words:
+            session = {
+                "_auth_user_id": "1",
+                "dictionary_1": {
+                    random_text(4, 30, "aąbcćdeęfghijklłmnńoóprsśtuwyzźż "): (
+                        random_text(3, 20, string.ascii_lowercase + " ")
+                    )
+                    for i in range(size)
+                },
+            }
+            self.stdout.write(f"{size} words:")
+            for name, store_class, serializer in self.engines:
+                store = store_class()
+                if serializer:
+                    store.serializer = serializer
+                encoded = store.encode(session)
+                encode_ms = measure(lambda: store.encode(session), repeat)
+                decode_ms = measure(lambda: store.decode(encoded), repeat)
+                self.stdout.write(
+                    f"  {name}: {len(encoded)} B, encode {encode_ms:.2f} ms, "
+                    f"decode {decode_ms:.2f} ms"
+                )
+
+
+def random_text(min_length, max_length, alphabet):
+    length = random.randint(min_length, max_length)
+    return "".join(random.choices(alphabet, k=length))
@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.text import slugify
+from unidecode import unidecode
+
+from accounts.models import User
+from dictionary.models import Subject
+from dictionary.slugs import slugify_title
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures creation of subjects with colliding titles and memoized "
+        "transliteration of titles. Subjects are created in a transaction, "
+        "which is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subjects", type=int, default=1000, help="Number of subjects."
+        )
+        parser.add_argument(
+            "--titles", type=int, default=20, help="Number of distinct titles."
+        )
+
+    def handle(self, *args, subjects, titles, **options):
+        names = [f"Język łaciński {i}" for i in range(titles)]
+
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username="benchmark-user", email="benchmark@email.com"
+            )
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                for i in range(subjects):
+                    Subject.objects.create(title=names[i % titles], owner=user)
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{subjects} subjects: {elapsed * 1000:.2f} ms, "
+            f"{len(context.captured_queries) / subjects:.1f} queries per subject"
+        )
+
+        start = time.perf_counter()
+        for i in range(subjects):
+            slugify(unidecode(names[i % titles]))
+        plain = time.perf_counter() - start
+
+        slugify_title.cache_clear()
+        start = time.perf_counter()
+        for i in range(subjects):
+            slugify_title(names[i % titles])
+        memoized = time.perf_counter() - start
+
+        self.stdout.write(
+            f"transliteration: {plain * 1000:.2f} ms, "
+            f"memoized {memoized * 1000:.2f} ms"
+        )
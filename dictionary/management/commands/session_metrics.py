@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from modi.sessions import session_store_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints number of sessions, expired ones waiting for "
+        "`dictionary.tasks.purge_sessions` and size of session data."
+    )
+
+    def handle(self, *args, **options):
+        metrics = session_store_metrics()
+        if not metrics:
+            self.stdout.write("Sessions aren't stored in the database.")
+            return
+
+        average = metrics["total_bytes"] / (metrics["sessions"] or 1)
+        self.stdout.write(
+            f"sessions: {metrics['sessions']}, "
+            f"expired: {metrics['expired_sessions']}\n"
+            f"data: {metrics['total_bytes']} B, "
+            f"average {average:.0f} B, max {metrics['max_bytes']} B"
+        )
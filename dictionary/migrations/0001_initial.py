@@ -0,0 +1,95 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Subject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=30, verbose_name="tytuł")),
+                ("slug", models.SlugField()),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="subjects",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="właściciel",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "temat",
+                "verbose_name_plural": "tematy",
+                "ordering": ["slug"],
+            },
+        ),
+        migrations.CreateModel(
+            name="Dictionary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=30, verbose_name="nazwa")),
+                ("slug", models.SlugField()),
+                (
+                    "description",
+                    models.CharField(
+                        blank=True, max_length=150, null=True, verbose_name="opis"
+                    ),
+                ),
+                ("words", models.JSONField(default=dict, verbose_name="słowa")),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dicts",
+                        to="dictionary.subject",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "słownik",
+                "verbose_name_plural": "słowniki",
+                "ordering": ["slug"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="subject",
+            constraint=models.UniqueConstraint(
+                fields=("slug", "owner"), name="unique_subject_for_user"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dictionary",
+            constraint=models.UniqueConstraint(
+                fields=("slug", "subject"), name="unique_dictionary_for_subject"
+            ),
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:37
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dictionary", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WordSet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("words", models.JSONField(default=dict, verbose_name="słowa")),
+                (
+                    "words_hash",
+                    models.CharField(editable=False, max_length=32, unique=True),
+                ),
+                ("answer_keys", models.JSONField(default=dict, editable=False)),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="utworzono"),
+                ),
+            ],
+            options={
+                "verbose_name": "zestaw słów",
+                "verbose_name_plural": "zestawy słów",
+            },
+        ),
+        migrations.RemoveConstraint(
+            model_name="dictionary",
+            name="unique_dictionary_for_subject",
+        ),
+        migrations.RemoveConstraint(
+            model_name="subject",
+            name="unique_subject_for_user",
+        ),
+        migrations.AddField(
+            model_name="dictionary",
+            name="answer_keys",
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="dictionary",
+            name="words_hash",
+            field=models.CharField(default="", editable=False, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name="dictionary",
+            name="subject",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="dicts",
+                to="dictionary.subject",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="subject",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="subjects",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="właściciel",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dictionary",
+            constraint=models.UniqueConstraint(
+                fields=("subject", "slug"), name="unique_dictionary_for_subject"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="subject",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "slug"), name="unique_subject_for_user"
+            ),
+        ),
+        migrations.AddField(
+            model_name="dictionary",
+            name="word_set",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="dictionaries",
+                to="dictionary.wordset",
+                verbose_name="wspólne słowa",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+INDEX_NAME = "dictionary_words_gin"
+
+
+def create_words_gin_index(apps, schema_editor):
+    """
+    GIN index serves containment lookups of words, e.g.
+    `Dictionary.objects.filter(words__contains={"wojna": "war"})`.
+    It exists only on PostgreSQL, so it isn't declared in `Meta.indexes`.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        "ON dictionary_dictionary USING gin (words jsonb_path_ops)"
+    )
+
+
+def drop_words_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0002_word_sets"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_words_gin_index, drop_words_gin_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0003_dictionary_words_gin_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionary",
+            name="deleted",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="usunięto"
+            ),
+        ),
+        migrations.AddField(
+            model_name="subject",
+            name="deleted",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="usunięto"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dictionary",
+            index=models.Index(
+                condition=models.Q(("deleted__isnull", False)),
+                fields=["deleted"],
+                name="dictionary_deleted",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subject",
+            index=models.Index(
+                condition=models.Q(("deleted__isnull", False)),
+                fields=["deleted"],
+                name="subject_deleted",
+            ),
+        ),
+    ]
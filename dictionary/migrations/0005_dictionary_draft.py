@@ -0,0 +1,102 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dictionary", "0004_deleted"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DictionaryDraft",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "cleared",
+                    models.BooleanField(default=False, verbose_name="wyczyszczony"),
+                ),
+                (
+                    "updated",
+                    models.DateTimeField(auto_now=True, verbose_name="zmieniono"),
+                ),
+                (
+                    "dictionary",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="drafts",
+                        to="dictionary.dictionary",
+                        verbose_name="słownik",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="drafts",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="użytkownik",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "szkic słownika",
+                "verbose_name_plural": "szkice słowników",
+            },
+        ),
+        migrations.CreateModel(
+            name="DraftChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("definition", models.TextField(verbose_name="definicja")),
+                ("word", models.TextField(null=True, verbose_name="słowo")),
+                (
+                    "draft",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="changes",
+                        to="dictionary.dictionarydraft",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "zmiana szkicu",
+                "verbose_name_plural": "zmiany szkiców",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="draftchange",
+            constraint=models.UniqueConstraint(
+                fields=("draft", "definition"), name="unique_change_for_draft"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dictionarydraft",
+            constraint=models.UniqueConstraint(
+                fields=("user", "dictionary"), name="unique_draft_for_user"
+            ),
+        ),
+    ]
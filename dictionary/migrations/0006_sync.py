@@ -0,0 +1,111 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dictionary", "0005_dictionary_draft"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dictionary",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="WordChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("definition", models.TextField(verbose_name="definicja")),
+                ("word", models.TextField(null=True, verbose_name="słowo")),
+                ("version", models.PositiveIntegerField(verbose_name="wersja")),
+                (
+                    "dictionary",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="changes",
+                        to="dictionary.dictionary",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "zmiana słów",
+                "verbose_name_plural": "zmiany słów",
+            },
+        ),
+        migrations.CreateModel(
+            name="Review",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.UUIDField(verbose_name="klucz")),
+                ("definition", models.TextField(verbose_name="definicja")),
+                ("result", models.CharField(max_length=10, verbose_name="wynik")),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="przesłano"),
+                ),
+                (
+                    "dictionary",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reviews",
+                        to="dictionary.dictionary",
+                        verbose_name="słownik",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reviews",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="użytkownik",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "odpowiedź",
+                "verbose_name_plural": "odpowiedzi",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="wordchange",
+            index=models.Index(fields=["dictionary", "version"], name="change_version"),
+        ),
+        migrations.AddConstraint(
+            model_name="wordchange",
+            constraint=models.UniqueConstraint(
+                fields=("dictionary", "definition"), name="unique_change_for_dictionary"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="review",
+            constraint=models.UniqueConstraint(
+                fields=("user", "key"), name="unique_review_for_user"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.11 on 2026-10-19 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0006_sync"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="dictionarydraft",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, db_index=True, verbose_name="zmieniono"
+            ),
+        ),
+    ]
@@ -1,57 +1,417 @@
-from django.db import models
+import hashlib
+import json
+
+from django.core import signing
+from django.db import models, transaction
+from django.db.models import Q
 from django.db.models.deletion import CASCADE
 from django.urls import reverse
+from django.utils import timezone
 from django.conf import settings
 
+from .answers import answer_keys
+
+
+SHARE_TOKEN_SALT = "dictionary.share"
+
+
+class NotDeletedManager(models.Manager):
+    """
+    Hides objects marked as deleted, they wait for
+    `dictionary.tasks.purge_deleted`. Slugs are allocated by the base
+    manager, so they don't collide with slugs of hidden objects.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted__isnull=True)
+
 
 class Subject(models.Model):
     title = models.CharField(max_length=30, verbose_name="tytuł")
     slug = models.SlugField()
+    # indexed by `unique_subject_for_user`, which starts with the owner
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=CASCADE,
         related_name="subjects",
         verbose_name="właściciel",
+        db_index=False,
+    )
+    deleted = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="usunięto"
     )
 
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
+
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
         return reverse("dictionary:dict_list", args=[self.slug])
 
+    def mark_deleted(self):
+        """
+        Hides the subject and its dictionaries with two updates,
+        the rows are deleted later by `dictionary.tasks.purge_deleted`.
+        """
+        self.deleted = timezone.now()
+        with transaction.atomic():
+            self.dicts.update(deleted=self.deleted)
+            self.save(update_fields=["deleted"])
+
     class Meta:
         ordering = ["slug"]
         verbose_name = "temat"
         verbose_name_plural = "tematy"
         constraints = [
             models.UniqueConstraint(
-                name="unique_subject_for_user", fields=["slug", "owner"]
+                name="unique_subject_for_user", fields=["owner", "slug"]
+            )
+        ]
+        indexes = [
+            models.Index(
+                name="subject_deleted",
+                fields=["deleted"],
+                condition=Q(deleted__isnull=False),
             )
         ]
 
 
+class WordSet(models.Model):
+    """
+    Immutable words shared by many dictionaries, e.g. clones of dictionary
+    of a teacher. Word sets are identified by hash of their words, so equal
+    words are stored once.
+    """
+
+    words = models.JSONField(verbose_name="słowa", default=dict)
+    words_hash = models.CharField(max_length=32, unique=True, editable=False)
+    answer_keys = models.JSONField(default=dict, editable=False)
+    created = models.DateTimeField(auto_now_add=True, verbose_name="utworzono")
+
+    def __str__(self):
+        return self.words_hash
+
+    @classmethod
+    def for_words(cls, words):
+        word_set, created = cls.objects.get_or_create(
+            words_hash=words_digest(words),
+            defaults={"words": words, "answer_keys": answer_keys(words)},
+        )
+        return word_set
+
+    class Meta:
+        verbose_name = "zestaw słów"
+        verbose_name_plural = "zestawy słów"
+
+
 class Dictionary(models.Model):
-    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name="dicts")
+    # indexed by `unique_dictionary_for_subject`, which starts with the subject
+    subject = models.ForeignKey(
+        Subject, on_delete=models.CASCADE, related_name="dicts", db_index=False
+    )
     title = models.CharField(max_length=30, verbose_name="nazwa")
     slug = models.SlugField()
     description = models.CharField(
         max_length=150, verbose_name="opis", null=True, blank=True
     )
     words = models.JSONField(verbose_name="słowa", default=dict)
+    words_hash = models.CharField(max_length=32, editable=False, default="")
+    answer_keys = models.JSONField(default=dict, editable=False)
+    # raised by every save of changed words, see `WordChange` and
+    # `dictionary.signals.raise_words_version`
+    version = models.PositiveIntegerField(default=0, editable=False)
+    word_set = models.ForeignKey(
+        WordSet,
+        on_delete=models.PROTECT,
+        related_name="dictionaries",
+        null=True,
+        blank=True,
+        verbose_name="wspólne słowa",
+    )
+    deleted = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="usunięto"
+    )
+
+    objects = NotDeletedManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.title
 
+    def get_words(self):
+        """
+        Returns words of the dictionary, which are shared by `word_set`
+        or, when they were edited after cloning, own `words`.
+        """
+        if self.word_set_id:
+            return self.word_set.words
+        return self.words
+
+    def get_answer_keys(self):
+        """
+        Returns normalized forms of words, see `dictionary.answers`.
+        """
+        if self.word_set_id:
+            return self.word_set.answer_keys
+        # dictionaries saved before `answer_keys` was added don't have them
+        if self.words and not self.answer_keys:
+            return answer_keys(self.words)
+        return self.answer_keys
+
+    def share_words(self):
+        """
+        Moves own words to a `WordSet`, which can be referenced by clones.
+        """
+        if self.word_set_id is None:
+            self.word_set = WordSet.for_words(self.words)
+            self.words = {}
+            self.words_hash = self.word_set.words_hash
+            self.answer_keys = {}
+            self.save(update_fields=["word_set", "words", "words_hash", "answer_keys"])
+
+    def get_share_token(self):
+        """
+        Returns signed token, which lets other users clone the dictionary.
+        """
+        return signing.dumps(self.id, salt=SHARE_TOKEN_SALT)
+
+    @classmethod
+    def from_share_token(cls, token):
+        """
+        Returns dictionary shared by `token`, raises `signing.BadSignature`
+        if it's invalid or expired and `DoesNotExist` if it was deleted.
+        """
+        dictionary_id = signing.loads(
+            token,
+            salt=SHARE_TOKEN_SALT,
+            max_age=settings.DICTIONARY_SHARE_TOKEN_MAX_AGE,
+        )
+        return cls.objects.get(id=dictionary_id)
+
+    def clone(self, subject, title=None):
+        """
+        Returns copy of the dictionary in `subject`, its words aren't copied,
+        both dictionaries reference the same `WordSet` until one of them is
+        edited by `dictionary.words.Words`.
+        """
+        self.share_words()
+        return Dictionary.objects.create(
+            subject=subject,
+            title=title or self.title,
+            description=self.description,
+            word_set=self.word_set,
+            words_hash=self.word_set.words_hash,
+        )
+
     def get_absolute_url(self):
         return reverse("dictionary:dict_detail", args=[self.subject.slug, self.slug])
 
+    def get_deck_url(self):
+        """
+        Returns immutable URL of learning deck, it changes with the words.
+        """
+        return reverse("dictionary:deck", args=[self.id, self.get_words_hash()])
+
+    def get_changes(self, since):
+        """
+        Returns words changed after `since` version, removed ones are `None`.
+        """
+        return dict(
+            self.changes.filter(version__gt=since).values_list("definition", "word")
+        )
+
+    def get_words_hash(self):
+        # dictionaries saved before `words_hash` was added don't have it
+        return self.words_hash or words_digest(self.get_words())
+
+    def mark_deleted(self):
+        """
+        Hides the dictionary, the row is deleted later
+        by `dictionary.tasks.purge_deleted`.
+        """
+        self.deleted = timezone.now()
+        self.save(update_fields=["deleted"])
+
     class Meta:
         ordering = ["slug"]
         verbose_name = "słownik"
         verbose_name_plural = "słowniki"
         constraints = [
             models.UniqueConstraint(
-                name="unique_dictionary_for_subject", fields=["slug", "subject"]
+                name="unique_dictionary_for_subject", fields=["subject", "slug"]
             )
         ]
+        indexes = [
+            models.Index(
+                name="dictionary_deleted",
+                fields=["deleted"],
+                condition=Q(deleted__isnull=False),
+            )
+        ]
+
+
+class DictionaryDraft(models.Model):
+    """
+    Unsaved changes of words of a dictionary made by a user in the word
+    editor, see `dictionary.words.Words`. Every change is a row of
+    `DraftChange`, so an edit writes one row instead of all the words.
+    """
+
+    # indexed by `unique_draft_for_user`, which starts with the user
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="drafts",
+        verbose_name="użytkownik",
+        db_index=False,
+    )
+    dictionary = models.ForeignKey(
+        Dictionary, on_delete=CASCADE, related_name="drafts", verbose_name="słownik"
+    )
+    # words of the dictionary were removed, only changes are left
+    cleared = models.BooleanField(default=False, verbose_name="wyczyszczony")
+    # abandoned drafts are found by `dictionary.tasks.purge_drafts`
+    updated = models.DateTimeField(
+        auto_now=True, db_index=True, verbose_name="zmieniono"
+    )
+
+    def __str__(self):
+        return f"{self.user}: {self.dictionary}"
+
+    def apply(self, words):
+        """
+        Returns copy of `words` with changes of the draft.
+        """
+        words = {} if self.cleared else words.copy()
+        for definition, word in self.changes.values_list("definition", "word"):
+            if word is None:
+                words.pop(definition, None)
+            else:
+                words[definition] = word
+        return words
+
+    class Meta:
+        verbose_name = "szkic słownika"
+        verbose_name_plural = "szkice słowników"
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_draft_for_user", fields=["user", "dictionary"]
+            )
+        ]
+
+
+class DraftChange(models.Model):
+    # indexed by `unique_change_for_draft`, which starts with the draft
+    draft = models.ForeignKey(
+        DictionaryDraft, on_delete=CASCADE, related_name="changes", db_index=False
+    )
+    definition = models.TextField(verbose_name="definicja")
+    # `None` removes the definition
+    word = models.TextField(null=True, verbose_name="słowo")
+
+    class Meta:
+        verbose_name = "zmiana szkicu"
+        verbose_name_plural = "zmiany szkiców"
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_change_for_draft", fields=["draft", "definition"]
+            )
+        ]
+
+
+class WordChange(models.Model):
+    """
+    The last change of a definition of a dictionary, so clients of
+    `dictionary.sync` fetch only words changed after the version they have.
+    Removed definitions are kept with `None`, then clients remove them as well.
+    """
+
+    # indexed by `unique_change_for_dictionary`, which starts with the dictionary
+    dictionary = models.ForeignKey(
+        Dictionary, on_delete=CASCADE, related_name="changes", db_index=False
+    )
+    definition = models.TextField(verbose_name="definicja")
+    word = models.TextField(null=True, verbose_name="słowo")
+    version = models.PositiveIntegerField(verbose_name="wersja")
+
+    @classmethod
+    def record(cls, dictionary, old_words, new_words):
+        """
+        Stores changes between `old_words` and `new_words` with the current
+        version of `dictionary`.
+        """
+        changes = {
+            definition: word
+            for definition, word in new_words.items()
+            if old_words.get(definition) != word
+        }
+        changes.update(
+            (definition, None) for definition in old_words.keys() - new_words.keys()
+        )
+        if not changes:
+            return
+        with transaction.atomic():
+            cls.objects.filter(dictionary=dictionary, definition__in=changes).delete()
+            cls.objects.bulk_create(
+                cls(
+                    dictionary=dictionary,
+                    definition=definition,
+                    word=word,
+                    version=dictionary.version,
+                )
+                for definition, word in changes.items()
+            )
+
+    class Meta:
+        verbose_name = "zmiana słów"
+        verbose_name_plural = "zmiany słów"
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_change_for_dictionary", fields=["dictionary", "definition"]
+            )
+        ]
+        indexes = [
+            models.Index(name="change_version", fields=["dictionary", "version"])
+        ]
+
+
+class Review(models.Model):
+    """
+    Answer given offline and uploaded by `dictionary.sync`. Clients send
+    `key` of every review, so a retried upload isn't counted twice.
+    """
+
+    # indexed by `unique_review_for_user`, which starts with the user
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=CASCADE,
+        related_name="reviews",
+        verbose_name="użytkownik",
+        db_index=False,
+    )
+    dictionary = models.ForeignKey(
+        Dictionary, on_delete=CASCADE, related_name="reviews", verbose_name="słownik"
+    )
+    key = models.UUIDField(verbose_name="klucz")
+    definition = models.TextField(verbose_name="definicja")
+    result = models.CharField(max_length=10, verbose_name="wynik")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="przesłano")
+
+    class Meta:
+        verbose_name = "odpowiedź"
+        verbose_name_plural = "odpowiedzi"
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_review_for_user", fields=["user", "key"]
+            )
+        ]
+
+
+def words_digest(words):
+    """
+    Returns hash of `words`, which doesn't depend on order of items.
+    """
+    content = json.dumps(words, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
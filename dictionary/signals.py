@@ -1,13 +1,72 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
-from django.utils.text import slugify
-from unidecode import unidecode
 
-from .models import Subject, Dictionary
+from .answers import answer_keys
+from .models import Subject, Dictionary, WordChange, words_digest
+from .slugs import allocate_slug
+
+
+# slugs are unique within these fields, see constraints of the models
+SLUG_SCOPES = {Subject: "owner_id", Dictionary: "subject_id"}
 
 
 @receiver(pre_save, sender=Subject)
 @receiver(pre_save, sender=Dictionary)
 def populate_slug(sender, instance, update_fields, **kwargs):
     if not update_fields or "title" in update_fields:
-        instance.slug = slugify(unidecode(instance.title))
+        scope = SLUG_SCOPES[sender]
+        instance.slug = allocate_slug(instance, **{scope: getattr(instance, scope)})
+
+
+@receiver(pre_save, sender=Dictionary)
+def populate_words_hash(sender, instance, update_fields, **kwargs):
+    # hash of shared words is copied from `WordSet`, when it's assigned
+    if instance.word_set_id is None and (not update_fields or "words" in update_fields):
+        instance.words_hash = words_digest(instance.words)
+
+
+@receiver(pre_save, sender=Dictionary)
+def populate_answer_keys(sender, instance, update_fields, **kwargs):
+    if not update_fields or "words" in update_fields:
+        instance.answer_keys = answer_keys(instance.words)
+
+
+@receiver(pre_save, sender=Dictionary)
+def raise_words_version(sender, instance, update_fields, raw=False, **kwargs):
+    """
+    Raises version of changed words, whichever way they're saved, so clients
+    of `dictionary.sync` never keep a stale deck. Old words are fetched only
+    when the hash has changed.
+    """
+    instance._old_words = None
+    if raw or instance.pk is None:
+        return
+    if update_fields and not {"words", "word_set"} & set(update_fields):
+        return
+    old = (
+        Dictionary.all_objects.filter(pk=instance.pk)
+        .values_list("words_hash", "version")
+        .first()
+    )
+    if old is None or old[0] == instance.get_words_hash():
+        return
+    old_words, old_shared_words = (
+        Dictionary.all_objects.filter(pk=instance.pk)
+        .values_list("words", "word_set__words")
+        .get()
+    )
+    old_words = old_shared_words if old_shared_words is not None else old_words
+    if old_words != instance.get_words():
+        instance._old_words = old_words
+        instance.version = old[1] + 1
+
+
+@receiver(post_save, sender=Dictionary)
+def record_word_changes(sender, instance, update_fields, **kwargs):
+    if getattr(instance, "_old_words", None) is None:
+        return
+    # `update_fields` can't be extended by `pre_save`
+    if update_fields and "version" not in update_fields:
+        Dictionary.all_objects.filter(pk=instance.pk).update(version=instance.version)
+    WordChange.record(instance, instance._old_words, instance.get_words())
+    instance._old_words = None
@@ -0,0 +1,87 @@
+import re
+from functools import lru_cache
+from itertools import count
+
+from django.db.models import Q
+from django.utils.text import slugify
+from unidecode import unidecode
+
+
+# room for a suffix, e.g. "-12"
+SUFFIX_MAX_LENGTH = 6
+
+
+@lru_cache(maxsize=1024)
+def slugify_title(title):
+    """
+    Returns slug of `title` without diacritics, e.g. 'Łoś' becomes 'los'.
+    Transliteration is slow and titles repeat, so results are memoized.
+    """
+    return slugify(unidecode(title))
+
+
+def allocate_slug(instance, **scope):
+    """
+    Returns slug of `instance.title`, which is unique among objects
+    filtered by `scope`, e.g. dictionaries of the same subject.
+
+    Taken slugs are fetched with one `LIKE 'slug%'` query, if the slug
+    is taken, the first free suffix is appended, e.g. 'english-2'.
+    Current slug of `instance` is kept, if it still fits the title.
+    Titles without letters and digits, e.g. '!!!', get name of the model
+    as the slug, so URLs of objects can be reversed.
+    """
+    return allocate_slugs([instance], **scope)[0]
+
+
+def allocate_slugs(instances, **scope):
+    """
+    Returns unique slugs of `instances` of the same model and `scope`,
+    which are also unique among each other, see `allocate_slug`.
+    Taken slugs of all instances are fetched with one query.
+    """
+    model = type(instances[0])
+    max_length = model._meta.get_field("slug").max_length
+    bases = [
+        slugify_title(instance.title)[: max_length - SUFFIX_MAX_LENGTH]
+        or model._meta.model_name
+        for instance in instances
+    ]
+
+    query = Q()
+    for base in set(bases):
+        query |= Q(slug__startswith=base)
+    taken = set(
+        model._base_manager.filter(query, **scope)
+        .exclude(pk__in=[instance.pk for instance in instances if instance.pk])
+        .values_list("slug", flat=True)
+    )
+
+    # current slugs are kept first, so they aren't given to other instances
+    slugs = [
+        instance.slug if fits(instance.slug, base, taken) else None
+        for instance, base in zip(instances, bases)
+    ]
+    taken.update(slug for slug in slugs if slug)
+    for index, base in enumerate(bases):
+        if slugs[index] is None:
+            slugs[index] = free_slug(base, taken)
+            taken.add(slugs[index])
+    return slugs
+
+
+def fits(slug, base, taken):
+    return (
+        slug
+        and slug not in taken
+        and re.fullmatch(rf"{re.escape(base)}(-\d+)?", slug) is not None
+    )
+
+
+def free_slug(base, taken):
+    if base not in taken:
+        return base
+    for number in count(2):
+        slug = f"{base}-{number}"
+        if slug not in taken:
+            return slug
@@ -1,11 +1,21 @@
 $(function(){
-    const dictionary = $.parseJSON($('#words').text());
-    let definitions = Object.keys(dictionary);
-    let definition;
-    let answer;
+    // progress is kept by the server, so learning is resumed after reload,
+    // without connection answers are checked by the deck kept in the browser
+    learn(
+        $('#learning').attr('href'),
+        $('#sync').attr('href'),
+        $('#deck').attr('href'),
+        $('#learning').data('csrf-token'),
+    );
+});
+
+
+function learn(url, syncUrl, deckUrl, csrfToken){
+    let state;
+    let word;
     let isAnswerGood;
-    let number;
-    let prevNumber;
+    let isAnswerExact;
+    let offline = false;
 
     // colors for input's background depending on answer
     let initialColor = '#f8f9fa'
@@ -17,22 +27,183 @@ $(function(){
     let correctSound = new Audio(`${pathToAudio}/correct.mp3`);
     let wrongSound = new Audio(`${pathToAudio}/wrong.mp3`);
 
+    // deck and answers given offline, see `dictionary.sync`
+    let deckKey = `modi:deck:${syncUrl}`;
+    let reviewsKey = `modi:reviews:${syncUrl}`;
+    let deck = load(deckKey, {url: null, words: {}});
+    let learned = new Set();
+
     
-    initialize();
     pushEnterToPressButton();
     setSpeakerOptions();
+    refreshDeck();
+    uploadReviews().always(() => {
+        if (!offline){
+            start();
+        }else{
+            startOffline();
+        }
+    });
+
+
+    function start(){
+        request('GET').done((data) => {
+            state = data;
+            // completed learning starts again
+            if (state.definition === null){
+                request('DELETE').done((data) => {
+                    state = data;
+                    initialize();
+                }).fail(startOffline);
+                return;
+            }
+            initialize();
+        }).fail(startOffline);
+    }
+
+
+    function startOffline(){
+        offline = true;
+        drawDefinition();
+        initialize();
+    }
+
+
+    $('#sound-icon').click(()=>{utterWord(word);});
 
 
-    $('#sound-icon').click(()=>{utterWord(dictionary[definition]);});
+    function request(method, data){
+        return $.ajax({
+            url: url,
+            method: method,
+            data: data,
+            headers: {'X-CSRFToken': csrfToken},
+        });
+    }
+
+
+    function load(key, initial){
+        try{
+            return JSON.parse(localStorage.getItem(key)) || initial;
+        }catch (error){
+            return initial;
+        }
+    }
+
+
+    function store(key, value){
+        try{
+            localStorage.setItem(key, JSON.stringify(value));
+        }catch (error){
+            // storage is full or disabled, learning offline isn't possible
+        }
+    }
+
+
+    function refreshDeck(){
+        // URL of the deck changes with the words, so the response is
+        // cached by the browser and fetched only after they are edited
+        if (deck.url == deckUrl){
+            return;
+        }
+        $.getJSON(deckUrl).done((words) => {
+            deck = {url: deckUrl, words: words};
+            store(deckKey, deck);
+        });
+    }
+
+
+    function uploadReviews(){
+        let reviews = load(reviewsKey, []);
+        if (reviews.length == 0){
+            return $.Deferred().resolve().promise();
+        }
+        // keys of reviews make sending the batch again harmless
+        return $.ajax({
+            url: syncUrl,
+            method: 'POST',
+            contentType: 'application/json',
+            data: JSON.stringify({reviews: reviews}),
+            headers: {'X-CSRFToken': csrfToken},
+        }).done(() => {
+            localStorage.removeItem(reviewsKey);
+            learned.clear();
+            offline = false;
+        }).fail(() => {
+            offline = true;
+        });
+    }
+
+
+    function drawDefinition(){
+        let definitions = Object.keys(deck.words).filter(
+            (definition) => !learned.has(definition)
+        );
+        if (definitions.length == 0){
+            learned.clear();
+            definitions = Object.keys(deck.words);
+        }
+        state = {
+            definition: definitions[Math.floor(Math.random() * definitions.length)],
+            remaining: definitions.length,
+        };
+    }
+
+
+    function checkAnswerOffline(answer){
+        let reviews = load(reviewsKey, []);
+        let good = state.definition in deck.words
+            && answer.toLowerCase() == deck.words[state.definition].toLowerCase();
+
+        reviews.push({key: newKey(), definition: state.definition, answer: answer});
+        store(reviewsKey, reviews);
+        if (good){
+            learned.add(state.definition);
+        }
+        return {
+            result: good ? 'correct' : 'wrong',
+            correct: good,
+            word: deck.words[state.definition],
+            remaining: state.remaining - (good ? 1 : 0),
+        };
+    }
+
+
+    function newKey(){
+        if (window.crypto && crypto.randomUUID){
+            return crypto.randomUUID();
+        }
+        return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, (c) => {
+            let r = Math.random() * 16 | 0;
+            return (c == 'x' ? r : (r & 0x3 | 0x8)).toString(16);
+        });
+    }
+
+
+    function next(){
+        // answers given offline are uploaded as soon as it's possible
+        if (offline && navigator.onLine){
+            uploadReviews().always(() => {
+                if (!offline){
+                    start();
+                }else{
+                    drawDefinition();
+                    initialize();
+                }
+            });
+            return;
+        }
+        if (offline){
+            drawDefinition();
+        }
+        initialize();
+    }
 
 
     function initialize(){
-        number = randNumber(definitions.length);
-        prevNumber = number;
-        definition = randomDefinition(number);
-        
-        toggleGoodAnswer(isAnswerGood);
-        putDefinitionAndGoodAnswerInHtml(definition);
+        $('#counter').text(state.remaining);
+        toggleGoodAnswer(isAnswerExact);
+        putDefinitionInHtml(state.definition);
         resetInput();
         changeButtonValue();
         focusOnInput()
@@ -43,47 +214,52 @@ $(function(){
     
 
     function checkAnswer(){
-        answer = getAnswer();
-        isAnswerGood = compareAnswer(definition, answer);
+        let answer = getAnswer();
+
+        if (offline){
+            showResult(checkAnswerOffline(answer));
+            return;
+        }
+        request('POST', {answer: answer}).done(showResult).fail(() => {
+            offline = true;
+            showResult(checkAnswerOffline(answer));
+        });
+    }
+
+
+    function showResult(data){
+        state = data;
+        word = data.word;
+        isAnswerGood = data.correct;
+        // answers with typos are accepted, but the word is shown
+        isAnswerExact = data.result == 'correct';
 
+        putGoodAnswerInHtml(word);
         changeInputColorAndProp(isAnswerGood);
         changeButtonValue();
-        removeWord(isAnswerGood);
-        toggleGoodAnswer(isAnswerGood);
-        
+        $('#counter').text(state.remaining);
+        toggleGoodAnswer(isAnswerExact);
+
         playAudio(isAnswerGood);
-        setTimeout(utterWord, 300, dictionary[definition]);
+        setTimeout(utterWord, 300, word);
 
-        if (definitions.length == 0){
+        if (state.remaining == 0 && !offline){
             completeLearning();
             return;
         }
         // binding handler with event once
-        $('#button').one('click', initialize);
-    }    
-    
-    
-    function randNumber(max){
-        let randInt = Math.floor(Math.random() * max);      
-        if (max > 1){
-            if (randInt == prevNumber){
-                return randNumber(max);
-            }
-        }
-        return randInt;
-    }
-
-    function randomDefinition(number){
-        return definitions[number];
+        $('#button').one('click', next);
     }
 
 
-    function putDefinitionAndGoodAnswerInHtml(definition){
+    function putDefinitionInHtml(definition){
         $('#definition').text(definition);
-        $('#correct-answer').text(dictionary[definition]);
     }
 
 
+    function putGoodAnswerInHtml(word){
+        $('#correct-answer').text(word);
+    }
     function getAnswer(){
         return $('#word').val().trim();
     }
@@ -98,25 +274,6 @@ $(function(){
     }
 
 
-    function compareAnswer(definition, answer){
-        if (answer == dictionary[definition]){
-            return true;
-        }
-        return false;
-    }
-
-
-    function removeWord(correct){
-        if (correct){
-            definitions.splice(number, 1);
-            // updating counter
-            let counter = $('#counter')
-            let numberOfWords = counter.text();
-            counter.text(numberOfWords - 1);
-        }
-    }
-
-
     function toggleGoodAnswer(correct){
         if (!correct){
             $('#correct-answer-box').toggle();
@@ -227,7 +384,12 @@ $(function(){
                     }
                 }
                 options.toggle();
+                speechSynthesis.onvoiceschanged = null;
+            }
+            // voices could be loaded before the deck was fetched
+            if (speechSynthesis.getVoices().length > 0){
+                speechSynthesis.onvoiceschanged();
             }
         }
     }
-});
+}
@@ -33,4 +33,29 @@ $(function(){
         let numberOfWords = $('#counter').text();
         $('#counter').text(numberOfWords - 1);
     }
+
+    // changes made on other devices, see `dictionary.events`
+    if (typeof EventSource !== 'undefined'){
+        let events = new EventSource($('#events').attr('href'));
+
+        events.addEventListener('remove', (event) => {
+            let definition = JSON.parse(event.data).d;
+            let row = $('#words .delete').filter(
+                (index, link) => link.dataset.definition == definition
+            ).closest('.row');
+
+            // a word removed on this device is already gone
+            if (row.length){
+                row.remove();
+                updateCounter();
+            }
+        });
+        // new words are rendered by the server
+        for (let op of ['add', 'clear', 'reset', 'save']){
+            events.addEventListener(op, () => {
+                events.close();
+                window.location.reload();
+            });
+        }
+    }
 });
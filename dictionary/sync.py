@@ -0,0 +1,79 @@
+"""
+Sync protocol of learning offline.
+
+A client downloads the deck once and later only words changed after
+the version it has, see `get_delta`. Answers given offline are uploaded
+in batches by `upload_reviews`, they move the learning session of the user
+on, see `dictionary.learning`.
+"""
+from django.db import transaction
+
+from accounts.models import User
+from .answers import WRONG, check_answer
+from .models import Review
+
+
+def get_delta(dictionary, since):
+    """
+    Returns words changed after `since` version, or all words, when
+    the client has none or its version is unknown.
+    """
+    if since <= 0 or since > dictionary.version:
+        return {
+            "version": dictionary.version,
+            "full": True,
+            "words": dictionary.get_words(),
+        }
+    return {
+        "version": dictionary.version,
+        "full": False,
+        "changes": dictionary.get_changes(since),
+    }
+
+
+def upload_reviews(user, session, reviews, ignore_diacritics=False):
+    """
+    Checks answers of `reviews` and applies them to the learning `session`
+    of the user. Returns results keyed by keys of the reviews, reviews
+    uploaded before aren't applied again, their stored results are returned.
+
+    Uploads of the user are serialized by a lock of the user row, so retries
+    sent at once don't both pass the check of stored keys, and the session
+    is read again after the lock is acquired.
+    """
+    with transaction.atomic():
+        User.objects.select_for_update().only("id").get(pk=user.pk)
+        session.load()
+        keys = session.keys
+        results = dict(
+            Review.objects.filter(
+                user=user, key__in=[review["key"] for review in reviews]
+            ).values_list("key", "result")
+        )
+
+        new_reviews = []
+        for review in reviews:
+            if review["key"] in results:
+                continue
+            definition = review["definition"]
+            if definition in keys:
+                result = check_answer(
+                    review["answer"], keys[definition], ignore_diacritics
+                )
+            else:
+                result = WRONG
+            results[review["key"]] = result
+            new_reviews.append(
+                Review(
+                    user=user,
+                    dictionary=session.dictionary,
+                    key=review["key"],
+                    definition=definition,
+                    result=result,
+                )
+            )
+
+        if new_reviews:
+            Review.objects.bulk_create(new_reviews, ignore_conflicts=True)
+            session.review((review.definition, review.result) for review in new_reviews)
+    return {str(key): result for key, result in results.items()}
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from accounts.celery import app
+from accounts.models import User
+from modi.sessions import get_session_model
+from .models import Dictionary, DictionaryDraft, Review, Subject, WordSet
+
+
+@app.task
+def purge_deleted():
+    """
+    Deletes dictionaries, subjects and accounts marked as deleted,
+    children first, so every cascade is a single `DELETE` query.
+    Rows are deleted in batches of `settings.DELETION_PURGE_BATCH_SIZE`,
+    only their ids are fetched, never the words.
+
+    Word sets referenced by no dictionary are deleted as well,
+    they are left behind by purged or edited clones.
+    """
+    word_sets_created_before = timezone.now() - timedelta(
+        seconds=settings.DELETION_PURGE_INTERVAL
+    )
+    querysets = [
+        Dictionary.all_objects.filter(
+            Q(deleted__isnull=False)
+            | Q(subject__deleted__isnull=False)
+            | Q(subject__owner__deleted__isnull=False)
+        ),
+        Subject.all_objects.filter(
+            Q(deleted__isnull=False) | Q(owner__deleted__isnull=False)
+        ),
+        User.objects.filter(deleted__isnull=False),
+    ]
+    deleted = sum(delete_in_batches(queryset) for queryset in querysets)
+
+    # recent word sets may be just being assigned to a clone
+    word_sets = WordSet.objects.filter(
+        dictionaries=None, created__lt=word_sets_created_before
+    )
+    return deleted + delete_in_batches(word_sets, raw=True)
+
+
+@app.task
+def purge_sessions():
+    """
+    Deletes expired sessions in batches of `settings.SESSION_PURGE_BATCH_SIZE`
+    and returns their number. Sessions kept in the cache expire by themselves,
+    so they are skipped.
+    """
+    model = get_session_model()
+    if model is None:
+        return 0
+    sessions = model.objects.filter(expire_date__lt=timezone.now())
+    return delete_in_batches(sessions, batch_size=settings.SESSION_PURGE_BATCH_SIZE)
+
+
+@app.task
+def purge_reviews():
+    """
+    Deletes reviews older than `settings.REVIEW_MAX_AGE`
+    and returns their number.
+    """
+    created_before = timezone.now() - timedelta(seconds=settings.REVIEW_MAX_AGE)
+    reviews = Review.objects.filter(created__lt=created_before)
+    return delete_in_batches(reviews, raw=True)
+
+
+@app.task
+def purge_drafts():
+    """
+    Deletes drafts of the word editor not changed for `settings.DRAFT_MAX_AGE`
+    and returns their number, their changes are deleted by the cascade.
+    """
+    updated_before = timezone.now() - timedelta(seconds=settings.DRAFT_MAX_AGE)
+    drafts = DictionaryDraft.objects.filter(updated__lt=updated_before)
+    return delete_in_batches(drafts)
+
+
+def delete_in_batches(queryset, raw=False, batch_size=None):
+    """
+    Returns number of deleted objects of `queryset`, conditions of the
+    queryset are checked again by every `DELETE`.
+
+    `raw` skips the cascade collector, which fetches whole rows referencing
+    deleted objects to check `PROTECT`, so it's safe only for querysets,
+    which exclude referenced objects.
+    """
+    batch_size = batch_size or settings.DELETION_PURGE_BATCH_SIZE
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        batch = queryset.filter(pk__in=pks)
+        if raw:
+            deleted += batch._raw_delete(batch.db)
+        else:
+            count, per_model = batch.only("id").delete()
+            deleted += per_model.get(queryset.model._meta.label, 0)
@@ -0,0 +1,141 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+
+from accounts.models import User
+from dictionary.admin import EstimatedCountPaginator
+from dictionary.models import Subject, Dictionary
+
+
+class AdminQueriesTestCase(TestCase):
+    """
+    Number of queries of the changelists mustn't depend on number of rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            email="admin@email.com", username="Admin", password="test1234"
+        )
+
+    def setUp(self):
+        self.client.login(username="Admin", password="test1234")
+
+    def create_dictionaries(self, number):
+        user = User.objects.create_user(
+            email=f"user{number}@email.com", username=f"User{number}"
+        )
+        for i in range(number):
+            subject = Subject.objects.create(title=f"Temat {i}", owner=user)
+            Dictionary.objects.create(
+                title=f"Słownik {i}", subject=subject, words={"wojna": "war"}
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_dictionary_changelist_queries_should_not_depend_on_rows(self):
+        url = reverse("admin:dictionary_dictionary_changelist")
+        self.create_dictionaries(2)
+        queries = self.count_queries(url)
+
+        self.create_dictionaries(10)
+
+        self.assertEqual(self.count_queries(url), queries)
+
+    def test_subject_changelist_queries_should_not_depend_on_rows(self):
+        url = reverse("admin:dictionary_subject_changelist")
+        self.create_dictionaries(2)
+        queries = self.count_queries(url)
+
+        self.create_dictionaries(10)
+
+        self.assertEqual(self.count_queries(url), queries)
+
+    def test_subject_changelist_should_not_count_all_rows_twice(self):
+        self.create_dictionaries(2)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("admin:dictionary_subject_changelist"))
+
+        counts = [q for q in context.captured_queries if "COUNT(*)" in q["sql"]]
+        self.assertEqual(len(counts), 1)
+
+    def test_subject_changelist_should_count_dictionaries_without_join(self):
+        self.create_dictionaries(2)
+        subject = Subject.objects.first()
+        Dictionary.objects.create(title="Inny", subject=subject)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("admin:dictionary_subject_changelist"), {"o": "3"}
+            )
+
+        counts = {
+            obj.id: obj.number_of_dicts for obj in response.context["cl"].result_list
+        }
+        self.assertEqual(counts[subject.id], 2)
+        self.assertEqual(sorted(counts.values()), [1, 2])
+        self.assertFalse(
+            any(
+                'JOIN "dictionary_dictionary"' in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+
+    def test_dictionary_changelist_should_not_load_words(self):
+        self.create_dictionaries(2)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("admin:dictionary_dictionary_changelist"))
+
+        self.assertFalse(
+            any('"words"' in query["sql"] for query in context.captured_queries)
+        )
+
+    def test_search_should_find_by_title_without_diacritics(self):
+        self.create_dictionaries(2)
+
+        response = self.client.get(
+            reverse("admin:dictionary_dictionary_changelist"), {"q": "SŁOWNIK 1"}
+        )
+
+        self.assertContains(response, "Słownik 1")
+        self.assertNotContains(response, "Słownik 0")
+
+    def test_subject_change_page_should_not_load_words_of_dictionaries(self):
+        self.create_dictionaries(1)
+        subject = Subject.objects.first()
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(
+                reverse("admin:dictionary_subject_change", args=[subject.id])
+            )
+
+        self.assertFalse(
+            any('"words"' in query["sql"] for query in context.captured_queries)
+        )
+
+    def test_unfiltered_changelist_should_be_estimated_with_deleted_rows(self):
+        self.create_dictionaries(2)
+        Dictionary.objects.first().mark_deleted()
+
+        response = self.client.get(reverse("admin:dictionary_dictionary_changelist"))
+
+        # the paginator estimates only queries without `WHERE`
+        self.assertFalse(response.context["cl"].queryset.query.where)
+        self.assertEqual(response.context["cl"].result_count, 2)
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    def test_count_should_be_exact_without_postgresql(self):
+        user = User.objects.create_user(email="test@email.com", username="TestUser")
+        Subject.objects.create(title="English", owner=user)
+
+        paginator = EstimatedCountPaginator(Subject.objects.all(), 10)
+
+        self.assertEqual(paginator.count, 1)
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from accounts.models import User
-from dictionary.models import Subject, Dictionary
+from dictionary.models import Subject, Dictionary, WordChange, WordSet
+from dictionary.slugs import allocate_slug, slugify_title
 
 
 class SlugifyBySignalTestCase(TestCase):
@@ -44,6 +45,62 @@ class SlugifyBySignalTestCase(TestCase):
         self.assertEqual(self.dictionary.slug, expected_value)
 
 
+class AllocateSlugTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+    def test_slug_of_subject_with_taken_slug_should_get_first_free_suffix(self):
+        Subject.objects.create(title="english!", owner=self.user)
+        Subject.objects.create(title="English", owner=self.user)
+        Subject.objects.create(title="English grammar", owner=self.user)
+
+        subject = Subject.objects.create(title="ENGLISH", owner=self.user)
+
+        self.assertEqual(subject.slug, "english-4")
+
+    def test_slug_should_be_allocated_with_one_query(self):
+        with self.assertNumQueries(1):
+            allocate_slug(Subject(title="English", owner=self.user), owner=self.user)
+
+    def test_slug_of_another_user_subject_should_not_get_suffix(self):
+        another_user = User.objects.create_user(
+            email="another@email.com", username="AnotherUser", password="test1234"
+        )
+
+        subject = Subject.objects.create(title="English", owner=another_user)
+
+        self.assertEqual(subject.slug, "english")
+
+    def test_suffixed_slug_should_be_kept_when_saved_with_the_same_title(self):
+        subject = Subject.objects.create(title="English", owner=self.user)
+        self.subject.delete()
+
+        subject.save()
+
+        self.assertEqual(subject.slug, "english-2")
+
+    def test_title_without_letters_should_get_slug_of_model_name(self):
+        first = Subject.objects.create(title="!!!", owner=self.user)
+        second = Subject.objects.create(title="???", owner=self.user)
+        dictionary = Dictionary.objects.create(title="...", subject=first)
+
+        self.assertEqual([first.slug, second.slug], ["subject", "subject-2"])
+        self.assertEqual(dictionary.slug, "dictionary")
+        self.assertEqual(dictionary.get_absolute_url(), "/subject/dictionary/")
+
+    def test_slugify_title_should_be_memoized(self):
+        slugify_title.cache_clear()
+
+        slugify_title("Zażółć gęślą jaźń")
+        slugify_title("Zażółć gęślą jaźń")
+
+        self.assertEqual(slugify_title.cache_info().hits, 1)
+
+
 class CustomMethodsOfModelsTestCase(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -69,3 +126,117 @@ class CustomMethodsOfModelsTestCase(TestCase):
             self.dictionary.get_absolute_url(),
             f"/{self.subject.slug}/{self.dictionary.slug}/",
         )
+
+
+class WordsHashTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.subject = Subject.objects.create(title="Język łaciński", owner=user)
+
+    def test_words_hash_should_not_depend_on_order_of_words(self):
+        first = Dictionary.objects.create(
+            subject=self.subject, title="Pierwszy", words={"a": "1", "b": "2"}
+        )
+        second = Dictionary.objects.create(
+            subject=self.subject, title="Drugi", words={"b": "2", "a": "1"}
+        )
+
+        self.assertEqual(first.words_hash, second.words_hash)
+
+    def test_words_hash_should_change_with_words(self):
+        dictionary = Dictionary.objects.create(
+            subject=self.subject, title="Pierwszy", words={"a": "1"}
+        )
+        words_hash = dictionary.words_hash
+
+        dictionary.words["b"] = "2"
+        dictionary.save()
+
+        self.assertNotEqual(dictionary.words_hash, words_hash)
+
+
+class WordsVersionTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.subject = Subject.objects.create(title="Język łaciński", owner=user)
+
+    def setUp(self):
+        self.dictionary = Dictionary.objects.create(
+            subject=self.subject, title="Pierwszy", words={"a": "1", "b": "2"}
+        )
+
+    def test_any_save_of_changed_words_should_raise_version(self):
+        self.dictionary.words = {"a": "1", "c": "3"}
+        self.dictionary.save()
+        self.dictionary.refresh_from_db()
+
+        self.assertEqual(self.dictionary.version, 1)
+        self.assertEqual(self.dictionary.get_changes(0), {"b": None, "c": "3"})
+
+    def test_save_of_words_with_update_fields_should_store_version(self):
+        self.dictionary.words = {"a": "2"}
+        self.dictionary.save(update_fields=["words", "words_hash"])
+        self.dictionary.refresh_from_db()
+
+        self.assertEqual(self.dictionary.version, 1)
+        self.assertEqual(WordChange.objects.count(), 2)
+
+    def test_save_of_unchanged_words_should_keep_version(self):
+        self.dictionary.title = "Drugi"
+        self.dictionary.save()
+        self.dictionary.refresh_from_db()
+
+        self.assertEqual(self.dictionary.version, 0)
+        self.assertFalse(WordChange.objects.exists())
+
+
+class CloneTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        student = User.objects.create_user(
+            email="another@email.com", username="AnotherUser", password="test1234"
+        )
+        cls.subject = Subject.objects.create(title="Język łaciński", owner=teacher)
+        cls.student_subject = Subject.objects.create(title="Łacina", owner=student)
+        cls.dictionary = Dictionary.objects.create(
+            subject=cls.subject, title="Sentencje", words={"wojna": "bellum"}
+        )
+
+    def test_clone_should_share_words_with_original(self):
+        clone = self.dictionary.clone(self.student_subject)
+
+        self.assertEqual(clone.word_set_id, self.dictionary.word_set_id)
+        self.assertEqual(clone.words, {})
+        self.assertEqual(clone.get_words(), {"wojna": "bellum"})
+        self.assertEqual(self.dictionary.get_words(), {"wojna": "bellum"})
+
+    def test_clone_should_keep_hash_of_words(self):
+        words_hash = self.dictionary.words_hash
+
+        clone = self.dictionary.clone(self.student_subject)
+
+        self.assertEqual(clone.words_hash, words_hash)
+        self.assertEqual(self.dictionary.words_hash, words_hash)
+
+    def test_next_clones_should_not_copy_words(self):
+        self.dictionary.clone(self.student_subject)
+
+        # slug allocation and insert
+        with self.assertNumQueries(2):
+            self.dictionary.clone(self.student_subject)
+
+        self.assertEqual(WordSet.objects.count(), 1)
+
+    def test_from_share_token_should_return_dictionary(self):
+        token = self.dictionary.get_share_token()
+
+        self.assertEqual(Dictionary.from_share_token(token), self.dictionary)
@@ -1,15 +1,52 @@
 """
 Tested modules:
     - `dictionary.words`
+    - `dictionary.events`
     - `dictionary.templatetags.modi_extras`
+    - `dictionary.learning`
+    - `dictionary.answers`
+    - `dictionary.duplicates`
+    - `dictionary.tasks`
 """
-from django.test import SimpleTestCase, TestCase, RequestFactory
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from dictionary.templatetags.modi_extras import get_value
 from dictionary.words import Words, DefinitionDoesNotExist, DuplicateError
+from dictionary.events import EventStream, WordEvents
+from dictionary.learning import LearningSession
+from dictionary.duplicates import DuplicateIndex
+from dictionary.tasks import purge_deleted, purge_drafts, purge_sessions
+from dictionary.answers import (
+    CORRECT,
+    DIACRITICS,
+    TYPO,
+    WRONG,
+    answer_keys,
+    bounded_levenshtein,
+    check_answer,
+)
 from accounts.models import User
-from dictionary.models import Subject, Dictionary
+from dictionary.models import (
+    Subject,
+    Dictionary,
+    DictionaryDraft,
+    DraftChange,
+    WordSet,
+)
+from accounts.api.tokens import AccessToken
+from modi.sessions import session_store_metrics
 
 
 class WordsTestCase(TestCase):
@@ -24,6 +61,7 @@ class WordsTestCase(TestCase):
         )
 
     def setUp(self):
+        cache.clear()
         self.factory = RequestFactory()
         self.request = self.factory.get(
             (
@@ -33,37 +71,50 @@ class WordsTestCase(TestCase):
                 )
             )
         )
-        self.request.session = self.client.session
+        self.request.user = self.user
         self.words = Words(self.request, self.dictionary)
 
-    def session_words(self) -> dict:
+    def draft_words(self) -> dict:
         """
-        Helper function, returns dictionary with words from session.
+        Helper function, returns words with changes of the draft,
+        loaded by a new `Words` instance.
         """
-        return self.request.session[f"dictionary_{self.dictionary.id}"]
+        return Words(self.request, self.dictionary).words
+
+    def test_instantiating_word_class_should_not_create_draft(self):
+        Words(self.request, self.dictionary)
+
+        self.assertFalse(DictionaryDraft.objects.exists())
 
-    def test_instantiating_word_class_should_add_dictionary_to_session(self):
+    def test_add_word_should_store_one_change_in_draft(self):
         dictionary = Dictionary.objects.create(
-            title="Książka", description="Klasa I", subject=self.subject
+            title="Książka", subject=self.subject, words={"wojna": "war"}
         )
-        Words(self.request, dictionary)
+        Words(self.request, dictionary).add_word("love", "miłość")
 
-        self.assertIn(f"dictionary_{dictionary.id}", self.request.session)
-
-    def test_clear_session_should_make_session_empty(self):
-        self.assertGreater(len(self.request.session.items()), 0)
+        self.assertEqual(
+            list(DraftChange.objects.values_list("definition", "word")),
+            [("miłość", "love")],
+        )
+        self.assertEqual(
+            Words(self.request, dictionary).words, {"wojna": "war", "miłość": "love"}
+        )
+        self.assertEqual(dictionary.words, {"wojna": "war"})
 
-        self.words.clear_session()
+    def test_draft_should_not_depend_on_session(self):
+        self.words.add_word("love", "miłość")
+        self.request.session = self.client.session
 
-        self.assertEqual(len(self.request.session.items()), 0)
+        self.assertEqual(self.draft_words(), {"miłość": "love"})
+        self.assertFalse(self.request.session.items())
 
-    def test_add_word_should_add_word_as_value_and_definition_as_key_to_session(self):
+    def test_discard_draft_should_delete_draft_with_changes(self):
         self.words.add_word("love", "miłość")
 
-        self.assertIn("miłość", self.session_words().keys())
-        self.assertIn("love", self.session_words().values())
-        self.assertEqual(self.session_words()["miłość"], "love")
-        self.assertEqual(len(self.session_words()), 1)
+        self.words.discard_draft()
+
+        self.assertFalse(DictionaryDraft.objects.exists())
+        self.assertFalse(DraftChange.objects.exists())
 
     def test_add_word_should_raise_error_when_existing_definition_provided(self):
         self.words.add_word("love", "miłość")
@@ -71,15 +122,13 @@ class WordsTestCase(TestCase):
         with self.assertRaises(DuplicateError):
             self.words.add_word("love", "miłość")
 
-    def test_remove_word_should_delete_word_and_definition_from_session(self):
+    def test_remove_word_should_delete_word_and_definition_from_draft(self):
         self.words.add_word("love", "miłość")
         self.words.add_word("break", "przerwa")
 
         self.words.remove_word("miłość")
 
-        self.assertNotIn("miłość", self.session_words().keys())
-        self.assertNotIn("love", self.session_words().values())
-        self.assertEqual(len(self.session_words()), 1)
+        self.assertEqual(self.draft_words(), {"przerwa": "break"})
 
     def test_remove_word_should_raise_error_if_definition_does_not_exist(self):
         with self.assertRaises(DefinitionDoesNotExist):
@@ -98,21 +147,21 @@ class WordsTestCase(TestCase):
             ("kodować", "code"),
         ]
 
-        self.assertNotEqual(self.session_words().items(), dict(expected_result))
+        self.assertNotEqual(list(self.draft_words().items()), expected_result)
         self.assertListEqual(self.words.get_words(), expected_result)
 
-    def test_clear_list_should_remove_all_words_and_definitions_from_session(self):
+    def test_clear_list_should_remove_all_words_and_definitions_from_draft(self):
+        self.dictionary.words = {"wojna": "war"}
+        self.dictionary.save()
         self.words.add_word("break", "przerwa")
-        self.words.add_word("code", "kodować")
-        self.words.add_word("attention", "uwaga")
-
-        self.assertEqual(len(self.session_words()), 3)
 
         self.words.clear_list()
 
-        self.assertEqual(len(self.session_words()), 0)
+        self.assertEqual(self.draft_words(), {})
+        self.assertFalse(DraftChange.objects.exists())
+        self.assertEqual(self.dictionary.words, {"wojna": "war"})
 
-    def test_save_to_db_after_saving_words_of_session_should_appear_in_the_words_of_dictionary_object(
+    def test_save_to_db_after_saving_words_of_draft_should_appear_in_the_words_of_dictionary_object(
         self,
     ):
         self.words.add_word("break", "przerwa")
@@ -122,25 +171,192 @@ class WordsTestCase(TestCase):
 
         self.assertEqual(len(self.dictionary.words), 2)
 
-    def test_save_to_db_after_saving_dictionary_session_should_be_removed_from_session(
-        self,
-    ):
+    def test_save_to_db_should_delete_draft(self):
         self.words.add_word("break", "przerwa")
-        self.words.add_word("attention", "uwaga")
 
         self.words.save_to_db()
 
-        self.assertNotIn(f"dictionary_{self.dictionary.id}", self.request.session)
+        self.assertFalse(DictionaryDraft.objects.exists())
 
-    def test_refresh_list_should_undo_changes_by_copying_words_from_dictionary_object_to_session(
-        self,
-    ):
+    def test_save_to_db_should_merge_draft_with_words_saved_meanwhile(self):
+        self.words.add_word("break", "przerwa")
+        self.words.remove_word("przerwa")
+        self.words.add_word("war", "wojna")
+        Dictionary.objects.filter(id=self.dictionary.id).update(
+            words={"przerwa": "pause", "pokój": "peace"}
+        )
+
+        self.words.save_to_db()
+
+        self.assertEqual(self.dictionary.words, {"pokój": "peace", "wojna": "war"})
+
+    def test_refresh_list_should_undo_changes_by_discarding_draft(self):
         self.words.add_word("love", "miłość")
         self.words.save_to_db()
+        self.words.add_word("war", "wojna")
 
         self.words.refresh_list()
 
-        self.assertEqual(self.session_words(), self.dictionary.words)
+        self.assertFalse(DictionaryDraft.objects.exists())
+        self.assertEqual(self.words.words, self.dictionary.words)
+        self.assertEqual(self.draft_words(), {"miłość": "love"})
+
+    def test_add_word_should_raise_error_when_definition_differs_by_whitespace(self):
+        self.words.add_word("war", "wojna")
+
+        with self.assertRaises(DuplicateError):
+            self.words.add_word("war", " wojna ")
+
+    def test_add_word_should_return_similar_definitions(self):
+        self.words.add_word("grass blade", "Źdźbło trawy")
+
+        similar = self.words.add_word("blade of grass", "zdzblo trawy!")
+
+        self.assertEqual(similar, ["Źdźbło trawy"])
+
+    def test_removed_definition_should_not_be_similar(self):
+        self.words.add_word("war", "wojna")
+        self.words.remove_word("wojna")
+
+        self.assertEqual(self.words.add_word("war", "Wojna"), [])
+
+    def test_index_should_be_kept_in_cache(self):
+        self.words.add_word("war", "wojna")
+
+        words = Words(self.request, self.dictionary)
+
+        self.assertEqual(words.index.entries, self.words.index.entries)
+        self.assertIn(words.index_key, cache)
+        self.assertEqual(words.index.find_similar("WOJNA"), ["wojna"])
+
+    def test_save_to_db_should_copy_shared_words_on_write(self):
+        clone = self.dictionary.clone(self.subject)
+        words = Words(self.request, clone)
+        words.add_word("break", "przerwa")
+
+        words.save_to_db()
+
+        self.assertIsNone(clone.word_set)
+        self.assertEqual(clone.get_words(), {"przerwa": "break"})
+        self.assertEqual(self.dictionary.get_words(), {})
+
+    def test_save_to_db_should_keep_shared_words_when_they_were_not_changed(self):
+        clone = self.dictionary.clone(self.subject)
+        words = Words(self.request, clone)
+        words.add_word("break", "przerwa")
+        words.remove_word("przerwa")
+
+        words.save_to_db()
+
+        self.assertEqual(clone.word_set, self.dictionary.word_set)
+
+
+@override_settings(WORD_EVENTS_STREAM_TIMEOUT=0.2, WORD_EVENTS_POLL_INTERVAL=0.05)
+class WordEventsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.subject = Subject.objects.create(title="Język angielski", owner=cls.user)
+        cls.dictionary = Dictionary.objects.create(
+            title="Podręcznik", subject=cls.subject
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get("/")
+        self.request.user = self.user
+        self.events = WordEvents(self.user.pk, self.dictionary.id)
+
+    def stream(self, headers=(), query_string=b""):
+        """
+        Helper function, returns status and body of `EventStream`
+        for the dictionary.
+        """
+        messages = []
+
+        async def receive():
+            return {"type": "http.request"}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "headers": list(headers),
+            "query_string": query_string,
+        }
+        # connections are closed by the ASGI server only, and the transaction
+        # of the test is seen only by its thread
+        with mock.patch("dictionary.events.close_old_connections"), mock.patch(
+            "dictionary.events.run_in_thread", sync_to_async
+        ):
+            async_to_sync(EventStream(self.dictionary.id))(scope, receive, send)
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        return messages[0]["status"], body.decode()
+
+    def test_changes_of_words_should_be_published_with_versions(self):
+        words = Words(self.request, self.dictionary)
+        words.add_word("love", "miłość")
+        words.remove_word("miłość")
+        words.save_to_db()
+
+        self.assertEqual(
+            self.events.get_events(0),
+            [
+                {"v": 1, "op": "add", "d": "miłość", "w": "love"},
+                {"v": 2, "op": "remove", "d": "miłość"},
+                {"v": 3, "op": "save"},
+            ],
+        )
+        self.assertEqual(self.events.get_events(2), [{"v": 3, "op": "save"}])
+
+    def test_get_events_should_return_none_when_events_are_lost(self):
+        self.events.publish("clear")
+        self.events.publish("reset")
+        cache.delete(f"{self.events.key}:1")
+
+        self.assertIsNone(self.events.get_events(0))
+        self.assertEqual(self.events.get_events(1), [{"v": 2, "op": "reset"}])
+
+    def test_stream_should_send_events_since_last_event_id(self):
+        Words(self.request, self.dictionary).add_word("love", "miłość")
+        Words(self.request, self.dictionary).add_word("war", "wojna")
+        token = str(AccessToken.for_user(self.user))
+
+        status, body = self.stream(
+            [(b"authorization", f"Bearer {token}".encode()), (b"last-event-id", b"1")]
+        )
+
+        self.assertEqual(status, 200)
+        self.assertIn(
+            'id: 2\nevent: add\ndata: {"v":2,"op":"add","d":"wojna","w":"war"}\n\n',
+            body,
+        )
+        self.assertNotIn("miłość", body)
+
+    def test_stream_should_send_reset_when_events_are_lost(self):
+        self.events.publish("clear")
+        token = str(AccessToken.for_user(self.user))
+
+        status, body = self.stream(
+            [(b"authorization", f"Bearer {token}".encode())], b"since=5"
+        )
+
+        self.assertIn("event: reset", body)
+
+    def test_stream_should_not_be_sent_to_other_users(self):
+        user = User.objects.create_user(
+            email="other@email.com", username="OtherUser", password="test1234"
+        )
+        token = str(AccessToken.for_user(user))
+
+        status, body = self.stream([(b"authorization", f"Bearer {token}".encode())])
+
+        self.assertEqual(status, 404)
+        self.assertEqual(self.stream()[0], 404)
 
 
 class TemplateFilterTestCase(SimpleTestCase):
@@ -158,3 +374,237 @@ class TemplateFilterTestCase(SimpleTestCase):
         expected = "value"
 
         self.assertEqual(result, expected)
+
+
+class LearningSessionTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        cls.subject = Subject.objects.create(title="Język angielski", owner=cls.user)
+        cls.dictionary = Dictionary.objects.create(
+            title="Podręcznik",
+            subject=cls.subject,
+            words={"wojna": "war", "kot": "cat", "pies": "dog"},
+        )
+
+    def setUp(self):
+        LearningSession(self.user, self.dictionary).restart()
+
+    def test_correct_answers_should_complete_learning(self):
+        session = LearningSession(self.user, self.dictionary)
+
+        while session.definition is not None:
+            result, word = session.answer(self.dictionary.words[session.definition])
+            self.assertEqual(result, CORRECT)
+
+        self.assertEqual(session.get_state()["correct"], 3)
+
+    def test_wrong_answer_should_not_repeat_card_immediately(self):
+        session = LearningSession(self.user, self.dictionary)
+        definition = session.definition
+
+        result, word = session.answer("wrong")
+
+        self.assertEqual(result, WRONG)
+        self.assertEqual(word, self.dictionary.words[definition])
+        self.assertNotEqual(session.definition, definition)
+        self.assertEqual(session.get_state()["remaining"], 3)
+
+    def test_progress_should_be_resumed_by_new_session(self):
+        session = LearningSession(self.user, self.dictionary)
+        session.answer(self.dictionary.words[session.definition])
+
+        resumed = LearningSession(self.user, self.dictionary)
+
+        self.assertEqual(resumed.get_state(), session.get_state())
+
+    def test_progress_should_be_reset_when_words_change(self):
+        session = LearningSession(self.user, self.dictionary)
+        session.answer(self.dictionary.words[session.definition])
+        dictionary = Dictionary.objects.get(id=self.dictionary.id)
+        dictionary.words = {"wojna": "war"}
+        dictionary.save()
+
+        session = LearningSession(self.user, dictionary)
+
+        self.assertEqual(session.get_state()["remaining"], 1)
+        self.assertEqual(session.get_state()["correct"], 0)
+
+
+class AnswersTestCase(SimpleTestCase):
+    def setUp(self):
+        self.keys = answer_keys(
+            {"źdźbło": "źdźbło", "kot": "Cat", "miłość": "love  story"}
+        )
+
+    def test_answer_should_be_normalized(self):
+        self.assertEqual(check_answer(" LOVE story ", self.keys["miłość"]), CORRECT)
+        self.assertEqual(check_answer("cat", self.keys["kot"]), CORRECT)
+
+    def test_answer_without_diacritics_should_be_accepted_only_when_ignored(self):
+        key = self.keys["źdźbło"]
+
+        self.assertEqual(
+            check_answer("zdzblo", key, ignore_diacritics=True), DIACRITICS
+        )
+        self.assertEqual(check_answer("zdzblo", key), WRONG)
+
+    def test_answer_should_be_accepted_with_one_typo_only(self):
+        self.assertEqual(check_answer("lvoe story", self.keys["miłość"]), WRONG)
+        self.assertEqual(check_answer("love stroy", self.keys["miłość"]), WRONG)
+        self.assertEqual(check_answer("love storry", self.keys["miłość"]), TYPO)
+
+    def test_answer_of_short_word_should_not_tolerate_typos(self):
+        self.assertEqual(check_answer("cot", self.keys["kot"]), WRONG)
+
+    def test_bounded_levenshtein_should_return_distance_within_limit(self):
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 3), 3)
+        self.assertEqual(bounded_levenshtein("kitten", "sitting", 2), 3)
+        self.assertEqual(bounded_levenshtein("", "abc", 5), 3)
+        self.assertEqual(bounded_levenshtein("flaw", "lawn", 2), 2)
+
+
+class DuplicateIndexTestCase(SimpleTestCase):
+    def setUp(self):
+        self.index = DuplicateIndex.build(
+            ["samochód osobowy", "kot domowy", "wojna", "Kot domowy."]
+        )
+
+    def test_find_similar_should_ignore_case_diacritics_and_punctuation(self):
+        self.assertEqual(
+            self.index.find_similar("Samochod  osobowy"), ["samochód osobowy"]
+        )
+
+    def test_find_similar_should_find_definitions_with_similar_trigrams(self):
+        self.assertEqual(self.index.find_similar("samochody osobowe"), [])
+        self.assertEqual(
+            self.index.find_similar("samochód osobowy!!"), ["samochód osobowy"]
+        )
+        self.assertIn("samochód osobowy", self.index.find_similar("samochód osobow"))
+
+    def test_find_duplicates_should_return_groups_of_similar_definitions(self):
+        self.assertEqual(self.index.find_duplicates(), [["Kot domowy.", "kot domowy"]])
+
+    def test_index_should_be_restored_from_entries(self):
+        restored = DuplicateIndex(self.index.entries)
+
+        self.assertEqual(restored.find_similar("WOJNA"), ["wojna"])
+
+
+class PurgeDeletedTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        self.subject = Subject.objects.create(title="English", owner=self.user)
+        self.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=self.subject, words={"wojna": "war"}
+        )
+        self.another_subject = Subject.objects.create(title="German", owner=self.user)
+
+    def test_mark_deleted_should_hide_subject_with_its_dictionaries(self):
+        self.subject.mark_deleted()
+
+        self.assertFalse(self.user.subjects.filter(id=self.subject.id).exists())
+        self.assertFalse(Dictionary.objects.exists())
+        self.assertEqual(Dictionary.all_objects.count(), 1)
+
+    def test_subject_should_get_free_slug_while_deleted_one_is_waiting(self):
+        self.subject.mark_deleted()
+
+        subject = Subject.objects.create(title="English", owner=self.user)
+
+        self.assertEqual(subject.slug, "english-2")
+
+    def test_purge_deleted_should_delete_only_marked_objects(self):
+        self.subject.mark_deleted()
+
+        self.assertEqual(purge_deleted(), 2)
+        self.assertFalse(Subject.all_objects.filter(id=self.subject.id).exists())
+        self.assertFalse(Dictionary.all_objects.exists())
+        self.assertTrue(Subject.objects.filter(id=self.another_subject.id).exists())
+
+    def test_purge_deleted_should_delete_account_with_all_its_data(self):
+        self.user.mark_deleted()
+
+        purge_deleted()
+
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Subject.all_objects.exists())
+        self.assertFalse(Dictionary.all_objects.exists())
+
+    def test_purge_deleted_should_not_fetch_words(self):
+        self.dictionary.clone(self.another_subject)
+        WordSet.objects.update(created=self.dictionary.word_set.created - timedelta(1))
+        self.user.mark_deleted()
+
+        with CaptureQueriesContext(connection) as context:
+            purge_deleted()
+
+        self.assertFalse(WordSet.objects.exists())
+        for query in context.captured_queries:
+            self.assertNotIn('"words"', query["sql"])
+
+
+class PurgeDraftsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        subject = Subject.objects.create(title="English", owner=self.user)
+        self.dictionaries = [
+            Dictionary.objects.create(title=title, subject=subject)
+            for title in ["Basic words", "Animals"]
+        ]
+
+    def test_purge_drafts_should_delete_only_abandoned_drafts(self):
+        abandoned, recent = [
+            DictionaryDraft.objects.create(user=self.user, dictionary=dictionary)
+            for dictionary in self.dictionaries
+        ]
+        DraftChange.objects.create(draft=abandoned, definition="wojna", word="war")
+        DictionaryDraft.objects.filter(id=abandoned.id).update(
+            updated=abandoned.updated - timedelta(seconds=settings.DRAFT_MAX_AGE + 1)
+        )
+
+        self.assertEqual(purge_drafts(), 1)
+        self.assertEqual(
+            list(DictionaryDraft.objects.values_list("id", flat=True)), [recent.id]
+        )
+        self.assertFalse(DraftChange.objects.exists())
+
+
+class PurgeSessionsTestCase(TestCase):
+    def create_session(self, data, expiry=3600):
+        session = SessionStore()
+        session.update(data)
+        session.set_expiry(expiry)
+        session.create()
+        return session.session_key
+
+    def test_purge_sessions_should_delete_expired_sessions(self):
+        self.create_session({"a": 1}, expiry=-1)
+        session_key = self.create_session({"a": 1})
+
+        self.assertEqual(purge_sessions(), 1)
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)), [session_key]
+        )
+
+    def test_session_store_metrics_should_measure_sessions(self):
+        self.create_session({"a": 1}, expiry=-1)
+        self.create_session({"a": 1})
+
+        metrics = session_store_metrics()
+
+        self.assertEqual(metrics["sessions"], 2)
+        self.assertEqual(metrics["expired_sessions"], 1)
+        self.assertEqual(
+            metrics["total_bytes"],
+            sum(
+                len(data)
+                for data in Session.objects.values_list("session_data", flat=True)
+            ),
+        )
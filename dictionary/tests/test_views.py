@@ -107,14 +107,15 @@ class SubjectCreateViewTestCase(TestCase):
 
         self.assertGreater(subjects_after, subjects_before)
 
-    def test_http_post_method_response_should_return_status_200_when_attempt_to_create_existed_subject(
+    def test_http_post_method_response_should_create_subject_with_suffixed_slug_when_title_exists(
         self,
     ):
         response = self.client.post(
             reverse("dictionary:subject_create"), data={"title": self.subject.title}
         )
 
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Subject.objects.filter(slug="english-2").exists())
 
 
 class SubjectUpdateViewTestCase(TransactionTestCase):
@@ -148,7 +149,7 @@ class SubjectUpdateViewTestCase(TransactionTestCase):
 
         self.assertEqual(response.status_code, 302)
 
-    def test_http_post_method_response_should_return_status_200_when_attempt_to_update_data_to_data_of_existed_subject(
+    def test_http_post_method_response_should_return_status_302_when_attempt_to_update_data_to_data_of_existed_subject(
         self,
     ):
         response = self.client.post(
@@ -156,17 +157,19 @@ class SubjectUpdateViewTestCase(TransactionTestCase):
             data={"title": self.another_subject.title},
         )
 
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.status_code, 302)
 
-    def test_http_post_method_when_attempt_to_update_data_to_data_of_existed_subject_response_should_contains_original_title(
+    def test_http_post_method_when_attempt_to_update_data_to_data_of_existed_subject_slug_should_get_suffix(
         self,
     ):
-        response = self.client.post(
+        self.client.post(
             reverse("dictionary:subject_update", args=[self.subject.slug]),
             data={"title": self.another_subject.title},
         )
 
-        self.assertContains(response, self.subject.title)
+        self.subject.refresh_from_db()
+
+        self.assertEqual(self.subject.slug, "polish-2")
 
 
 class SubjectDeleteViewTestCase(TestCase):
@@ -275,7 +278,7 @@ class DictionaryCreateViewTestCase(TransactionTestCase):
 
         self.assertGreater(dictionaries_after, dictionaries_before)
 
-    def test_http_post_method_response_should_return_status_200_when_attempt_to_create_existed_dictionary(
+    def test_http_post_method_response_should_create_dictionary_with_suffixed_slug_when_title_exists(
         self,
     ):
         response = self.client.post(
@@ -283,7 +286,8 @@ class DictionaryCreateViewTestCase(TransactionTestCase):
             data={"title": self.dictionary.title},
         )
 
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Dictionary.objects.filter(slug="basic-words-2").exists())
 
 
 class DictionaryUpdateViewTestCase(TransactionTestCase):
@@ -327,7 +331,7 @@ class DictionaryUpdateViewTestCase(TransactionTestCase):
 
         self.assertEqual(response.status_code, 302)
 
-    def test_http_post_method_response_should_return_status_200_when_attempt_to_update_data_to_data_of_existed_dictionary(
+    def test_http_post_method_response_should_return_status_302_when_attempt_to_update_data_to_data_of_existed_dictionary(
         self,
     ):
         response = self.client.post(
@@ -337,19 +341,21 @@ class DictionaryUpdateViewTestCase(TransactionTestCase):
             data={"title": self.another_dictionary.title},
         )
 
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.status_code, 302)
 
-    def test_http_post_method_when_attempt_to_update_data_to_data_of_existed_dictionary_response_should_contains_original_title(
+    def test_http_post_method_when_attempt_to_update_data_to_data_of_existed_dictionary_slug_should_get_suffix(
         self,
     ):
-        response = self.client.post(
+        self.client.post(
             reverse(
                 "dictionary:dict_update", args=[self.subject.slug, self.dictionary.slug]
             ),
             data={"title": self.another_dictionary.title},
         )
 
-        self.assertContains(response, self.dictionary.title)
+        self.dictionary.refresh_from_db()
+
+        self.assertEqual(self.dictionary.slug, "popular-words-2")
 
 
 class DictionaryDeleteViewTestCase(TransactionTestCase):
@@ -435,6 +441,28 @@ class WordFormViewTestCase(TestCase):
 
         self.assertContains(response, self.dictionary)
 
+    def test_http_get_method_response_should_contains_url_of_word_events(self):
+        response = self.client.get(
+            reverse(
+                "dictionary:word_form", args=[self.subject.slug, self.dictionary.slug]
+            )
+        )
+
+        self.assertContains(
+            response, f"/events/dictionaries/{self.dictionary.id}/?since="
+        )
+
+    def test_http_post_method_response_should_warn_about_similar_definition(self):
+        response = self.client.post(
+            reverse(
+                "dictionary:word_form", args=[self.subject.slug, self.dictionary.slug]
+            ),
+            data={"word": "war", "definition": "Wojna!"},
+            follow=True,
+        )
+
+        self.assertContains(response, "Podobne definicje już istnieją: wojna")
+
     def test_http_post_method_response_should_return_status_302(self):
         response = self.client.post(
             reverse(
@@ -514,3 +542,102 @@ class WordsManagementViewTestCase(TestCase):
         )
 
         self.assertEqual(response.status_code, 302)
+
+
+class LearningViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words", subject=cls.subject, words={"wojna": "war"}
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+
+    def test_learning_page_should_refer_to_learning_session_instead_of_embedding_words(
+        self,
+    ):
+        response = self.client.get(
+            reverse(
+                "dictionary:learning", args=[self.subject.slug, self.dictionary.slug]
+            )
+        )
+
+        self.assertContains(
+            response,
+            reverse("dictionary-learning", args=[self.subject.id, self.dictionary.id]),
+        )
+        self.assertNotContains(response, "wojna")
+
+    def test_learning_page_should_refer_to_immutable_deck(self):
+        response = self.client.get(
+            reverse(
+                "dictionary:learning", args=[self.subject.slug, self.dictionary.slug]
+            )
+        )
+
+        self.assertContains(response, self.dictionary.get_deck_url())
+
+
+class DeckViewTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email="test@email.com", username="TestUser", password="test1234"
+        )
+        User.objects.create_user(
+            email="another@email.com", username="AnotherUser", password="test1234"
+        )
+
+        cls.subject = Subject.objects.create(title="English", owner=cls.user)
+
+        cls.dictionary = Dictionary.objects.create(
+            title="Basic words",
+            subject=cls.subject,
+            words={f"definicja {i}": f"word {i}" for i in range(100)},
+        )
+
+    def setUp(self):
+        self.client.login(username="TestUser", password="test1234")
+
+    def test_response_should_contain_words_and_be_cacheable(self):
+        response = self.client.get(self.dictionary.get_deck_url())
+
+        self.assertEqual(response.json(), self.dictionary.words)
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_response_should_be_compressed_when_client_accepts_gzip(self):
+        response = self.client.get(
+            self.dictionary.get_deck_url(), HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_response_should_be_compressed_with_brotli_when_client_accepts_it(self):
+        response = self.client.get(
+            self.dictionary.get_deck_url(), HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    def test_outdated_version_should_redirect_to_current_deck(self):
+        url = self.dictionary.get_deck_url()
+        self.dictionary.words = {"wojna": "war"}
+        self.dictionary.save()
+
+        response = self.client.get(url)
+
+        self.assertRedirects(response, self.dictionary.get_deck_url())
+
+    def test_deck_of_another_user_should_return_status_404(self):
+        self.client.login(username="AnotherUser", password="test1234")
+
+        response = self.client.get(self.dictionary.get_deck_url())
+
+        self.assertEqual(response.status_code, 404)
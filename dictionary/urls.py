@@ -84,6 +84,11 @@ urlpatterns = [
         views.WordsManagementView.as_view(action="clear"),
         name="clear_list",
     ),
+    path(
+        "talia/<int:dictionary_id>/<str:version>/",
+        views.DeckView.as_view(),
+        name="deck",
+    ),
     path(
         "<slug:subject_slug>/<slug:dictionary_slug>/",
         views.DictionaryDetailView.as_view(
@@ -8,16 +8,18 @@ from django.views.generic import (
     View,
     TemplateView,
 )
+from django.conf import settings
 from django.db import IntegrityError
 from django.contrib import messages
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
-from django.utils.text import slugify
-from unidecode import unidecode
+from django.utils.html import format_html
 
 from accounts.views import LoginRequiredMixin
 from .models import Dictionary, Subject
 from .forms import SearchForm, SubjectForm, DictionaryForm, WordForm
+from .slugs import slugify_title
 from .words import Words, DuplicateError
 
 
@@ -123,7 +125,7 @@ class SearchMixin:
                 messages.info(self.request, self.get_empty_form_field_message())
                 return queryset
             self.extra_context = {"value": self.query}
-            found = queryset.filter(slug__icontains=slugify(unidecode(self.query)))
+            found = queryset.filter(slug__icontains=slugify_title(self.query))
             if not found:
                 messages.info(self.request, self.get_not_found_message())
                 return queryset
@@ -141,10 +143,17 @@ class SearchMixin:
 
 
 class CustomDeletionMixin:
+    """
+    Objects are only marked as deleted, so the request doesn't wait
+    for the cascade, see `dictionary.tasks.purge_deleted`.
+    """
+
     def post(self, request, *args, **kwargs):
-        response = super().delete(request, *args, **kwargs)
+        self.object = self.get_object()
+        success_url = self.get_success_url()
+        self.object.mark_deleted()
         messages.success(self.request, self.get_success_message())
-        return response
+        return redirect(success_url)
 
     def get_success_message(self):
         "SUCCESS"
@@ -282,6 +291,9 @@ class DictionaryUpdateView(
 class DictionaryDeleteView(
     LoginRequiredMixin, DictionaryModelMixin, CustomDeletionMixin, DeleteView
 ):
+    def get_queryset(self):
+        return super().get_queryset().defer("words", "answer_keys")
+
     def get_success_url(self):
         return reverse_lazy("dictionary:dict_list", args=[self.object.subject.slug])
 
@@ -307,7 +319,10 @@ class WordFormView(LoginRequiredMixin, GetDictionaryObjectMixin, FormView):
             self.dictionary = self.get_object()
             self.words = Words(self.request, self.dictionary)
         return super().get_context_data(
-            dictionary=self.dictionary, words=self.words.get_words()
+            dictionary=self.dictionary,
+            words=self.words.get_words(),
+            # other devices' changes are streamed after this version
+            events_version=self.words.events.get_version(),
         )
 
     def form_valid(self, form):
@@ -316,11 +331,18 @@ class WordFormView(LoginRequiredMixin, GetDictionaryObjectMixin, FormView):
         self.words = Words(self.request, self.dictionary)
 
         try:
-            self.words.add_word(word=cd["word"], definition=cd["definition"])
+            similar = self.words.add_word(word=cd["word"], definition=cd["definition"])
         except DuplicateError:
             messages.error(self.request, "Definicja o takiej treści już istnieje.")
             return super().form_invalid(form)
         else:
+            if similar:
+                messages.warning(
+                    self.request,
+                    format_html(
+                        "Podobne definicje już istnieją: {}", ", ".join(similar)
+                    ),
+                )
             return super().form_valid(form)
 
 
@@ -356,5 +378,43 @@ class WordsManagementView(LoginRequiredMixin, View):
 
 
 class LearningView(LoginRequiredMixin, GetDictionaryObjectMixin, TemplateView):
+    """
+    Words aren't embedded in the page, `learning.js` draws cards from
+    the learning session of the API, see `dictionary.learning`. Without
+    connection it checks answers by the deck of `DeckView`.
+    """
+
+    def get_object(self):
+        return get_object_or_404(
+            Dictionary.objects.defer("words", "answer_keys"),
+            slug=self.kwargs.get("dictionary_slug"),
+            subject=self.get_subject_object(),
+        )
+
     def get_context_data(self, **kwargs):
         return super().get_context_data(dictionary=self.get_object())
+
+
+class DeckView(LoginRequiredMixin, View):
+    """
+    Returns words of dictionary for learning offline by `learning.js`
+    and API clients.
+    URL contains hash of the words, so response never changes and can be
+    cached for a long time.
+    It's compressed by `modi.middleware.CompressionMiddleware`.
+    """
+
+    def get(self, request, *args, **kwargs):
+        dictionary = get_object_or_404(
+            Dictionary.objects.select_related("word_set"),
+            id=kwargs.get("dictionary_id"),
+            subject__owner=request.user,
+        )
+        if kwargs.get("version") != dictionary.get_words_hash():
+            return redirect(dictionary.get_deck_url())
+
+        response = JsonResponse(
+            dictionary.get_words(), json_dumps_params={"ensure_ascii": False}
+        )
+        response["Cache-Control"] = settings.LEARNING_DECK_CACHE_CONTROL
+        return response
@@ -1,28 +1,105 @@
 from typing import List
 
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .duplicates import DuplicateIndex
+from .events import WordEvents
+from .models import Dictionary, DictionaryDraft, DraftChange
+
 
 class Words:
+    """
+    Words of a dictionary in the word editor of a user. Changes are kept
+    in `DictionaryDraft` until they are merged by `save_to_db`, so they
+    survive the session and are shared by all devices of the user.
+    """
+
     def __init__(self, request, dictionary):
-        self.session = request.session
+        self.user = request.user
         self.dictionary = dictionary
-        self.object_key = f"dictionary_{dictionary.id}"
+        self.draft = DictionaryDraft.objects.filter(
+            user=self.user, dictionary=dictionary
+        ).first()
+        if self.draft is None:
+            self.words = dictionary.get_words().copy()
+        else:
+            self.words = self.draft.apply(dictionary.get_words())
 
-        if self.object_key not in self.session:
-            self.session[self.object_key] = dictionary.words.copy()
-        self.words = self.session[self.object_key]
+        self.cache = caches[settings.DUPLICATE_INDEX_CACHE]
+        # words of the dictionary are a part of the key, they may be saved
+        # by other editors
+        self.index_key = (
+            f"dictionary:duplicates:{self.user.pk}:{dictionary.id}:"
+            f"{dictionary.get_words_hash()}"
+        )
+        self._index = None
+        self.events = WordEvents(self.user.pk, dictionary.id)
 
-    def add_word(self, word: str, definition: str) -> None:
+    @property
+    def index(self) -> DuplicateIndex:
+        """
+        Index of near-duplicate definitions, it's kept in the cache
+        by `save`, so it's built once per editing.
+        """
+        if self._index is None:
+            entries = self.cache.get(self.index_key)
+            if entries is None:
+                self._index = DuplicateIndex.build(self.words)
+            else:
+                self._index = DuplicateIndex(entries)
+        return self._index
+
+    def get_draft(self) -> DictionaryDraft:
+        if self.draft is None:
+            self.draft, created = DictionaryDraft.objects.get_or_create(
+                user=self.user, dictionary=self.dictionary
+            )
+        return self.draft
+
+    def change(self, definition: str, word=None) -> None:
+        """
+        Stores a single change in the draft, `None` removes the definition.
+        """
+        DraftChange.objects.update_or_create(
+            draft=self.get_draft(), definition=definition, defaults={"word": word}
+        )
+        # `updated` of the draft tells when it was changed last time
+        self.draft.save(update_fields=["updated"])
+        if word is None:
+            self.events.publish("remove", definition)
+        else:
+            self.events.publish("add", definition, word)
+
+    def add_word(self, word: str, definition: str) -> List[str]:
+        """
+        Adds word and returns similar definitions, which already exist.
+        """
+        definition = definition.strip()
         if definition in self.words:
             raise DuplicateError()
-        self.words[definition.strip()] = word.strip()
+        similar = self.index.find_similar(definition)
+        self.words[definition] = word.strip()
+        self.change(definition, self.words[definition])
+        self.index.add(definition)
         self.save()
+        return similar
 
     def remove_word(self, definition: str) -> None:
         if definition not in self.words:
             raise DefinitionDoesNotExist()
         del self.words[definition]
+        self.change(definition)
+        self.index.remove(definition)
         self.save()
 
+    def find_duplicates(self) -> List[List[str]]:
+        """
+        Returns groups of similar definitions.
+        """
+        return self.index.find_duplicates()
+
     def get_words(self) -> List[tuple]:
         """
         Returns sorted by word list of tuples.
@@ -31,32 +108,65 @@ class Words:
 
     def clear_list(self):
         """
-        Removes all words from session.
+        Removes all words, words of `Dictionary` object are removed
+        only after saving.
         """
-        self.words.clear()
-        self.save()
+        draft = self.get_draft()
+        with transaction.atomic():
+            draft.changes.all().delete()
+            draft.cleared = True
+            draft.save(update_fields=["cleared", "updated"])
+        self.words = {}
+        self._index = None
+        self.cache.delete(self.index_key)
+        self.events.publish("clear")
 
     def refresh_list(self):
         """
-        Reverses changes by copying words from `Dictionary` object.
+        Reverses changes by discarding the draft.
         """
-        self.session[self.object_key] = self.dictionary.words.copy()
-        self.words = self.session[self.object_key]
+        self.discard_draft()
+        self.words = self.dictionary.get_words().copy()
+        self.events.publish("reset")
 
-    def clear_session(self):
-        del self.session[self.object_key]
-        self.save()
+    def discard_draft(self):
+        if self.draft is not None:
+            self.draft.delete()
+            self.draft = None
+        self._index = None
+        self.cache.delete(self.index_key)
 
     def save_to_db(self):
         """
-        Saves words to `Dictionary.words`.
+        Merges changes of the draft into current words of the dictionary,
+        so words saved meanwhile by other editors aren't lost. Words shared
+        with other dictionaries are copied on write, unless they weren't changed.
         """
-        self.dictionary.words = dict(self.get_words())
-        self.dictionary.save()
-        self.clear_session()
+        if self.draft is None:
+            return
+        with transaction.atomic():
+            Dictionary.objects.select_for_update().only("id").get(id=self.dictionary.id)
+            self.dictionary.refresh_from_db(fields=["words", "word_set"])
+            words = self.draft.apply(self.dictionary.get_words())
+            self.words = dict(sorted(words.items(), key=lambda items: items[1].lower()))
+            if not (
+                self.dictionary.word_set_id
+                and self.words == self.dictionary.get_words()
+            ):
+                self.dictionary.words = self.words.copy()
+                self.dictionary.word_set = None
+                self.dictionary.save()
+            self.discard_draft()
+        self.events.publish("save")
 
     def save(self):
-        self.session.modified = True
+        """
+        Keeps the index of definitions in the cache for the next requests.
+        """
+        if self._index is not None:
+            self.cache.set(
+                self.index_key, self._index.entries, settings.DUPLICATE_INDEX_TIMEOUT
+            )
 
 
 class DuplicateError(Exception):
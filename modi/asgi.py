@@ -3,14 +3,39 @@ ASGI config for modi project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Server-sent events of the word editor, see `dictionary.events`, are served
+here, outside of Django views, so a stream doesn't hold a worker thread.
+Run it by an ASGI server, e.g. `uvicorn modi.asgi:application`, `runserver`
+doesn't serve them.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
 
 import os
+import re
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "modi.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+if settings.DEBUG:
+    # served by `runserver` otherwise
+    django_application = ASGIStaticFilesHandler(django_application)
+
+# apps can be imported only after Django is set up
+from dictionary.events import EventStream  # noqa: E402
+
+re_word_events = re.compile(r"^/events/dictionaries/(?P<dictionary_id>\d+)/$")
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["method"] == "GET":
+        match = re_word_events.match(scope["path"])
+        if match:
+            stream = EventStream(int(match["dictionary_id"]))
+            return await stream(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -13,16 +13,75 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
+# Connections are kept open between requests for `POSTGRES_CONN_MAX_AGE`
+# seconds. Set `POSTGRES_PGBOUNCER=1` when the hosts point to PgBouncer
+# running in transaction pooling mode, the pooler owns connections then
+# and server-side cursors can't be used.
+
+PGBOUNCER = os.environ.get("POSTGRES_PGBOUNCER") == "1"
+CONN_MAX_AGE = 0 if PGBOUNCER else int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60))
+
+
+def postgres_database(host):
+    return {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": os.environ.get("POSTGRES_NAME"),
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
-        "HOST": "database",
-        "PORT": 5432,
+        "HOST": host,
+        "PORT": int(os.environ.get("POSTGRES_PORT", 5432)),
+        "CONN_MAX_AGE": CONN_MAX_AGE,
+        "DISABLE_SERVER_SIDE_CURSORS": PGBOUNCER,
+    }
+
+
+DATABASES = {
+    "default": postgres_database(os.environ.get("POSTGRES_HOST", "database")),
+}
+
+# Comma separated hosts of read replicas, e.g. "replica-1,replica-2".
+for number, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{number}"] = postgres_database(host.strip())
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Password hashing policy for the hardware of the environment,
+# e.g. PASSWORD_HASHER=ScryptPasswordHasher makes scrypt preferred.
+
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER")
+if PASSWORD_HASHER:
+    PASSWORD_HASHERS = sorted(
+        PASSWORD_HASHERS, key=lambda hasher: not hasher.endswith(PASSWORD_HASHER)
+    )
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.environ.get("PASSWORD_PBKDF2_ITERATIONS", PASSWORD_PBKDF2_ITERATIONS)
+)
+PASSWORD_SCRYPT_WORK_FACTOR = int(
+    os.environ.get("PASSWORD_SCRYPT_WORK_FACTOR", PASSWORD_SCRYPT_WORK_FACTOR)
+)
+PASSWORD_ARGON2_TIME_COST = int(
+    os.environ.get("PASSWORD_ARGON2_TIME_COST", PASSWORD_ARGON2_TIME_COST)
+)
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.environ.get("PASSWORD_ARGON2_MEMORY_COST", PASSWORD_ARGON2_MEMORY_COST)
+)
+
+
+# The cache is shared by all processes and survives their restarts.
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": os.environ.get("CACHE_REDIS_URL", "redis://broker:6379/2"),
     },
 }
 
+# Word events have to be seen by streams of all workers.
+WORD_EVENTS_CACHE = "default"
+
+THROTTLE_REDIS_URL = os.environ.get("THROTTLE_REDIS_URL", "redis://broker:6379/1")
+
+
 CELERY_BROKER_URL = "redis://broker:6379"
-CELERY_INCLUDE = ["accounts.tasks"]
+CELERY_INCLUDE = ["accounts.tasks", "dictionary.tasks"]
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+from .routers import pin_this_thread, unpin_this_thread, this_thread_has_written
+
+
+class ReplicaPinningMiddleware:
+    """
+    Provides read-your-writes consistency for `modi.routers.PrimaryReplicaRouter`.
+
+    Unsafe requests and requests sent within `settings.REPLICA_PIN_SECONDS`
+    after a write of the same client read from the primary database,
+    so replication lag is never visible to the user who made a change.
+    """
+
+    cookie_name = "modi_pinned"
+    safe_methods = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        unpin_this_thread()
+        if (
+            request.method not in self.safe_methods
+            or self.cookie_name in request.COOKIES
+        ):
+            pin_this_thread()
+
+        try:
+            response = self.get_response(request)
+            if this_thread_has_written() and settings.DATABASE_REPLICAS:
+                response.set_cookie(
+                    self.cookie_name,
+                    "1",
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                    samesite="Lax",
+                )
+        finally:
+            unpin_this_thread()
+        return response
+
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+re_accepts_gzip = _lazy_re_compile(r"\bgzip\b")
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with brotli or gzip, depending on `Accept-Encoding`.
+
+    Only responses of at least `settings.COMPRESSION_MIN_SIZE` bytes and of
+    `settings.COMPRESSION_CONTENT_TYPES` are compressed. HTML pages aren't
+    listed there, because they contain CSRF tokens (BREACH attack).
+    Streaming responses are left untouched, so they aren't buffered.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+            or response.has_header("Content-Encoding")
+        ):
+            return response
+
+        content_type = response.get("Content-Type", "").split(";")[0]
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if brotli and re_accepts_brotli.search(accept_encoding):
+            encoding = "br"
+            compressed_content = brotli.compress(
+                response.content, quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        elif re_accepts_gzip.search(accept_encoding):
+            encoding = "gzip"
+            compressed_content = compress_string(response.content)
+        else:
+            return response
+
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers["Content-Length"] = str(len(response.content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
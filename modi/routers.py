@@ -0,0 +1,65 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_locals = threading.local()
+
+
+def pin_this_thread():
+    """
+    Sends all following reads of current thread to the primary database.
+    """
+    _locals.pinned = True
+
+
+def unpin_this_thread():
+    _locals.pinned = False
+    _locals.written = False
+
+
+def this_thread_is_pinned():
+    return getattr(_locals, "pinned", False)
+
+
+def this_thread_has_written():
+    return getattr(_locals, "written", False)
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes reads to one of `settings.DATABASE_REPLICAS` and writes to the
+    primary (`default`) database.
+
+    Every write pins the thread to the primary, so the rest of the request
+    reads its own writes, e.g. `Words.save_to_db` or saving a form followed
+    by a redirect. `modi.middleware.ReplicaPinningMiddleware` carries the pin
+    over to next requests of the same client.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or this_thread_is_pinned():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        pin_this_thread()
+        _locals.written = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Replicas get the schema by replication, not by migrations.
+        """
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,90 @@
+"""
+Session engine with compact serialization, enabled by `settings.SESSION_ENGINE`
+and `settings.SESSION_SERIALIZER`. Words staged by `dictionary.words.Words`
+are kept in `dictionary.models.DictionaryDraft`, not in sessions, their size
+is measured by `session_store_metrics`.
+"""
+import zlib
+from importlib import import_module
+
+import msgpack
+from django.conf import settings
+from django.contrib.sessions.backends import db
+from django.contrib.sessions.serializers import JSONSerializer
+from django.core import signing
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Coalesce, Length
+from django.utils import timezone
+
+
+MSGPACK = b"m"
+ZLIB_MSGPACK = b"z"
+
+
+class CompactSerializer:
+    """
+    Serializes sessions with MessagePack, compressed with zlib only above
+    `settings.SESSION_COMPRESS_MIN_SIZE` bytes. The first byte marks the
+    format, so sessions saved by `JSONSerializer` are still loaded.
+    """
+
+    def dumps(self, obj):
+        data = msgpack.packb(obj, use_bin_type=True)
+        if len(data) >= settings.SESSION_COMPRESS_MIN_SIZE:
+            compressed = zlib.compress(data, settings.SESSION_COMPRESS_LEVEL)
+            if len(compressed) < len(data):
+                return ZLIB_MSGPACK + compressed
+        return MSGPACK + data
+
+    def loads(self, data):
+        marker, payload = data[:1], data[1:]
+        if marker == ZLIB_MSGPACK:
+            payload = zlib.decompress(payload)
+        elif marker != MSGPACK:
+            return JSONSerializer().loads(data)
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+class SessionStore(db.SessionStore):
+    """
+    Database sessions, which leave compression to `CompactSerializer`,
+    instead of compressing every session while signing it.
+    """
+
+    def encode(self, session_dict):
+        return signing.dumps(
+            session_dict, salt=self.key_salt, serializer=self.serializer
+        )
+
+
+def get_session_store_class():
+    return import_module(settings.SESSION_ENGINE).SessionStore
+
+
+def get_session_model():
+    """
+    Returns model of sessions or `None`, when `settings.SESSION_ENGINE`
+    doesn't keep them in the database.
+    """
+    store_class = get_session_store_class()
+    if hasattr(store_class, "get_model_class"):
+        return store_class.get_model_class()
+    return None
+
+
+def session_store_metrics():
+    """
+    Returns number of sessions, expired ones and size of their encoded data
+    in bytes, aggregated with one query. Sessions kept in the cache aren't
+    measured, the result is empty then.
+    """
+    model = get_session_model()
+    if model is None:
+        return {}
+    size = Length("session_data")
+    return model.objects.aggregate(
+        sessions=Count("pk"),
+        expired_sessions=Count("pk", filter=Q(expire_date__lt=timezone.now())),
+        total_bytes=Coalesce(Sum(size), 0),
+        max_bytes=Coalesce(Max(size), 0),
+    )
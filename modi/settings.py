@@ -45,7 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "modi.middleware.ReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "modi.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -62,6 +64,7 @@ TEMPLATES = [
         "DIRS": [
             BASE_DIR / "dictionary/templates/modi/",
         ],
+        # templates are cached by the default loaders, unless DEBUG is on
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -84,13 +87,46 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+    },
+    # Read replica for local testing of `modi.routers.PrimaryReplicaRouter`,
+    # uncomment it together with the "replica" entry of `DATABASE_REPLICAS`.
+    # "replica": {
+    #     "ENGINE": "django.db.backends.sqlite3",
+    #     "NAME": BASE_DIR / "db.sqlite3",
+    #     "TEST": {"MIRROR": "default"},
+    # },
 }
 
+DATABASE_ROUTERS = ["modi.routers.PrimaryReplicaRouter"]
+
+# Aliases of `DATABASES` which serve reads, e.g. ["replica"].
+DATABASE_REPLICAS = []
+
+# After a write, the client reads from the primary for that many seconds.
+REPLICA_PIN_SECONDS = 15
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
+# Password hashing policy, see `accounts.hashers`. The first hasher is used
+# for new passwords, `python manage.py benchmark_hashers` helps to pick cost.
+
+PASSWORD_HASHERS = [
+    "accounts.hashers.TunedPBKDF2PasswordHasher",
+    "accounts.hashers.ScryptPasswordHasher",
+    "accounts.hashers.TunedArgon2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+]
+
+PASSWORD_PBKDF2_ITERATIONS = 260000
+# Power of two, memory used is 128 * PASSWORD_SCRYPT_WORK_FACTOR * 8 bytes.
+PASSWORD_SCRYPT_WORK_FACTOR = 2**14
+PASSWORD_ARGON2_TIME_COST = 2
+# KiB.
+PASSWORD_ARGON2_MEMORY_COST = 102400
+PASSWORD_ARGON2_PARALLELISM = 8
+
 AUTH_PASSWORD_VALIDATORS = [
     # {
     #     'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -136,10 +172,12 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.User"
 
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
-    "accounts.backends.EmailAuthBackend",
+    "accounts.backends.UsernameOrEmailBackend",
 ]
 
+# Seconds for which unknown logins are remembered, 0 disables the cache.
+AUTH_NEGATIVE_CACHE_TIMEOUT = 30
+
 
 MESSAGE_TAGS = {
     message_constants.SUCCESS: "list-group-item-success",
@@ -155,6 +193,153 @@ EMAIL_USE_SSL = True
 EMAIL_HOST_USER = "MODi.learning.app"
 EMAIL_HOST_PASSWORD = "MODI1234"
 
+# Outbox of `accounts.tasks`, it's drained every `EMAIL_OUTBOX_INTERVAL` seconds.
+EMAIL_OUTBOX_INTERVAL = 10
+EMAIL_OUTBOX_BATCH_SIZE = 50
+# Messages per minute.
+EMAIL_OUTBOX_RATE_LIMIT = 60
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6
+# Seconds, doubled after every failed attempt.
+EMAIL_OUTBOX_RETRY_DELAY = 30
+# Seconds a batch is reserved for a worker, messages of a crashed worker
+# are sent again after it.
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 5 * 60
+# Sent and dead messages are deleted after `EMAIL_OUTBOX_MAX_AGE` seconds,
+# they contain links of password resets.
+EMAIL_OUTBOX_MAX_AGE = 7 * 24 * 3600
+EMAIL_OUTBOX_PURGE_INTERVAL = 24 * 3600
+
+# Deleted dictionaries, subjects and accounts are only hidden at once,
+# `dictionary.tasks.purge_deleted` deletes them every `DELETION_PURGE_INTERVAL`
+# seconds, `DELETION_PURGE_BATCH_SIZE` rows per query.
+DELETION_PURGE_INTERVAL = 60
+DELETION_PURGE_BATCH_SIZE = 500
+
+# Expired sessions are purged every `SESSION_PURGE_INTERVAL` seconds.
+SESSION_PURGE_INTERVAL = 3600
+SESSION_PURGE_BATCH_SIZE = 500
+
+# Reviews uploaded by `dictionary.sync` are kept for `REVIEW_MAX_AGE` seconds,
+# so a retried upload isn't applied twice, they're purged once a day.
+REVIEW_MAX_AGE = 30 * 24 * 3600
+REVIEW_PURGE_INTERVAL = 24 * 3600
+
+# Drafts of the word editor not changed for `DRAFT_MAX_AGE` seconds
+# are abandoned, they're purged once a day.
+DRAFT_MAX_AGE = 30 * 24 * 3600
+DRAFT_PURGE_INTERVAL = 24 * 3600
+
+CELERY_BEAT_SCHEDULE = {
+    "send-outbox-emails": {
+        "task": "accounts.tasks.send_outbox_emails",
+        "schedule": EMAIL_OUTBOX_INTERVAL,
+    },
+    "purge-outbox-emails": {
+        "task": "accounts.tasks.purge_outbox_emails",
+        "schedule": EMAIL_OUTBOX_PURGE_INTERVAL,
+    },
+    "purge-deleted": {
+        "task": "dictionary.tasks.purge_deleted",
+        "schedule": DELETION_PURGE_INTERVAL,
+    },
+    "purge-sessions": {
+        "task": "dictionary.tasks.purge_sessions",
+        "schedule": SESSION_PURGE_INTERVAL,
+    },
+    "purge-reviews": {
+        "task": "dictionary.tasks.purge_reviews",
+        "schedule": REVIEW_PURGE_INTERVAL,
+    },
+    "purge-drafts": {
+        "task": "dictionary.tasks.purge_drafts",
+        "schedule": DRAFT_PURGE_INTERVAL,
+    },
+}
+
+
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "accounts.api.authentication.BearerTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_THROTTLE_CLASSES": ["modi.throttling.ScopedCounterThrottle"],
+    # budgets per user, or per address of anonymous clients
+    "DEFAULT_THROTTLE_RATES": {
+        "auth": "10/min",
+        "reads": "600/min",
+        "word_edits": "120/min",
+        "bulk": "60/hour",
+    },
+}
+
+# Counters of `modi.throttling.ScopedCounterThrottle` are kept in Redis,
+# when its URL is set, otherwise in the cache.
+THROTTLE_REDIS_URL = None
+THROTTLE_CACHE = "default"
+
+# Response compression of `modi.middleware.CompressionMiddleware`.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CONTENT_TYPES = ["application/json", "application/msgpack"]
+COMPRESSION_BROTLI_QUALITY = 5
+
+# Maximal number of objects sent at once to `bulk/` endpoints of the API.
+API_BULK_MAX_ITEMS = 500
+
+# Seconds.
+API_ACCESS_TOKEN_LIFETIME = 15 * 60
+API_REFRESH_TOKEN_LIFETIME = 14 * 24 * 3600
+
 
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_COOKIE_AGE = 4 * 3600
+SESSION_ENGINE = "modi.sessions"
+SESSION_SERIALIZER = "modi.sessions.CompactSerializer"
+# Bytes, serialized sessions are compressed from this size.
+SESSION_COMPRESS_MIN_SIZE = 1024
+SESSION_COMPRESS_LEVEL = 1
+
+
+# Learning sessions, the duplicate index, unknown logins, word events and
+# throttling keep their state here. Locmem is per process and is lost on
+# restart, so it's fine for development only, see `modi.docker.settings`.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+}
+
+# Learning decks have immutable URLs, "public" allows shared caches as well.
+LEARNING_DECK_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+# Index of near-duplicate definitions of the word editor is kept in this cache.
+DUPLICATE_INDEX_CACHE = "default"
+DUPLICATE_INDEX_TIMEOUT = SESSION_COOKIE_AGE
+
+# Changes of the word editor streamed to devices of the user, see
+# `dictionary.events`. Seconds, except of `WORD_EVENTS_RETRY` (milliseconds).
+WORD_EVENTS_CACHE = "default"
+WORD_EVENTS_TIMEOUT = 10 * 60
+# Devices missing more events fetch all words again.
+WORD_EVENTS_MAX_BACKLOG = 200
+WORD_EVENTS_POLL_INTERVAL = 1
+WORD_EVENTS_KEEPALIVE = 15
+WORD_EVENTS_STREAM_TIMEOUT = 5 * 60
+WORD_EVENTS_RETRY = 3000
+
+# Seconds, tokens of shared dictionaries expire after this time.
+DICTIONARY_SHARE_TOKEN_MAX_AGE = 30 * 24 * 3600
+
+# Learning progress is kept in this cache per user, so it can be resumed
+# on another device, it has to be shared by all processes (Redis in docker).
+# Seconds.
+LEARNING_SESSION_CACHE = "default"
+LEARNING_SESSION_TIMEOUT = 30 * 24 * 3600
+
+# Answers of words at least this long may contain typos, see `dictionary.answers`.
+ANSWER_TYPO_MIN_LENGTH = 4
+ANSWER_MAX_TYPOS = 1
+
+# Minimal similarity of trigrams of near-duplicate definitions,
+# see `dictionary.duplicates`.
+NEAR_DUPLICATE_SIMILARITY = 0.6
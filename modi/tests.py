@@ -0,0 +1,259 @@
+"""
+Tested modules:
+    - `modi.routers`
+    - `modi.middleware`
+    - `modi.sessions`
+    - `modi.throttling`
+    - migrations of all apps
+"""
+import gzip
+from io import StringIO
+
+import brotli
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.serializers import JSONSerializer
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import SimpleTestCase, RequestFactory, override_settings
+
+from accounts.models import User
+from modi.middleware import CompressionMiddleware, ReplicaPinningMiddleware
+from modi.sessions import MSGPACK, ZLIB_MSGPACK, CompactSerializer
+from modi.throttling import RedisCounters, ScopedCounterThrottle
+from modi.routers import (
+    PrimaryReplicaRouter,
+    pin_this_thread,
+    unpin_this_thread,
+    this_thread_is_pinned,
+)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        unpin_this_thread()
+        self.router = PrimaryReplicaRouter()
+
+    def tearDown(self):
+        unpin_this_thread()
+
+    def test_db_for_read_should_return_replica(self):
+        self.assertEqual(self.router.db_for_read(User), "replica")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_db_for_read_should_return_default_when_there_are_no_replicas(self):
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_db_for_write_should_return_default(self):
+        self.assertEqual(self.router.db_for_write(User), "default")
+
+    def test_db_for_read_should_return_default_after_write(self):
+        self.router.db_for_write(User)
+
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_db_for_read_should_return_default_when_thread_is_pinned(self):
+        pin_this_thread()
+
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_allow_migrate_should_return_false_for_replica(self):
+        self.assertFalse(self.router.allow_migrate("replica", "accounts"))
+        self.assertIsNone(self.router.allow_migrate("default", "accounts"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaPinningMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        unpin_this_thread()
+        self.factory = RequestFactory()
+        self.pinned_in_view = None
+
+    def view(self, write=False):
+        def get_response(request):
+            if write:
+                PrimaryReplicaRouter().db_for_write(User)
+            self.pinned_in_view = this_thread_is_pinned()
+            return HttpResponse()
+
+        return ReplicaPinningMiddleware(get_response)
+
+    def test_safe_request_should_not_be_pinned(self):
+        response = self.view()(self.factory.get("/"))
+
+        self.assertFalse(self.pinned_in_view)
+        self.assertNotIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+
+    def test_unsafe_request_should_be_pinned(self):
+        self.view()(self.factory.post("/"))
+
+        self.assertTrue(self.pinned_in_view)
+
+    def test_request_with_cookie_should_be_pinned(self):
+        request = self.factory.get("/")
+        request.COOKIES[ReplicaPinningMiddleware.cookie_name] = "1"
+
+        self.view()(request)
+
+        self.assertTrue(self.pinned_in_view)
+
+    def test_response_should_set_cookie_after_write(self):
+        response = self.view(write=True)(self.factory.post("/"))
+
+        self.assertIn(ReplicaPinningMiddleware.cookie_name, response.cookies)
+        self.assertFalse(this_thread_is_pinned())
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    data = {f"definicja {i}": f"word {i}" for i in range(50)}
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get_response(self, response, accept_encoding="gzip, deflate, br"):
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_json_should_be_compressed_with_brotli(self):
+        response = self.get_response(JsonResponse(self.data))
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(
+            brotli.decompress(response.content), JsonResponse(self.data).content
+        )
+
+    def test_json_should_be_compressed_with_gzip_without_brotli_support(self):
+        response = self.get_response(JsonResponse(self.data), "gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(response.content), JsonResponse(self.data).content
+        )
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_response_should_not_be_compressed_without_accept_encoding(self):
+        response = self.get_response(JsonResponse(self.data), "")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_small_response_should_not_be_compressed(self):
+        response = self.get_response(JsonResponse({"wojna": "war"}))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_html_should_not_be_compressed(self):
+        response = self.get_response(HttpResponse("<p>modi</p>" * 100))
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_response_should_not_be_compressed(self):
+        response = self.get_response(
+            StreamingHttpResponse(["{}"] * 200, content_type="application/json")
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_strong_etag_should_become_weak(self):
+        response = JsonResponse(self.data)
+        response["ETag"] = '"words"'
+
+        response = self.get_response(response)
+
+        self.assertEqual(response["ETag"], 'W/"words"')
+
+
+@override_settings(SESSION_COMPRESS_MIN_SIZE=200)
+class CompactSerializerTestCase(SimpleTestCase):
+    session = {
+        "_auth_user_id": "1",
+        "dictionary_1": {f"definicja {i}": f"word {i}" for i in range(20)},
+        "dictionary_1_index": {"definicja 1": ["definicja 1", [1, 2]]},
+        "_session_expiry": 3600,
+    }
+
+    def setUp(self):
+        self.serializer = CompactSerializer()
+
+    def test_session_should_be_loaded_as_it_was_dumped(self):
+        data = self.serializer.dumps(self.session)
+
+        self.assertEqual(data[:1], ZLIB_MSGPACK)
+        self.assertEqual(self.serializer.loads(data), self.session)
+
+    def test_small_session_should_not_be_compressed(self):
+        session = {"_auth_user_id": "1", "dictionary_1": {"wojna": "war"}}
+
+        data = self.serializer.dumps(session)
+
+        self.assertEqual(data[:1], MSGPACK)
+        self.assertEqual(self.serializer.loads(data), session)
+
+    def test_session_saved_as_json_should_be_loaded(self):
+        data = JSONSerializer().dumps(self.session)
+
+        self.assertEqual(self.serializer.loads(data), self.session)
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {"reads": "2/min", "word_edits": "1/min"},
+    }
+)
+class ScopedCounterThrottleTestCase(SimpleTestCase):
+    class View:
+        action = "add_word"
+        throttle_scopes = {"add_word": "word_edits"}
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.view = self.View()
+
+    def allow(self, request):
+        request.user = AnonymousUser()
+        return ScopedCounterThrottle().allow_request(request, self.view)
+
+    def test_requests_over_budget_should_be_throttled_until_next_window(self):
+        throttle = ScopedCounterThrottle()
+        throttle.timer = lambda: 90.0
+        request = self.factory.put("/")
+        request.user = AnonymousUser()
+
+        self.assertTrue(throttle.allow_request(request, self.view))
+        self.assertFalse(throttle.allow_request(request, self.view))
+        self.assertEqual(throttle.wait(), 30)
+
+    def test_safe_requests_should_use_budget_of_reads(self):
+        self.view.action = "list"
+
+        self.assertTrue(self.allow(self.factory.get("/")))
+        self.assertTrue(self.allow(self.factory.get("/")))
+        self.assertFalse(self.allow(self.factory.get("/")))
+        self.assertTrue(self.allow(self.factory.post("/")))
+
+    def test_clients_should_have_separate_budgets(self):
+        self.assertTrue(self.allow(self.factory.put("/")))
+        self.assertTrue(self.allow(self.factory.put("/", REMOTE_ADDR="10.0.0.1")))
+
+    def test_redis_error_should_not_throttle_requests(self):
+        counters = RedisCounters("redis://localhost:1")
+
+        self.assertEqual(counters.incr("throttle:reads:1:0", 60), 0)
+
+
+class MigrationsTestCase(SimpleTestCase):
+    databases = {"default"}
+
+    def test_models_should_not_have_changes_missing_in_migrations(self):
+        output = StringIO()
+
+        try:
+            call_command("makemigrations", "--check", "--dry-run", stdout=output)
+        except SystemExit:
+            self.fail(f"Missing migrations:\n{output.getvalue()}")
@@ -0,0 +1,120 @@
+"""
+Throttling of the API with fixed-window counters.
+
+A request costs one atomic increment of the counter of the current window,
+instead of reading and writing a list of timestamps like throttles of DRF.
+Counters are kept in Redis at `settings.THROTTLE_REDIS_URL`, so they're
+shared by all workers, or in `settings.THROTTLE_CACHE` without it.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class CacheCounters:
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def incr(self, key, timeout):
+        # `add` doesn't touch an existing counter, `incr` is atomic
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # the counter has just expired
+            self.cache.set(key, 1, timeout)
+            return 1
+
+
+class RedisCounters:
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+
+    def incr(self, key, timeout):
+        pipeline = self.client.pipeline()
+        try:
+            count, _ = pipeline.incr(key).expire(key, timeout).execute()
+        except redis.RedisError:
+            # throttling mustn't take the API down with Redis
+            return 0
+        return count
+
+
+@lru_cache(maxsize=None)
+def get_redis_counters(url):
+    # the client keeps a pool of connections, so it's created once
+    return RedisCounters(url)
+
+
+def get_counters():
+    if settings.THROTTLE_REDIS_URL and redis is not None:
+        return get_redis_counters(settings.THROTTLE_REDIS_URL)
+    return CacheCounters(settings.THROTTLE_CACHE)
+
+
+class ScopedCounterThrottle(SimpleRateThrottle):
+    """
+    Limits requests of a user, or of an address of anonymous clients,
+    to the rate of a scope in `DEFAULT_THROTTLE_RATES`.
+
+    The scope is taken from `throttle_scopes` of the view by its action,
+    or from `throttle_scope`. Safe requests of other views use "reads",
+    other unsafe requests aren't throttled.
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s:%(window)d"
+    default_scope = "reads"
+
+    def __init__(self):
+        # rate depends on the view, see `get_rate`
+        self.wait_seconds = None
+
+    def get_scope(self, request, view):
+        scopes = getattr(view, "throttle_scopes", {})
+        scope = scopes.get(
+            getattr(view, "action", None), getattr(view, "throttle_scope", None)
+        )
+        if scope is None and request.method in SAFE_METHODS:
+            return self.default_scope
+        return scope
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": ident,
+            "window": self.now // self.duration,
+        }
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate() if self.scope else None
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.now = self.timer()
+        key = self.get_cache_key(request, view)
+        count = get_counters().incr(key, self.duration)
+        if count <= self.num_requests:
+            return True
+        self.wait_seconds = self.duration - self.now % self.duration
+        return False
+
+    def wait(self):
+        return self.wait_seconds